@@ -0,0 +1,107 @@
+"""
+Benchmark of the maze solvers.
+
+Every solver is run on every maze file through the Maze class, and one
+CSV row is written per run: explored states, path length, solve time
+and the peak memory allocated while solving. Time and memory are taken
+from separate runs, since tracing allocations slows the search down.
+Mazes for it can be made with generate.py:
+
+    python generate.py corpus mazes --sizes 11 101 1001
+    python benchmark.py mazes -o results.csv
+
+Usage: python benchmark.py path ... [options]
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tracemalloc
+
+from maze import SOLVERS, Maze, maze_files
+
+COLUMNS = (
+    "maze", "height", "width", "backend", "algorithm",
+    "found", "explored", "length", "seconds", "peak_bytes",
+)
+
+
+def solve(maze, algorithm):
+    """
+    Solves maze with algorithm. Returns whether a solution was found.
+    """
+    maze.explored = maze.solution = None
+    try:
+        maze.solve(algorithm)
+    except Exception as e:
+        if str(e) != "no solution":
+            raise
+        return False
+    return True
+
+
+def run(filename, algorithms=SOLVERS, backend="lists", repeat=1, memory=True):
+    """
+    Yields a dict of COLUMNS for each algorithm run on one maze file.
+    seconds is the fastest of repeat runs. Solvers that need NumPy are
+    skipped, with a note on stderr, when it is not installed.
+    """
+    maze = Maze(filename, backend)
+    for algorithm in algorithms:
+        seconds = None
+        try:
+            for _ in range(repeat):
+                found = solve(maze, algorithm)
+                seconds = maze.time if seconds is None else min(seconds, maze.time)
+        except ImportError:
+            print(f"{algorithm}: unavailable, needs NumPy", file=sys.stderr)
+            continue
+        row = {
+            "maze": os.path.basename(filename),
+            "height": maze.height,
+            "width": maze.width,
+            "backend": backend,
+            "algorithm": algorithm,
+            "found": found,
+            "explored": maze.num_explored,
+            "length": len(maze.solution[0]) if found else "",
+            "seconds": f"{seconds:.6f}",
+            "peak_bytes": "",
+        }
+        if memory:
+            tracemalloc.start()
+            solve(maze, algorithm)
+            row["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        yield row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers.")
+    parser.add_argument("paths", nargs="+",
+                        help="maze files, directories or glob patterns")
+    parser.add_argument("--algorithms", nargs="+", choices=SOLVERS, default=list(SOLVERS))
+    parser.add_argument("--backend", choices=("lists", "numpy"), default="lists")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="time each solver this many times and keep the fastest")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="skip the extra run that measures peak memory")
+    parser.add_argument("-o", "--output", help="CSV file to write; stdout by default")
+    args = parser.parse_args()
+
+    f = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(f, COLUMNS)
+        writer.writeheader()
+        for filename in maze_files(args.paths):
+            for row in run(filename, args.algorithms, args.backend, args.repeat, args.memory):
+                writer.writerow(row)
+                f.flush()
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+if __name__ == "__main__":
+    main()
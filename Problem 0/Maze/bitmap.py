@@ -0,0 +1,220 @@
+"""
+NumPy backend for large mazes.
+
+The whole maze and its search state fit in one uint8 per cell. Cells
+hold WALL, UNSEEN, or their BFS distance from the start modulo 3, in a
+grid padded with a border of walls so that no step needs a bounds
+check. Neighbouring cells are at most one step apart in distance, so
+mod 3 still tells a cell's predecessor apart from its other neighbours.
+The BFS advances a whole layer at a time with array operations over the
+flat indexes of the frontier. The path is then read back from the goal
+by stepping to the neighbour one layer closer each time.
+
+A GridBuilder reads maze lines straight into such a grid, and a
+Wavefront can search in it in place, so a maze loaded and solved this
+way never holds a second array of its cells.
+
+Requires NumPy: pip install numpy
+"""
+
+import numpy as np
+
+WALL = 3
+UNSEEN = 4
+
+# Cells relabelled per round when a grid is reset for another search
+RESET_CHUNK = 1 << 20
+
+# Maps each byte of a maze line to its cell: open for space, A and B
+_CELLS = bytes(UNSEEN if chr(byte) in " AB" else WALL for byte in range(256))
+
+# Fronts up to this many cells are advanced in plain Python
+SMALL_FRONTIER = 64
+
+
+def wall_row(line):
+    """
+    Returns a boolean array, True for walls, with one entry per
+    character of a maze text line.
+    """
+    # One code point per character, so columns line up with str indexes
+    row = np.frombuffer(line.encode("utf-32-le"), dtype="<u4")
+    return (row != ord(" ")) & (row != ord("A")) & (row != ord("B"))
+
+
+def read_walls(lines, width):
+    """
+    Returns a (len(lines), width) boolean array, True for walls, from
+    maze text lines. Lines shorter than width are padded with space.
+    """
+    walls = np.zeros((len(lines), width), dtype=bool)
+    for i, line in enumerate(lines):
+        row = line if isinstance(line, np.ndarray) else wall_row(line)
+        walls[i, :len(row)] = row[:width]
+    return walls
+
+
+class GridBuilder():
+    """
+    Builds the padded grid of a maze one text line at a time, WALL and
+    UNSEEN cells appended to a single bytearray. When every line has
+    the same width, as usual, the grid is a view of that buffer and
+    loading needs no copy; short lines are padded with open cells.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.widths = []
+
+    def add(self, line):
+        # One byte per character, so columns line up with str indexes
+        row = line.encode("latin-1", "replace").translate(_CELLS)
+        if not self.widths:
+            self.buffer += bytes([WALL]) * (len(row) + 2)
+        self.buffer.append(WALL)
+        self.buffer += row
+        self.buffer.append(WALL)
+        self.widths.append(len(row))
+
+    def grid(self):
+        """
+        Returns the (height + 2, width + 2) uint8 grid of the lines added.
+        """
+        height = len(self.widths)
+        width = max(self.widths, default=0)
+        first = self.widths[0] if self.widths else 0
+        if all(row_width == width for row_width in self.widths):
+            self.buffer += bytes([WALL]) * (width + 2)
+            return np.frombuffer(self.buffer, dtype=np.uint8).reshape(height + 2, width + 2)
+
+        # Rows of different widths: copy them into a grid of the widest
+        grid = np.full((height + 2, width + 2), WALL, dtype=np.uint8)
+        buffer = np.frombuffer(self.buffer, dtype=np.uint8)
+        position = first + 2
+        for i, row_width in enumerate(self.widths):
+            grid[i + 1, 1:row_width + 1] = buffer[position + 1:position + 1 + row_width]
+            grid[i + 1, row_width + 1:width + 1] = UNSEEN
+            position += row_width + 2
+        return grid
+
+
+def padded(walls):
+    """
+    Returns the padded uint8 grid of a boolean array of walls.
+    """
+    walls = np.asarray(walls, dtype=bool)
+    grid = np.full((walls.shape[0] + 2, walls.shape[1] + 2), WALL, dtype=np.uint8)
+    inner = grid[1:-1, 1:-1]
+    inner.fill(UNSEEN)
+    inner[walls] = WALL
+    return grid
+
+
+def reset(grid):
+    """
+    Marks every cell of grid that is not a wall UNSEEN again, a chunk
+    at a time so no grid-sized temporary is made.
+    """
+    flat = grid.reshape(-1)
+    for start in range(0, len(flat), RESET_CHUNK):
+        chunk = flat[start:start + RESET_CHUNK]
+        np.putmask(chunk, chunk < WALL, UNSEEN)
+
+
+class Wavefront():
+    """
+    Breadth-first distances from start over a grid of walls, layer by
+    layer until goal is reached, or over everything reachable when goal
+    is None. walls is either a boolean array, from which a padded grid
+    is built, or a padded uint8 grid (see GridBuilder), which is reset
+    and searched in place.
+    """
+
+    def __init__(self, walls, start, goal=None):
+        if isinstance(walls, np.ndarray) and walls.dtype == np.uint8:
+            reset(walls)
+            self.labels = walls
+        else:
+            self.labels = padded(walls)
+        self.height, self.width = self.labels.shape[0] - 2, self.labels.shape[1] - 2
+        self.stride = self.width + 2
+        self.start = start
+        self.goal = goal
+
+        flat = self.labels.reshape(-1)
+        view = memoryview(flat)
+        offsets = (-self.stride, self.stride, -1, 1)
+        steps = np.array(offsets, dtype=np.intp)
+        goal_index = -1 if goal is None else self.index(goal)
+        frontier = [self.index(start)]
+        view[frontier[0]] = 0
+        self.num_explored = 1
+        self.distance = 0 if frontier[0] == goal_index else None
+        depth = 0
+        while len(frontier) and self.distance is None:
+            depth += 1
+            label = depth % 3
+
+            # Narrow fronts, as in corridors, cost less cell by cell
+            # than the fixed overhead of a round of array operations
+            if len(frontier) <= SMALL_FRONTIER:
+                cells = []
+                for index in (frontier if isinstance(frontier, list) else frontier.tolist()):
+                    for offset in offsets:
+                        if view[index + offset] == UNSEEN:
+                            view[index + offset] = label
+                            cells.append(index + offset)
+                frontier = cells
+            else:
+                candidates = (np.asarray(frontier, dtype=np.intp)[:, None] + steps).reshape(-1)
+                frontier = np.unique(candidates[flat[candidates] == UNSEEN])
+                flat[frontier] = label
+            self.num_explored += len(frontier)
+            if goal_index >= 0 and view[goal_index] != UNSEEN:
+                self.distance = depth
+
+    def index(self, cell):
+        return (cell[0] + 1) * self.stride + cell[1] + 1
+
+    def __contains__(self, cell):
+        """
+        Whether the search reached a (row, column) cell.
+        """
+        return self.labels[cell[0] + 1, cell[1] + 1] < WALL
+
+    def reached(self):
+        """
+        Returns a boolean array of the cells the search reached.
+        """
+        return self.labels[1:-1, 1:-1] < WALL
+
+    def nbytes(self):
+        return self.labels.nbytes
+
+    def path(self):
+        """
+        Returns (actions, cells) from start to goal, or None if the
+        goal was not reached.
+        """
+        if self.distance is None:
+            return None
+        flat = memoryview(self.labels.reshape(-1))
+        stride = self.stride
+        steps = (-stride, stride, -1, 1)
+
+        # Walking back, a step of -stride undoes a move "down", etc.
+        undoes = dict(zip(steps, ("down", "up", "right", "left")))
+        index = self.index(self.goal)
+        actions = []
+        cells = []
+        for depth in range(self.distance, 0, -1):
+            cells.append(divmod(index, stride))
+            previous = (depth - 1) % 3
+            for step in steps:
+                if flat[index + step] == previous:
+                    actions.append(undoes[step])
+                    index += step
+                    break
+        actions.reverse()
+        cells.reverse()
+        return actions, [(row - 1, col - 1) for row, col in cells]
@@ -0,0 +1,164 @@
+"""
+Distance fields for repeated queries on a static maze.
+
+A breadth-first search run backwards from one or more goals labels
+every reachable cell with its distance to the nearest goal. Moves all
+cost the same, so BFS gives the same distances Dijkstra would. After
+that, a path from any start is read off in O(path length) by stepping
+to a neighbour one closer each time, with no search at all.
+
+Distances are kept as one int array over a grid padded with a border
+of walls, 4 bytes per cell. Fields are cached in memory by maze content
+hash and goals, and optionally on disk, one file per field, so that
+later runs over the same maze file skip the search too.
+"""
+
+import hashlib
+import os
+from array import array
+from collections import OrderedDict
+
+# Distance fields kept in memory, most recently used last
+CACHE_SIZE = 4
+
+_cache = OrderedDict()
+
+
+class DistanceField():
+    """
+    Distances from every cell of a height by width maze to the nearest
+    of its goals; -1 for walls and cells that cannot reach one.
+    """
+
+    def __init__(self, height, width, goals, distances):
+        self.height = height
+        self.width = width
+        self.goals = tuple(goals)
+        self.stride = width + 2
+        self.distances = distances
+
+    def index(self, cell):
+        return (cell[0] + 1) * self.stride + cell[1] + 1
+
+    def distance(self, cell):
+        """
+        Returns the number of steps from a (row, column) cell to the
+        nearest goal, or None if no goal can be reached from it.
+        """
+        row, col = cell
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return None
+        distance = self.distances[self.index(cell)]
+        return distance if distance >= 0 else None
+
+    def path(self, start):
+        """
+        Returns (actions, cells) from start to the nearest goal, in the
+        form of Maze.solution, or None if no goal can be reached.
+        """
+        distance = self.distance(start)
+        if distance is None:
+            return None
+        distances = self.distances
+        stride = self.stride
+        steps = ((-stride, "up"), (stride, "down"), (-1, "left"), (1, "right"))
+        index = self.index(start)
+        actions = []
+        cells = []
+        while distance > 0:
+            distance -= 1
+            for step, action in steps:
+                if distances[index + step] == distance:
+                    index += step
+                    actions.append(action)
+                    cells.append((index // stride - 1, index % stride - 1))
+                    break
+        return actions, cells
+
+    def nbytes(self):
+        return self.distances.itemsize * len(self.distances)
+
+    def save(self, filename):
+        with open(filename, "wb") as f:
+            self.distances.tofile(f)
+
+    @classmethod
+    def load(cls, filename, height, width, goals):
+        distances = array("i")
+        with open(filename, "rb") as f:
+            distances.fromfile(f, (height + 2) * (width + 2))
+        return cls(height, width, goals, distances)
+
+
+def distance_field(walls, goals):
+    """
+    Returns the DistanceField of a grid of walls (rows of bools, or a
+    NumPy boolean array) to the (row, column) goals.
+    """
+    height = len(walls)
+    width = len(walls[0])
+    stride = width + 2
+
+    # Cells that are walls or already reached are blocked
+    blocked = bytearray(b"\x01") * ((height + 2) * stride)
+    for r, row in enumerate(walls):
+        blocked[(r + 1) * stride + 1:(r + 1) * stride + 1 + width] = bytes(row)
+    distances = array("i", [-1]) * len(blocked)
+
+    frontier = []
+    for row, col in goals:
+        if not (0 <= row < height and 0 <= col < width):
+            raise ValueError(f"goal {(row, col)} is outside the maze")
+        index = (row + 1) * stride + col + 1
+        if walls[row][col]:
+            raise ValueError(f"goal {(row, col)} is a wall")
+        if not blocked[index]:
+            blocked[index] = 1
+            distances[index] = 0
+            frontier.append(index)
+
+    steps = (-stride, stride, -1, 1)
+    distance = 0
+    while frontier:
+        distance += 1
+        cells = []
+        for index in frontier:
+            for step in steps:
+                neighbor = index + step
+                if not blocked[neighbor]:
+                    blocked[neighbor] = 1
+                    distances[neighbor] = distance
+                    cells.append(neighbor)
+        frontier = cells
+    return DistanceField(height, width, goals, distances)
+
+
+def cached_field(digest, walls, goals, cache_dir=None):
+    """
+    Returns the DistanceField to goals of the maze whose content hash
+    is digest, from memory, from cache_dir, or by computing it.
+    """
+    goals = tuple(goals)
+    key = hashlib.sha256(f"{digest}{goals}".encode()).hexdigest()
+    field = _cache.get(key)
+    if field is not None:
+        _cache.move_to_end(key)
+        return field
+
+    filename = os.path.join(cache_dir, f"{key}.dist") if cache_dir is not None else None
+    height, width = len(walls), len(walls[0])
+    if filename is not None and os.path.exists(filename):
+        try:
+            field = DistanceField.load(filename, height, width, goals)
+        except EOFError:
+            field = None
+    if field is None:
+        field = distance_field(walls, goals)
+        if filename is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            field.save(filename)
+
+    _cache[key] = field
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return field
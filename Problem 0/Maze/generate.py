@@ -0,0 +1,214 @@
+"""
+Seeded maze generator.
+
+Three kinds of maze, in the text format Maze reads, from 5x5 up to
+10000x10000 characters:
+
+- perfect: a randomised depth-first search carves passages between
+  the cells at odd coordinates, so exactly one path joins any two of
+  them: long corridors and many dead ends.
+- loops: a perfect maze with a fraction of its inner walls knocked
+  down, so there are many paths and searches have choices to make.
+- open: an open field with random single-cell obstacles, around a
+  random monotone path from start to goal that is kept clear, so
+  every open maze is solvable.
+
+The start is always at the top left and the goal at the bottom right.
+The grid is one bytearray, a byte per cell, and the search stack an
+int array, so even the largest mazes need about 2 bytes per cell.
+The same kind, size and seed always give the same maze.
+
+Usage: python generate.py perfect 101 101 [--seed N] [-o maze.txt]
+       python generate.py corpus mazes [--sizes 11 101 1001]
+"""
+
+import argparse
+import os
+import random
+import sys
+from array import array
+
+KINDS = ("perfect", "loops", "open")
+
+# Fraction of cells whose right or lower wall is knocked down in loops
+LOOPS = 0.1
+
+# Fraction of cells that are obstacles in open mazes
+DENSITY = 0.25
+
+# Maze sizes, in characters per side, of the default corpus
+SIZES = (11, 101, 1001)
+
+WALL, SPACE, START, GOAL = b"#", b" ", b"A", b"B"
+
+
+def generate(kind, height, width, seed=0, loops=LOOPS, density=DENSITY):
+    """
+    Returns a maze of one of KINDS as a bytearray of height rows of
+    width characters each, without newlines.
+    """
+    if kind not in KINDS:
+        raise ValueError(f"unknown maze kind: {kind}")
+    if height < 5 or width < 5:
+        raise ValueError("mazes must be at least 5x5")
+    rng = random.Random(seed)
+    if kind == "open":
+        return _open(height, width, rng, density)
+    grid = _perfect(height, width, rng)
+    if kind == "loops":
+        _knock_down(grid, height, width, rng, loops)
+
+    # Start and goal in the first and last cells
+    grid[width + 1] = ord(START)
+    grid[((height - 1) // 2 * 2 - 1) * width + (width - 1) // 2 * 2 - 1] = ord(GOAL)
+    return grid
+
+
+def _perfect(height, width, rng):
+    grid = bytearray(WALL) * (height * width)
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+
+    # Cells are numbered over a grid with a border of visited cells,
+    # so that no step needs a bounds check
+    stride = cols + 2
+    visited = bytearray(b"\x01") * ((rows + 2) * stride)
+    for r in range(1, rows + 1):
+        visited[r * stride + 1:r * stride + cols + 1] = bytes(cols)
+    steps = (-stride, stride, -1, 1)
+    random = rng.random
+    space = ord(SPACE)
+
+    first = stride + 1
+    visited[first] = 1
+    grid[width + 1] = space
+    stack = array("i", [first])
+    while stack:
+        cell = stack[-1]
+        options = [cell + step for step in steps if not visited[cell + step]]
+        if not options:
+            stack.pop()
+            continue
+        chosen = options[int(random() * len(options))]
+        visited[chosen] = 1
+
+        # Open the chosen cell and the wall between it and this one
+        r, c = divmod(cell, stride)
+        here = (2 * r - 1) * width + 2 * c - 1
+        r, c = divmod(chosen, stride)
+        there = (2 * r - 1) * width + 2 * c - 1
+        grid[there] = space
+        grid[(here + there) // 2] = space
+        stack.append(chosen)
+    return grid
+
+
+def _knock_down(grid, height, width, rng, loops):
+    """
+    Opens the closed right or lower walls of loops * cells random
+    cells, giving up after ten times as many tries.
+    """
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+    space = ord(SPACE)
+    wanted = int(loops * rows * cols)
+    for _ in range(10 * wanted):
+        if wanted <= 0:
+            break
+        r, c = rng.randrange(rows), rng.randrange(cols)
+        if rng.random() < 0.5:
+            if c + 1 >= cols:
+                continue
+            wall = (2 * r + 1) * width + 2 * c + 2
+        else:
+            if r + 1 >= rows:
+                continue
+            wall = (2 * r + 2) * width + 2 * c + 1
+        if grid[wall] != space:
+            grid[wall] = space
+            wanted -= 1
+
+
+def _open(height, width, rng, density):
+    random = rng.random
+    wall, space = ord(WALL), ord(SPACE)
+    grid = bytearray(WALL) * width
+    for _ in range(height - 2):
+        grid.append(wall)
+        grid.extend(wall if random() < density else space for _ in range(width - 2))
+        grid.append(wall)
+    grid.extend(bytearray(WALL) * width)
+
+    # Clear a random path of down and right steps from start to goal
+    row, col = 1, 1
+    while (row, col) != (height - 2, width - 2):
+        down, right = height - 2 - row, width - 2 - col
+        if rng.randrange(down + right) < down:
+            row += 1
+        else:
+            col += 1
+        grid[row * width + col] = space
+    grid[width + 1] = ord(START)
+    grid[(height - 2) * width + width - 2] = ord(GOAL)
+    return grid
+
+
+def write(grid, width, filename):
+    """
+    Writes a generated maze to filename, a row per line.
+    """
+    view = memoryview(grid)
+    with open(filename, "wb") as f:
+        for start in range(0, len(grid), width):
+            f.write(view[start:start + width])
+            f.write(b"\n")
+
+
+def corpus(directory, sizes=SIZES, seed=0):
+    """
+    Writes a maze of every kind at every size to directory, named like
+    perfect_101x101_0.txt. Returns the list of files written.
+    """
+    os.makedirs(directory, exist_ok=True)
+    filenames = []
+    for size in sizes:
+        for kind in KINDS:
+            filename = os.path.join(directory, f"{kind}_{size}x{size}_{seed}.txt")
+            write(generate(kind, size, size, seed), size, filename)
+            filenames.append(filename)
+    return filenames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded mazes.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for kind in KINDS:
+        maze = commands.add_parser(kind, help=f"one {kind} maze")
+        maze.add_argument("height", type=int)
+        maze.add_argument("width", type=int)
+        maze.add_argument("--seed", type=int, default=0)
+        maze.add_argument("--loops", type=float, default=LOOPS,
+                          help="fraction of cells to open a wall of (loops)")
+        maze.add_argument("--density", type=float, default=DENSITY,
+                          help="fraction of cells that are obstacles (open)")
+        maze.add_argument("-o", "--output", help="file to write; stdout by default")
+
+    batch = commands.add_parser("corpus", help="every kind of maze at several sizes")
+    batch.add_argument("directory")
+    batch.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    batch.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == "corpus":
+        for filename in corpus(args.directory, args.sizes, args.seed):
+            print(filename)
+        return
+    grid = generate(args.command, args.height, args.width, args.seed, args.loops, args.density)
+    if args.output:
+        write(grid, args.width, args.output)
+    else:
+        for start in range(0, len(grid), args.width):
+            sys.stdout.write(grid[start:start + args.width].decode() + "\n")
+
+
+if __name__ == "__main__":
+    main()
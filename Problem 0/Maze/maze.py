@@ -1,173 +1,242 @@
+import argparse
+import functools
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
 import sys
+import time
 
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
+# The search package is shared with degrees, one directory up
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
 
+from search import ALGORITHMS, solve
+from search.grid import jump_point_search
 
-class StackFrontier():
-    def __init__(self):
-        self.frontier = []
+import distance
 
-    def add(self, node):
-        self.frontier.append(node)
+# Search algorithms Maze.solve accepts: the generic ones, plus Jump
+# Point Search and the NumPy wavefront BFS, which only apply to grids
+SOLVERS = ALGORITHMS + ("jps", "wavefront")
 
-    def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+# Characters Maze.print collects before each write to stdout
+PRINT_CHUNK = 1 << 16
 
-    def empty(self):
-        return len(self.frontier) == 0
 
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
-
-
-class QueueFrontier(StackFrontier):
-
-    def remove(self):
-        if self.empty():
-            raise Exception("empty frontier")
-        else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+def _bitmap():
+    """
+    Imports the NumPy backend, which is optional.
+    """
+    try:
+        import bitmap
+    except ImportError as e:
+        raise ImportError("the NumPy maze backend needs NumPy: pip install numpy") from e
+    return bitmap
 
 class Maze():
 
-    def __init__(self, filename):
-
-        # Read file and set height and width of maze
+    def __init__(self, filename, backend="lists"):
+        """
+        Reads a maze file. The "lists" backend keeps walls as lists of
+        bools; "numpy" keeps the maze in one bitmap grid, a byte per
+        cell, for mazes too large for lists, which the wavefront solver
+        searches in place. Its boolean walls array is only made when
+        something else asks for walls.
+        """
+
+        # Read the file a line at a time, so the whole text is never
+        # held in memory, counting start and goal points as we go
+        self.grid = self._walls = None
+        if backend == "numpy":
+            builder = _bitmap().GridBuilder()
+        rows = []
+        starts = goals = 0
+        digest = hashlib.sha256()
         with open(filename) as f:
-            contents = f.read()
+            for i, line in enumerate(f):
+                digest.update(line.encode())
+                line = line.rstrip("\n")
+                if "A" in line:
+                    starts += line.count("A")
+                    self.start = (i, line.index("A"))
+                if "B" in line:
+                    goals += line.count("B")
+                    self.goal = (i, line.index("B"))
+                if backend == "numpy":
+                    builder.add(line)
+                else:
+                    rows.append([char not in " AB" for char in line])
 
         # Validate start and goal
-        if contents.count("A") != 1:
+        if starts != 1:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if goals != 1:
             raise Exception("maze must have exactly one goal")
 
-        # Determine height and width of maze
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+        # Determine height and width of maze, and keep track of walls,
+        # padding short rows with empty cells
+        self.digest = digest.hexdigest()
+        if backend == "numpy":
+            self.grid = builder.grid()
+            self.height, self.width = self.grid.shape[0] - 2, self.grid.shape[1] - 2
+        else:
+            self.height = len(rows)
+            self.width = max(len(row) for row in rows)
+            for row in rows:
+                row.extend([False] * (self.width - len(row)))
+            self._walls = rows
 
         self.solution = None
 
 
+    @property
+    def walls(self):
+        """
+        Rows of bools, True for walls; with the numpy backend, a boolean
+        array read from the grid on first use.
+        """
+        if self._walls is None:
+            self._walls = self.grid[1:-1, 1:-1] == _bitmap().WALL
+        return self._walls
+
+
     def print(self):
-        solution = self.solution[1] if self.solution is not None else None
-        print()
+        """
+        Prints the maze, with the solution if there is one, building
+        each row as a string and writing them in chunks.
+        """
+        path = {}
+        if self.solution is not None:
+            for i, j in self.solution[1]:
+                path.setdefault(i, []).append(j)
+        chunk = ["\n"]
+        size = 0
         for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    print("в–€", end="")
-                elif (i, j) == self.start:
-                    print("A", end="")
-                elif (i, j) == self.goal:
-                    print("B", end="")
-                elif solution is not None and (i, j) in solution:
-                    print("*", end="")
-                else:
-                    print(" ", end="")
-            print()
-        print()
+            if hasattr(row, "tolist"):
+                row = row.tolist()
+            chars = ["в–€" if col else " " for col in row]
+            for j in path.get(i, ()):
+                chars[j] = "*"
+            if i == self.start[0]:
+                chars[self.start[1]] = "A"
+            if i == self.goal[0]:
+                chars[self.goal[1]] = "B"
+            line = "".join(chars)
+            chunk.append(line)
+            chunk.append("\n")
+            size += len(line)
+            if size >= PRINT_CHUNK:
+                sys.stdout.write("".join(chunk))
+                chunk = []
+                size = 0
+        chunk.append("\n")
+        sys.stdout.write("".join(chunk))
 
 
     def neighbors(self, state):
         row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
-
+        walls = self.walls
         result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
+        if row > 0 and not walls[row - 1][col]:
+            result.append(("up", (row - 1, col)))
+        if row + 1 < self.height and not walls[row + 1][col]:
+            result.append(("down", (row + 1, col)))
+        if col > 0 and not walls[row][col - 1]:
+            result.append(("left", (row, col - 1)))
+        if col + 1 < self.width and not walls[row][col + 1]:
+            result.append(("right", (row, col + 1)))
         return result
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def solve(self, algorithm="dfs"):
+        """
+        Finds a solution to maze, if one exists, searching with one of
+        SOLVERS; greedy and A* are guided by the Manhattan distance to
+        the goal, "jps" is A* with Jump Point Search, and "wavefront"
+        is the NumPy breadth-first search of bitmap.Wavefront.
+        Sets num_explored and the time taken in seconds.
+        """
+        start = time.perf_counter()
+        if algorithm == "wavefront":
+            walls = self.walls if self.grid is None else self.grid
+            wavefront = _bitmap().Wavefront(walls, self.start, self.goal)
+            self.time = time.perf_counter() - start
+            self.num_explored = wavefront.num_explored
+            self.explored = wavefront
+            path = wavefront.path()
+            if path is None:
+                raise Exception("no solution")
+            self.solution = path
+            return
+        if algorithm == "jps":
+            solution = jump_point_search(self.walls, self.start, self.goal)
+        else:
+            solution = solve(
+                self.start, lambda state: state == self.goal, self.neighbors,
+                algorithm, heuristic=self.manhattan
+            )
+        self.time = time.perf_counter() - start
 
         # Keep track of number of states explored
-        self.num_explored = 0
-
-        # Initialize frontier to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
-        frontier.add(start)
-
-        # Initialize an empty explored set
-        self.explored = set()
-
-        # Keep looping until solution found
-        while True:
-
-            # If nothing left in frontier, then no path
-            if frontier.empty():
-                raise Exception("no solution")
+        self.num_explored = solution.num_explored
+        self.explored = solution.explored
+        if not solution.found:
+            raise Exception("no solution")
+        self.solution = (solution.actions, solution.states)
+
+
+    def distances(self, goals=None, cache_dir=None):
+        """
+        Returns the distance.DistanceField from every cell to the
+        nearest of goals, by default just the maze's goal. Fields are
+        cached by maze content and goals, and also stored in cache_dir
+        if given, so repeated queries on one maze search only once.
+        """
+        return distance.cached_field(self.digest, self.walls, goals or (self.goal,), cache_dir)
+
+
+    def path_from(self, start, goals=None, cache_dir=None):
+        """
+        Returns (actions, cells) from start to the nearest of goals, in
+        the form of self.solution, or None if none can be reached.
+        Takes O(path length) once the distance field is cached.
+        """
+        return self.distances(goals, cache_dir).path(start)
+
+
+    def manhattan(self, state):
+        """Manhattan distance from state to the goal."""
+        return abs(state[0] - self.goal[0]) + abs(state[1] - self.goal[1])
+
+
+    def output_image(self, filename, show_solution=True, show_explored=False,
+                     cell_size=50, downsample=1, tile=None):
+        """
+        Draws the maze to an image file, cell_size pixels per cell.
+        With downsample, each pixel cell stands for a downsample by
+        downsample block of the maze; with tile, the image is split
+        into files of up to tile by tile cells (see render.save).
+        Uses the NumPy renderer when NumPy is installed.
+        Returns the list of files written.
+        """
+        solution = self.solution[1] if self.solution is not None else None
+        try:
+            import render
+        except ImportError:
+            if downsample > 1 or tile is not None:
+                raise ImportError("downsampled and tiled images need NumPy: pip install numpy")
+            render = None
+        if render is not None:
+            codes = render.cell_codes(
+                self.walls, self.start, self.goal,
+                solution if show_solution else None,
+                self.explored if solution is not None and show_explored else None
+            )
+            return render.save(codes, filename, cell_size, downsample, tile)
 
-            # Choose a node from the frontier
-            node = frontier.remove()
-            self.num_explored += 1
-
-            # If node is the goal, then we have a solution
-            if node.state == self.goal:
-                actions = []
-                cells = []
-                while node.parent is not None:
-                    actions.append(node.action)
-                    cells.append(node.state)
-                    node = node.parent
-                actions.reverse()
-                cells.reverse()
-                self.solution = (actions, cells)
-                return
-
-            # Mark node as explored
-            self.explored.add(node.state)
-
-            # Add neighbors to frontier
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
-                    frontier.add(child)
-
-
-    def output_image(self, filename, show_solution=True, show_explored=False):
         from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
+        cell_border = cell_size // 25
 
         # Create a blank canvas
         img = Image.new(
@@ -177,7 +246,7 @@ class Maze():
         )
         draw = ImageDraw.Draw(img)
 
-        solution = self.solution[1] if self.solution is not None else None
+        solution = set(solution) if solution is not None else None
         for i, row in enumerate(self.walls):
             for j, col in enumerate(row):
 
@@ -213,17 +282,154 @@ class Maze():
                 )
 
         img.save(filename)
-
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
\ No newline at end of file
+        return [filename]
+
+
+def maze_files(paths):
+    """
+    Returns the maze files named by paths, each a file, a directory,
+    whose .txt files are taken, or a glob pattern, in name order.
+    """
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(sorted(glob.glob(os.path.join(glob.escape(path), "*.txt"))))
+        else:
+            filenames.extend(sorted(glob.glob(path)) or [path])
+    return filenames
+
+
+def solve_file(filename, algorithm="dfs", backend="lists", images=None,
+               cell_size=50, downsample=1):
+    """
+    Solves one maze file without printing it. Returns a dict with the
+    maze file name, whether it was solved ("found"), states explored,
+    path length, solve time and, with an images directory, the image
+    files drawn; or with an error message if the file is not a valid
+    maze.
+    """
+    result = {"maze": filename, "algorithm": algorithm}
+    try:
+        m = Maze(filename, backend)
+        try:
+            m.solve(algorithm)
+        except Exception as e:
+            if str(e) != "no solution":
+                raise
+        result["found"] = m.solution is not None
+        result["explored"] = m.num_explored
+        result["length"] = len(m.solution[0]) if m.solution is not None else None
+        result["seconds"] = round(m.time, 6)
+        if images is not None:
+            name = os.path.splitext(os.path.basename(filename))[0] + ".png"
+            result["images"] = m.output_image(
+                os.path.join(images, name), show_explored=True,
+                cell_size=cell_size, downsample=downsample
+            )
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def run_batch(filenames, out, workers=None, **options):
+    """
+    Solves every maze file in a pool of `workers` processes, passing
+    options on to solve_file, and writes one JSON object per line to
+    `out` as each maze is done, in no particular order.
+    Returns the number of mazes that were invalid or had no solution.
+    """
+    workers = workers or os.cpu_count() or 1
+    task = functools.partial(solve_file, **options)
+    if options.get("images") is not None:
+        os.makedirs(options["images"], exist_ok=True)
+
+    def report(result):
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+        return not result.get("found")
+
+    failures = 0
+    if workers == 1:
+        for filename in filenames:
+            failures += report(task(filename))
+        return failures
+    chunksize = max(1, min(16, len(filenames) // (workers * 4)))
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(task, filenames, chunksize):
+            failures += report(result)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a maze.")
+    parser.add_argument("maze", nargs="?")
+    parser.add_argument("--algorithm", choices=SOLVERS, default="dfs")
+    parser.add_argument("--compare", action="store_true",
+                        help="solve with every algorithm and compare them")
+    parser.add_argument("--backend", choices=("lists", "numpy"), default="lists",
+                        help="how to store walls; numpy needs NumPy installed")
+    parser.add_argument("--image", default="maze.png",
+                        help="image of the solved maze to write")
+    parser.add_argument("--no-image", action="store_true",
+                        help="do not write an image of the solved maze")
+    parser.add_argument("--cell-size", type=int, default=50,
+                        help="pixels per maze cell in images")
+    parser.add_argument("--downsample", type=int, default=1,
+                        help="draw each N by N block of cells as one cell")
+    parser.add_argument("--tile", type=int,
+                        help="split the image into tiles of up to N by N cells")
+    parser.add_argument(
+        "--batch", nargs="+", metavar="PATH",
+        help="solve every maze in these files, directories or glob patterns, "
+             "writing one JSON result per line"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for --batch")
+    parser.add_argument("--images", metavar="DIRECTORY",
+                        help="with --batch, draw each solved maze into this directory")
+    args = parser.parse_args(argv)
+
+    if args.batch is not None:
+        failures = run_batch(
+            maze_files(args.batch), sys.stdout, args.workers,
+            algorithm=args.algorithm, backend=args.backend, images=args.images,
+            cell_size=args.cell_size, downsample=args.downsample
+        )
+        return 1 if failures else 0
+    if args.maze is None:
+        parser.error("a maze file or --batch is required")
+
+    m = Maze(args.maze, args.backend)
+    if args.compare:
+        print(f"{'algorithm':>9} {'explored':>10} {'length':>8} {'seconds':>9}")
+        for algorithm in SOLVERS:
+            # The wavefront solver needs NumPy, which is optional
+            try:
+                m.solve(algorithm)
+            except ImportError:
+                print(f"{algorithm:>9} {'unavailable, needs NumPy':>29}")
+                continue
+            except Exception as e:
+                if str(e) != "no solution":
+                    raise
+                print(f"{algorithm:>9} {m.num_explored:>10} {'no solution':>18}")
+                continue
+            print(f"{algorithm:>9} {m.num_explored:>10} {len(m.solution[0]):>8} {m.time:>9.3f}")
+        return 0
+
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve(args.algorithm)
+    print("States Explored:", m.num_explored)
+    print(f"Time: {m.time:.3f} s")
+    print("Solution:")
+    m.print()
+    if not args.no_image:
+        m.output_image(args.image, show_explored=True, cell_size=args.cell_size,
+                       downsample=args.downsample, tile=args.tile)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+NumPy renderer for maze images.
+
+A maze is first reduced to one code per cell (wall, empty, explored,
+solution, start or goal). Codes are mapped to colours through a small
+palette and every cell is blown up to cell_size pixels square with
+np.repeat, so an image costs a few array operations instead of one
+drawing call per cell. Large mazes can be downsampled, each output cell
+summarising a block of maze cells, or saved as a grid of tiles so that
+no single image has to be held in memory.
+
+Requires NumPy and Pillow: pip install numpy pillow
+"""
+
+import os
+
+import numpy as np
+
+EMPTY, WALL, EXPLORED, SOLUTION, START, GOAL = range(6)
+
+# Colours of each code, as drawn by the original ImageDraw renderer
+PALETTE = np.array([
+    (237, 240, 252),
+    (40, 40, 40),
+    (212, 97, 85),
+    (220, 235, 113),
+    (255, 0, 0),
+    (0, 171, 28),
+], dtype=np.uint8)
+
+
+def cell_codes(walls, start, goal, solution=None, explored=None):
+    """
+    Returns a uint8 array holding the code of each cell. solution is a
+    list of (row, column) cells, explored a set of them or a
+    bitmap.Wavefront.
+    """
+    walls = np.asarray(walls, dtype=bool)
+    codes = np.zeros(walls.shape, dtype=np.uint8)
+    if explored is not None:
+        if hasattr(explored, "reached"):
+            codes[explored.reached()] = EXPLORED
+        elif explored:
+            cells = np.array(list(explored), dtype=np.intp)
+            codes[cells[:, 0], cells[:, 1]] = EXPLORED
+    if solution:
+        cells = np.array(solution, dtype=np.intp)
+        codes[cells[:, 0], cells[:, 1]] = SOLUTION
+    codes[start] = START
+    codes[goal] = GOAL
+    codes[walls] = WALL
+    return codes
+
+
+def downsample(codes, factor):
+    """
+    Shrinks codes by factor on each side. Each output cell shows the
+    start or goal, else the solution, else explored cells, if any of
+    its block holds them, and otherwise a wall if most of it is wall.
+    """
+    if factor <= 1:
+        return codes
+    height, width = codes.shape
+    rows, cols = -(-height // factor), -(-width // factor)
+    padded = np.zeros((rows * factor, cols * factor), dtype=np.uint8)
+    padded[:height, :width] = codes
+    blocks = padded.reshape(rows, factor, cols, factor)
+
+    # Codes are numbered so that the highest one present wins
+    strongest = blocks.max(axis=(1, 3))
+    walls = (blocks == WALL).sum(axis=(1, 3)) * 2 > factor * factor
+    return np.where(strongest >= EXPLORED, strongest, np.where(walls, WALL, EMPTY)).astype(np.uint8)
+
+
+def pixels(codes, cell_size=50):
+    """
+    Returns an RGB array of codes drawn cell_size pixels per cell,
+    with a black border around each cell.
+    """
+    border = cell_size // 25
+    image = PALETTE[codes].repeat(cell_size, axis=0).repeat(cell_size, axis=1)
+    if border:
+        # Cells are coloured from border to cell_size - border inclusive
+        offsets = np.arange(cell_size)
+        edge = (offsets < border) | (offsets > cell_size - border)
+        image[np.tile(edge, codes.shape[0])] = 0
+        image[:, np.tile(edge, codes.shape[1])] = 0
+    return image
+
+
+def save(codes, filename, cell_size=50, factor=1, tile=None):
+    """
+    Draws codes to filename, downsampled by factor. With tile, writes
+    one image per tile of up to tile by tile output cells instead,
+    named like maze_0_1.png for row 0, column 1.
+    Returns the list of files written.
+    """
+    from PIL import Image
+
+    codes = downsample(codes, factor)
+    if tile is None:
+        Image.fromarray(pixels(codes, cell_size)).save(filename)
+        return [filename]
+    root, ext = os.path.splitext(filename)
+    files = []
+    for r, row in enumerate(range(0, codes.shape[0], tile)):
+        for c, col in enumerate(range(0, codes.shape[1], tile)):
+            name = f"{root}_{r}_{c}{ext}"
+            part = codes[row:row + tile, col:col + tile]
+            Image.fromarray(pixels(part, cell_size)).save(name)
+            files.append(name)
+    return files
@@ -0,0 +1,358 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from search import solve
+import benchmark
+import distance
+import generate
+import maze
+
+try:
+    import numpy as np
+    import bitmap
+    import render
+except ImportError:
+    np = bitmap = render = None
+
+# Небольшой лабиринт в формате файлов maze.txt
+MAZE = [
+    "#########",
+    "#A  #   #",
+    "# # # # #",
+    "# #   # #",
+    "# ##### #",
+    "#      B#",
+    "#########",
+]
+START, GOAL = (1, 1), (5, 7)
+
+
+def neighbors(state):
+    row, col = state
+    return [
+        (None, (r, c)) for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+        if MAZE[r][c] != "#"
+    ]
+
+
+@unittest.skipIf(bitmap is None, "NumPy is not installed")
+class TestBitmap(unittest.TestCase):
+
+    def setUp(self):
+        self.walls = bitmap.read_walls(MAZE, len(MAZE[0]))
+
+    def test_read_walls(self):
+        """Тест: стены, старт и цель читаются в булев массив"""
+        self.assertEqual(self.walls.shape, (7, 9))
+        self.assertTrue(self.walls[0, 0])
+        self.assertFalse(self.walls[START])
+        self.assertFalse(self.walls[GOAL])
+
+    def test_wavefront_path(self):
+        """Тест: волновой BFS находит кратчайший путь по соседним клеткам"""
+        wavefront = bitmap.Wavefront(self.walls, START, GOAL)
+        actions, cells = wavefront.path()
+        expected = solve(START, lambda s: s == GOAL, neighbors, "bfs")
+        self.assertEqual(wavefront.distance, len(expected.states))
+        self.assertEqual(cells[-1], GOAL)
+        self.assertEqual(actions[0], "down")
+        previous = START
+        for cell in cells:
+            self.assertEqual(abs(cell[0] - previous[0]) + abs(cell[1] - previous[1]), 1)
+            self.assertFalse(self.walls[cell])
+            previous = cell
+
+    def test_whole_field(self):
+        """Тест: без цели обходятся все достижимые клетки, байт на клетку"""
+        wavefront = bitmap.Wavefront(self.walls, START)
+        self.assertEqual(wavefront.num_explored, int((~self.walls).sum()))
+        self.assertIsNone(wavefront.path())
+        self.assertIn(GOAL, wavefront)
+        self.assertEqual(wavefront.nbytes(), 9 * 11)
+
+    def test_grid_builder(self):
+        """Тест: строки читаются прямо в сетку с рамкой, байт на клетку"""
+        builder = bitmap.GridBuilder()
+        for line in MAZE:
+            builder.add(line)
+        grid = builder.grid()
+        self.assertEqual(grid.shape, (9, 11))
+        self.assertTrue(np.shares_memory(grid, np.frombuffer(builder.buffer, dtype=np.uint8)))
+        np.testing.assert_array_equal(grid, bitmap.padded(self.walls))
+
+        # Короткие строки дополняются свободными клетками
+        builder = bitmap.GridBuilder()
+        for line in ("#A#", "# B#", "#"):
+            builder.add(line)
+        np.testing.assert_array_equal(builder.grid()[1:-1, 1:-1] == bitmap.WALL, [
+            [True, False, True, False],
+            [True, False, False, True],
+            [True, False, False, False],
+        ])
+
+    def test_in_place(self):
+        """Тест: поиск идёт прямо в сетке лабиринта и повторяется после сброса"""
+        grid = bitmap.padded(self.walls)
+        first = bitmap.Wavefront(grid, START, GOAL)
+        self.assertIs(first.labels, grid)
+        path = first.path()
+        self.assertEqual(bitmap.Wavefront(grid, START, GOAL).path(), path)
+        self.assertEqual(bitmap.Wavefront(self.walls, START, GOAL).path(), path)
+        np.testing.assert_array_equal(grid[1:-1, 1:-1] == bitmap.WALL, self.walls)
+
+    def test_numpy_maze(self):
+        """Тест: волновой решатель не строит отдельный массив стен"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "maze.txt")
+            with open(path, "w") as f:
+                f.write("\n".join(MAZE) + "\n")
+            m = maze.Maze(path, "numpy")
+            m.solve("wavefront")
+            self.assertIsNone(m._walls)
+            self.assertEqual(len(m.solution[0]), 10)
+            m.solve("bfs")
+            self.assertEqual(len(m.solution[0]), 10)
+            np.testing.assert_array_equal(m.walls, self.walls)
+
+    def test_unreachable(self):
+        """Тест: замурованная цель — пути нет"""
+        self.walls[4, 7] = True
+        self.walls[5, 6] = True
+        self.assertIsNone(bitmap.Wavefront(self.walls, START, GOAL).path())
+
+
+@unittest.skipIf(render is None, "NumPy is not installed")
+class TestRender(unittest.TestCase):
+
+    def setUp(self):
+        self.walls = bitmap.read_walls(MAZE, len(MAZE[0]))
+        self.solution = bitmap.Wavefront(self.walls, START, GOAL).path()[1]
+
+    def test_cell_codes(self):
+        """Тест: коды клеток — стены, путь, старт и цель"""
+        codes = render.cell_codes(self.walls, START, GOAL, self.solution, {(1, 3)})
+        self.assertEqual(codes[0, 0], render.WALL)
+        self.assertEqual(codes[START], render.START)
+        self.assertEqual(codes[GOAL], render.GOAL)
+        self.assertEqual(codes[2, 1], render.SOLUTION)
+        self.assertEqual(codes[1, 3], render.EXPLORED)
+        self.assertEqual(codes[1, 5], render.EMPTY)
+
+    def test_downsample_keeps_path(self):
+        """Тест: при уменьшении путь и цель не пропадают, стены — по большинству"""
+        codes = render.cell_codes(self.walls, START, GOAL, self.solution)
+        small = render.downsample(codes, 3)
+        self.assertEqual(small.shape, (3, 3))
+        self.assertEqual(small[0, 0], render.START)
+        self.assertEqual(small[1, 2], render.GOAL)
+        self.assertEqual(small[1, 0], render.SOLUTION)
+        self.assertEqual(small[0, 1], render.WALL)
+        self.assertEqual(small[2, 2], render.EMPTY)
+
+    def test_pixels(self):
+        """Тест: клетка рисуется квадратом cell_size с чёрной рамкой"""
+        image = render.pixels(render.cell_codes(self.walls, START, GOAL), 50)
+        self.assertEqual(image.shape, (7 * 50, 9 * 50, 3))
+        self.assertEqual(tuple(image[50 + 2, 50 + 2]), tuple(render.PALETTE[render.START]))
+        self.assertEqual(tuple(image[50 + 48, 50 + 48]), tuple(render.PALETTE[render.START]))
+        self.assertEqual(tuple(image[50 + 49, 50 + 10]), (0, 0, 0))
+        self.assertEqual(tuple(image[50 + 10, 50 + 1]), (0, 0, 0))
+        self.assertEqual(render.pixels(render.cell_codes(self.walls, START, GOAL), 1).shape, (7, 9, 3))
+
+
+def open_cells(grid, width):
+    """Свободные клетки сгенерированного лабиринта и число пар соседних из них"""
+    cells = {divmod(i, width) for i, char in enumerate(grid) if char != ord("#")}
+    pairs = sum((r + 1, c) in cells for r, c in cells) + sum((r, c + 1) in cells for r, c in cells)
+    return cells, pairs
+
+
+class TestGenerate(unittest.TestCase):
+
+    def test_seeded(self):
+        """Тест: одно зерно даёт один и тот же лабиринт, другое — другой"""
+        for kind in generate.KINDS:
+            first = generate.generate(kind, 21, 31, seed=1)
+            self.assertEqual(first, generate.generate(kind, 21, 31, seed=1))
+            self.assertNotEqual(first, generate.generate(kind, 21, 31, seed=2))
+            self.assertEqual(len(first), 21 * 31)
+            self.assertEqual(first.count(b"A"), 1)
+            self.assertEqual(first.count(b"B"), 1)
+
+    def test_perfect_is_tree(self):
+        """Тест: в идеальном лабиринте нет циклов, а в лабиринте с петлями есть"""
+        cells, pairs = open_cells(generate.generate("perfect", 21, 31), 31)
+        self.assertEqual(pairs, len(cells) - 1)
+        cells, pairs = open_cells(generate.generate("loops", 21, 31, loops=0.2), 31)
+        self.assertGreater(pairs, len(cells) - 1)
+
+    def test_too_small(self):
+        """Тест: слишком маленький лабиринт и неизвестный вид — ValueError"""
+        with self.assertRaises(ValueError):
+            generate.generate("perfect", 3, 10)
+        with self.assertRaises(ValueError):
+            generate.generate("spiral", 10, 10)
+
+    def test_benchmark(self):
+        """Тест: каждый лабиринт решается, решатели BFS и A* дают одну длину пути"""
+        with tempfile.TemporaryDirectory() as directory:
+            filenames = generate.corpus(directory, sizes=(10, 15))
+            self.assertEqual(benchmark.maze_files([directory]), sorted(filenames))
+            for filename in filenames:
+                rows = list(benchmark.run(filename, ("bfs", "astar", "jps")))
+                self.assertTrue(all(row["found"] for row in rows))
+                self.assertEqual(len({row["length"] for row in rows}), 1)
+                self.assertTrue(all(row["peak_bytes"] > 0 for row in rows))
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.solved = os.path.join(self.directory.name, "solved.txt")
+        self.walled = os.path.join(self.directory.name, "walled.txt")
+        self.invalid = os.path.join(self.directory.name, "invalid.txt")
+        with open(self.solved, "w") as f:
+            f.write("\n".join(MAZE) + "\n")
+        with open(self.walled, "w") as f:
+            f.write("\n".join(MAZE[:4] + ["#" * 9] + MAZE[5:]) + "\n")
+        with open(self.invalid, "w") as f:
+            f.write("\n".join(row.replace("A", " ") for row in MAZE) + "\n")
+
+    def test_solve_file(self):
+        """Тест: решённый, замурованный и неверный лабиринты"""
+        result = maze.solve_file(self.solved, "bfs")
+        self.assertTrue(result["found"])
+        self.assertEqual(result["length"], 10)
+        result = maze.solve_file(self.walled, "bfs")
+        self.assertFalse(result["found"])
+        self.assertIsNone(result["length"])
+        result = maze.solve_file(self.invalid)
+        self.assertEqual(result["error"], "maze must have exactly one start point")
+
+    def test_run_batch(self):
+        """Тест: пакет в пуле процессов — по строке JSON на лабиринт"""
+        out = io.StringIO()
+        pattern = os.path.join(self.directory.name, "*.txt")
+        failures = maze.run_batch(maze.maze_files([pattern]), out, workers=2, algorithm="astar")
+        results = {os.path.basename(r["maze"]): r for r in map(json.loads, out.getvalue().splitlines())}
+        self.assertEqual(set(results), {"solved.txt", "walled.txt", "invalid.txt"})
+        self.assertEqual(failures, 2)
+        self.assertEqual(results["solved.txt"]["length"], 10)
+
+    def test_main(self):
+        """Тест: main без картинки и пакетный режим с кодом возврата"""
+        out = io.StringIO()
+        sys.stdout, stdout = out, sys.stdout
+        try:
+            self.assertEqual(maze.main([self.solved, "--algorithm", "bfs", "--no-image"]), 0)
+            self.assertEqual(maze.main(["--batch", self.solved, "--workers", "1"]), 0)
+            self.assertEqual(maze.main(["--batch", self.directory.name, "--workers", "1"]), 1)
+        finally:
+            sys.stdout = stdout
+        self.assertIn("States Explored:", out.getvalue())
+
+
+class TestCompare(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, "maze.txt")
+        with open(self.path, "w") as f:
+            f.write("\n".join(MAZE) + "\n")
+
+    def test_compare_without_numpy(self):
+        """Тест: без NumPy сравнение пропускает wavefront, а не падает"""
+        out = io.StringIO()
+        sys.stdout, stdout = out, sys.stdout
+        try:
+            with mock.patch.dict(sys.modules, {"numpy": None, "bitmap": None}):
+                self.assertEqual(maze.main([self.path, "--compare"]), 0)
+        finally:
+            sys.stdout = stdout
+        rows = {line.split()[0]: line for line in out.getvalue().splitlines()[1:]}
+        self.assertEqual(set(rows), set(maze.SOLVERS))
+        self.assertIn("unavailable", rows["wavefront"])
+        self.assertEqual(rows["bfs"].split()[2], "10")
+
+    def test_compare_no_solution(self):
+        """Тест: в неразрешимом лабиринте каждая строка сравнения — «no solution»"""
+        with open(self.path, "w") as f:
+            f.write("\n".join(MAZE[:4] + ["#" * 9] + MAZE[5:]) + "\n")
+        out = io.StringIO()
+        sys.stdout, stdout = out, sys.stdout
+        try:
+            self.assertEqual(maze.main([self.path, "--compare"]), 0)
+        finally:
+            sys.stdout = stdout
+        rows = out.getvalue().splitlines()[1:]
+        self.assertEqual(len(rows), len(maze.SOLVERS))
+        self.assertTrue(all("no solution" in row or "unavailable" in row for row in rows))
+
+    def test_benchmark_without_numpy(self):
+        """Тест: без NumPy бенчмарк пропускает wavefront"""
+        with mock.patch.dict(sys.modules, {"numpy": None, "bitmap": None}):
+            rows = list(benchmark.run(self.path, ("bfs", "wavefront"), memory=False))
+        self.assertEqual([row["algorithm"] for row in rows], ["bfs"])
+        self.assertEqual(rows[0]["length"], 10)
+
+
+class TestDistance(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.filename = os.path.join(self.directory.name, "maze.txt")
+        with open(self.filename, "w") as f:
+            f.write("\n".join(MAZE) + "\n")
+        distance._cache.clear()
+        self.maze = maze.Maze(self.filename)
+
+    def test_paths_match_search(self):
+        """Тест: путь из любой клетки по полю расстояний — кратчайший"""
+        for r, row in enumerate(MAZE):
+            for c, char in enumerate(row):
+                if char == "#":
+                    continue
+                actions, cells = self.maze.path_from((r, c))
+                expected = solve((r, c), lambda s: s == GOAL, neighbors, "bfs")
+                self.assertEqual(len(actions), len(expected.actions))
+                self.assertEqual(cells[-1] if cells else (r, c), GOAL)
+
+    def test_multiple_goals(self):
+        """Тест: несколько целей — путь ведёт к ближайшей"""
+        field = self.maze.distances([GOAL, (1, 7)])
+        self.assertEqual(field.distance((2, 7)), 1)
+        self.assertEqual(self.maze.path_from((2, 7), [GOAL, (1, 7)])[1][-1], (1, 7))
+        self.assertEqual(self.maze.path_from((5, 3), [GOAL, (1, 7)])[1][-1], GOAL)
+        self.assertIsNone(field.distance((0, 0)))
+        with self.assertRaises(ValueError):
+            self.maze.distances([(0, 0)])
+
+    def test_unreachable(self):
+        """Тест: из замурованной клетки пути нет"""
+        self.maze.walls[4][7] = True
+        self.maze.walls[5][6] = True
+        self.maze.digest = "walled"
+        self.assertIsNone(self.maze.path_from(START))
+
+    def test_cache(self):
+        """Тест: поле вычисляется один раз, на диске — по хешу файла"""
+        cache_dir = os.path.join(self.directory.name, "cache")
+        field = self.maze.distances(cache_dir=cache_dir)
+        self.assertIs(maze.Maze(self.filename).distances(), field)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        distance._cache.clear()
+        loaded = maze.Maze(self.filename).distances(cache_dir=cache_dir)
+        self.assertIsNot(loaded, field)
+        self.assertEqual(loaded.distances, field.distances)
@@ -0,0 +1,172 @@
+"""
+Statistics over the degrees graph.
+
+Connected components are found once with union-find over the movies,
+after which "are these two people connected at all?" is a near O(1)
+lookup, so unreachable queries need no search. Since star edges are
+only ever added, new people and edges are merged in as they arrive.
+Degree distributions and hub rankings show which people make searches
+expensive.
+
+Usage: python analytics.py [directory] [--top N]
+"""
+
+import argparse
+import heapq
+from array import array
+from collections import Counter
+
+
+class Analytics():
+    """
+    Components and degree statistics for a Graph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.parent = array("i", range(len(graph.person_ids)))
+        self.size = array("i", [1]) * len(graph.person_ids)
+        self.components = len(graph.person_ids)
+        for movie in range(len(graph.movie_ids)):
+            stars = graph.stars_of(movie)
+            first = next(stars, None)
+            for star in stars:
+                self.union(first, star)
+
+    def find(self, person):
+        """
+        Returns the representative of a person index's component.
+        """
+        parent = self.parent
+        while parent[person] != person:
+            parent[person] = parent[parent[person]]
+            person = parent[person]
+        return person
+
+    def union(self, a, b):
+        """
+        Merges the components of two person indexes.
+        """
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.components -= 1
+
+    def add_people(self):
+        """
+        Counts the people appended to the graph since, each on their own.
+        """
+        for person in range(len(self.parent), len(self.graph.person_ids)):
+            self.parent.append(person)
+            self.size.append(1)
+            self.components += 1
+
+    def add_star(self, person, movie):
+        """
+        Merges in a star edge just added to the graph.
+        """
+        for star in self.graph.stars_of(movie):
+            if star != person:
+                self.union(person, star)
+                return
+
+    def connected(self, a, b):
+        """
+        Returns whether any path joins two person indexes.
+        """
+        return self.find(a) == self.find(b)
+
+    def component_size(self, person):
+        return self.size[self.find(person)]
+
+    def component_sizes(self):
+        """
+        Returns the size of every component, largest first.
+        """
+        return sorted(
+            (self.size[p] for p in range(len(self.parent)) if self.parent[p] == p),
+            reverse=True
+        )
+
+    def movie_count(self, person):
+        """
+        Number of movies a person index starred in.
+        """
+        return self.graph.movie_count(person)
+
+    def fanout(self, person):
+        """
+        Number of (movie, co-star) pairs a search scans when it expands
+        a person index, i.e. the cost of that expansion.
+        """
+        graph = self.graph
+        return sum(graph.star_count(movie) for movie in graph.movies_of(person))
+
+    def degree_distribution(self, degree="movies"):
+        """
+        Returns a Counter of how many people have each degree, where
+        degree is "movies" (movie count) or "fanout".
+        """
+        measure = self.movie_count if degree == "movies" else self.fanout
+        return Counter(measure(person) for person in range(len(self.parent)))
+
+    def top_hubs(self, k=10, degree="fanout"):
+        """
+        Returns the k (person index, degree) pairs with the highest degree.
+        """
+        measure = self.movie_count if degree == "movies" else self.fanout
+        return heapq.nlargest(
+            k, ((person, measure(person)) for person in range(len(self.parent))),
+            key=lambda pair: pair[1]
+        )
+
+
+def log_buckets(distribution):
+    """
+    Groups a degree Counter into power-of-two buckets: 0, 1, 2-3, 4-7, ...
+    Returns a list of (low, high, count).
+    """
+    buckets = Counter()
+    for degree, count in distribution.items():
+        buckets[degree.bit_length()] += count
+    return [
+        (0 if bits == 0 else 1 << (bits - 1), 0 if bits == 0 else (1 << bits) - 1, buckets[bits])
+        for bits in sorted(buckets)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics over degrees data.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    import degrees
+    degrees.load_data(args.directory)
+    stats = degrees.analyze()
+    graph = stats.graph
+
+    sizes = stats.component_sizes()
+    print(f"People: {len(graph.person_ids)}, movies: {len(graph.movie_ids)}")
+    print(f"Components: {stats.components}, largest: {sizes[:5]}")
+    largest = sizes[0] if sizes else 0
+    print(f"People outside the largest component: {len(graph.person_ids) - largest}")
+
+    for degree in ("movies", "fanout"):
+        print(f"Distribution of {degree}:")
+        for low, high, count in log_buckets(stats.degree_distribution(degree)):
+            print(f"  {low:>7}-{high:<7} {count}")
+
+    print(f"Top {args.top} hubs by fanout:")
+    for person, fanout in stats.top_hubs(args.top):
+        person_id = graph.person_ids[person]
+        name = degrees.people[person_id]["name"]
+        print(f"  {name} ({person_id}): {fanout} in {stats.movie_count(person)} movies")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,512 @@
+"""
+Benchmarks for the degrees search.
+
+Usage: python benchmark.py <benchmark> [options]
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import degrees
+import loader
+import parallel
+from name_index import NameIndex
+import snapshot
+from util import Node, QueueFrontier, DequeQueueFrontier
+
+
+def random_graph(n, degree, seed):
+    """
+    Return adjacency lists for a random undirected graph on n nodes
+    in which every node links to `degree` random others.
+    """
+    rng = random.Random(seed)
+    adjacency = [[] for _ in range(n)]
+    for node in range(n):
+        for _ in range(degree):
+            other = rng.randrange(n)
+            adjacency[node].append(other)
+            adjacency[other].append(node)
+    return adjacency
+
+
+def frontier_bfs(adjacency, source, target, frontier_class):
+    """
+    Breadth-first search shaped like degrees.shortest_path, but with
+    a pluggable frontier class. Returns the number of nodes expanded.
+    """
+    frontier = frontier_class()
+    frontier.add(Node(state=source, parent=None, action=None))
+    explored = set()
+    while not frontier.empty():
+        node = frontier.remove()
+        if node.state == target:
+            break
+        explored.add(node.state)
+        for neighbor in adjacency[node.state]:
+            if not frontier.contains_state(neighbor) and neighbor not in explored:
+                frontier.add(Node(state=neighbor, parent=node, action=None))
+    return len(explored)
+
+
+def bench_frontier(args):
+    """
+    Compare QueueFrontier and DequeQueueFrontier on synthetic graphs.
+    """
+    print(f"{'nodes':>9} {'frontier':>9} {'expanded':>9} {'seconds':>9}")
+    for n in args.sizes:
+        adjacency = random_graph(n, args.degree, args.seed)
+
+        # Unreachable target, so the whole component is searched
+        target = -1
+        # DequeQueueFrontier is search.QueueFrontier under another
+        # name, so the rows are labelled by backing store instead
+        for name, frontier_class in (("list", QueueFrontier), ("deque", DequeQueueFrontier)):
+            if frontier_class is QueueFrontier and n > args.legacy_limit:
+                print(f"{n:>9} {name:>9} {'skipped':>9} {'-':>9}")
+                continue
+            start = time.perf_counter()
+            expanded = frontier_bfs(adjacency, 0, target, frontier_class)
+            elapsed = time.perf_counter() - start
+            print(f"{n:>9} {name:>9} {expanded:>9} {elapsed:>9.3f}")
+
+
+def bench_bidirectional(args):
+    """
+    Compare one-sided and bidirectional BFS over random actor pairs.
+    """
+    degrees.load_data(args.directory)
+    rng = random.Random(args.seed)
+    person_ids = sorted(degrees.people)
+
+    # Without the path cache the second search would be a cache hit
+    degrees.configure_caches(paths=0)
+    totals = {False: [0, 0.0], True: [0, 0.0]}
+    for _ in range(args.pairs):
+        source, target = rng.choice(person_ids), rng.choice(person_ids)
+        lengths = {}
+        for bidirectional in (False, True):
+            degrees.clear_caches()
+            start = time.perf_counter()
+            path = degrees.shortest_path(source, target, bidirectional)
+            totals[bidirectional][0] += degrees.num_explored
+            totals[bidirectional][1] += time.perf_counter() - start
+            lengths[bidirectional] = None if path is None else len(path)
+        if lengths[False] != lengths[True]:
+            sys.exit(f"Path lengths differ for {source} -> {target}: {lengths}")
+
+    print(f"{'search':>14} {'expanded':>10} {'seconds':>9}")
+    for bidirectional, label in ((False, "bfs"), (True, "bidirectional")):
+        expanded, elapsed = totals[bidirectional]
+        print(f"{label:>14} {expanded:>10} {elapsed:>9.3f}")
+    expanded = totals[False][0] / max(totals[True][0], 1)
+    elapsed = totals[False][1] / max(totals[True][1], 1e-9)
+    print(f"Reduction over {args.pairs} pairs: "
+          f"{expanded:.1f}x fewer expansions, {elapsed:.1f}x faster")
+
+
+def bench_graph(args):
+    """
+    Compare the memory and search speed of the compact graph
+    with the original dict-of-sets adjacency.
+    """
+    degrees.load_data(args.directory)
+    graph = degrees.graph
+
+    # Memory held by the graph: CSR arrays plus the id -> index dicts
+    tracemalloc.start()
+    rebuilt = type(graph)(
+        graph.person_ids, graph.movie_ids,
+        graph.person_offsets, graph.person_movies,
+        graph.movie_offsets, graph.movie_stars
+    )
+    rebuilt.person_index, rebuilt.movie_index
+    graph_bytes = tracemalloc.get_traced_memory()[0] + graph.nbytes()
+    tracemalloc.stop()
+    del rebuilt
+
+    # Memory held by the original "movies" and "stars" sets
+    tracemalloc.start()
+    for i, person_id in enumerate(graph.person_ids):
+        degrees.people[person_id]["movies"] = {
+            graph.movie_ids[movie] for movie in graph.movies_of(i)
+        }
+    for i, movie_id in enumerate(graph.movie_ids):
+        degrees.movies[movie_id]["stars"] = {
+            graph.person_ids[person] for person in graph.stars_of(i)
+        }
+    sets_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"{'adjacency':>10} {'MiB':>9}")
+    print(f"{'sets':>10} {sets_bytes / 2 ** 20:>9.2f}")
+    print(f"{'graph':>10} {graph_bytes / 2 ** 20:>9.2f}")
+    print(f"Memory reduction: {sets_bytes / max(graph_bytes, 1):.1f}x")
+
+    # Same queries over both representations
+    rng = random.Random(args.seed)
+    pairs = [
+        (rng.choice(graph.person_ids), rng.choice(graph.person_ids))
+        for _ in range(args.pairs)
+    ]
+    degrees.configure_caches(paths=0)
+    timings = {}
+    for label, current in (("sets", None), ("graph", graph)):
+        degrees.graph = current
+        degrees.clear_caches()
+        expanded = 0
+        start = time.perf_counter()
+        for source, target in pairs:
+            degrees.shortest_path(source, target)
+            expanded += degrees.num_explored
+        elapsed = time.perf_counter() - start
+        timings[label] = (expanded, elapsed)
+    print(f"{'search':>10} {'expanded':>10} {'seconds':>9} {'us/expand':>10}")
+    for label, (expanded, elapsed) in timings.items():
+        per = 1e6 * elapsed / max(expanded, 1)
+        print(f"{label:>10} {expanded:>10} {elapsed:>9.3f} {per:>10.2f}")
+
+
+def bench_startup(args):
+    """
+    Time load_data in a fresh interpreter without the snapshot cache,
+    with a cold cache (parse and write it) and with a warm cache.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    path = snapshot.snapshot_path(args.directory)
+
+    def run(cache):
+        code = (
+            "import degrees, sys, time\n"
+            "start = time.perf_counter()\n"
+            f"degrees.load_data(sys.argv[1], cache={cache})\n"
+            "print(time.perf_counter() - start)\n"
+        )
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", code, os.path.abspath(args.directory)],
+            cwd=here, check=True, capture_output=True, text=True
+        ).stdout
+        return float(output), time.perf_counter() - start
+
+    if os.path.exists(path):
+        os.remove(path)
+    print(f"{'startup':>10} {'load s':>9} {'process s':>10}")
+    for label, cache in (("no cache", False), ("cold", True), ("warm", True)):
+        load, total = run(cache)
+        print(f"{label:>10} {load:>9.3f} {total:>10.3f}")
+    print(f"Snapshot size: {os.path.getsize(path) / 2 ** 20:.2f} MiB")
+
+
+def bench_scaling(args):
+    """
+    Time distance_histograms over the same random sources
+    with 1 to N worker processes.
+    """
+    degrees.load_data(args.directory)
+    graph = degrees.graph
+    rng = random.Random(args.seed)
+    sources = rng.sample(range(len(graph)), min(args.sources, len(graph)))
+
+    print(f"{'workers':>8} {'seconds':>9} {'sources/s':>10} {'speedup':>8}")
+    baseline = None
+    reference = None
+    for workers in range(1, args.workers + 1):
+        start = time.perf_counter()
+        results = parallel.distance_histograms(graph, sources, workers, args.method)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            baseline, reference = elapsed, results
+        elif results != reference:
+            sys.exit(f"Results with {workers} workers differ from 1 worker")
+        print(f"{workers:>8} {elapsed:>9.3f} {len(sources) / elapsed:>10.2f} "
+              f"{baseline / elapsed:>8.2f}")
+
+
+def legacy_load(directory):
+    """
+    The original load_data: DictReader rows and per-person and
+    per-movie sets. Returns rows read per file.
+    """
+    names, people, movies = {}, {}, {}
+    rows = {}
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        for rows["people.csv"], row in enumerate(csv.DictReader(f), 1):
+            people[row["id"]] = {"name": row["name"], "birth": row["birth"], "movies": set()}
+            names.setdefault(row["name"].lower(), set()).add(row["id"])
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        for rows["movies.csv"], row in enumerate(csv.DictReader(f), 1):
+            movies[row["id"]] = {"title": row["title"], "year": row["year"], "stars": set()}
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        for rows["stars.csv"], row in enumerate(csv.DictReader(f), 1):
+            try:
+                people[row["person_id"]]["movies"].add(row["movie_id"])
+                movies[row["movie_id"]]["stars"].add(row["person_id"])
+            except KeyError:
+                pass
+    return rows
+
+
+def load_variant(variant, directory):
+    """
+    Load directory with one loader and print JSON with the rows and
+    seconds for each file and the peak RSS. Run in a fresh process.
+    """
+    if variant == "legacy":
+        start = time.perf_counter()
+        rows = legacy_load(directory)
+        elapsed = time.perf_counter() - start
+        stats = {"total": (sum(rows.values()), elapsed)}
+    else:
+        start = time.perf_counter()
+        _, stats = loader.load(directory, degrees.people, degrees.movies, degrees._add_name)
+        stats.pop("peak rss", None)
+        rows = sum(count for count, _ in stats.values())
+        stats["total"] = (rows, time.perf_counter() - start)
+    stats["peak rss"] = loader.peak_rss()
+    print(json.dumps(stats))
+
+
+def bench_load(args):
+    """
+    Compare the original DictReader loader with the streaming loader,
+    each in a fresh interpreter.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = "import benchmark, sys; benchmark.load_variant(sys.argv[1], sys.argv[2])"
+    print(f"{'loader':>10} {'file':>11} {'rows':>10} {'rows/s':>11} {'peak RSS MiB':>13}")
+    for variant in ("legacy", "streaming"):
+        output = subprocess.run(
+            [sys.executable, "-c", code, variant, os.path.abspath(args.directory)],
+            cwd=here, check=True, capture_output=True, text=True
+        ).stdout
+        stats = json.loads(output)
+        rss = stats.pop("peak rss")
+        rss = "-" if rss is None else f"{rss / 2 ** 20:.1f}"
+        for filename, (rows, elapsed) in stats.items():
+            print(f"{variant:>10} {filename:>11} {rows:>10} "
+                  f"{rows / max(elapsed, 1e-9):>11.0f} {rss:>13}")
+
+
+def bench_components(args):
+    """
+    Time the component precomputation, then the unreachable pairs
+    among random queries with and without it.
+    """
+    degrees.load_data(args.directory)
+    start = time.perf_counter()
+    stats = degrees.analyze()
+    print(f"Components: {stats.components}, "
+          f"built in {time.perf_counter() - start:.3f} s")
+
+    rng = random.Random(args.seed)
+    person_ids = degrees.graph.person_ids
+    pairs = [
+        (rng.choice(person_ids), rng.choice(person_ids))
+        for _ in range(args.pairs)
+    ]
+    unreachable = [pair for pair in pairs if not degrees.connected(*pair)]
+    print(f"Unreachable: {len(unreachable)} of {len(pairs)} random pairs")
+
+    degrees.configure_caches(paths=0)
+    print(f"{'search':>12} {'expanded':>10} {'seconds':>9}")
+    for label, current in (("no analysis", None), ("components", stats)):
+        degrees.analytics = current
+        expanded = 0
+        start = time.perf_counter()
+        for source, target in unreachable:
+            degrees.shortest_path(source, target)
+            expanded += degrees.num_explored
+        elapsed = time.perf_counter() - start
+        print(f"{label:>12} {expanded:>10} {elapsed:>9.3f}")
+
+
+def misspell(rng, name):
+    """
+    Returns name with one random character dropped, doubled or swapped.
+    """
+    if len(name) < 4:
+        return name
+    i = rng.randrange(1, len(name) - 1)
+    edit = rng.randrange(3)
+    if edit == 0:
+        return name[:i] + name[i + 1:]
+    if edit == 1:
+        return name[:i] + name[i] + name[i:]
+    return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+
+
+def bench_names(args):
+    """
+    Time fuzzy name lookups for exact, prefix and misspelled names
+    drawn from the whole people table.
+    """
+    degrees.load_data(args.directory)
+    start = time.perf_counter()
+    index = NameIndex(degrees.names)
+    print(f"Indexed {len(index)} names in {time.perf_counter() - start:.3f} s")
+
+    rng = random.Random(args.seed)
+    keys = rng.choices(index.keys, k=args.lookups)
+    queries = {
+        "exact": keys,
+        "prefix": [key[:max(3, len(key) // 2)] for key in keys],
+        "misspelled": [misspell(rng, key) for key in keys],
+    }
+    print(f"{'query':>11} {'mean us':>9} {'p99 us':>9} {'found':>7}")
+    means = []
+    for label, texts in queries.items():
+        latencies = []
+        found = 0
+        for key, text in zip(keys, texts):
+            start = time.perf_counter()
+            results = index.search(text, 10)
+            latencies.append(time.perf_counter() - start)
+            found += any(name == key for name, _ in results)
+        latencies.sort()
+        mean = 1e6 * sum(latencies) / len(latencies)
+        p99 = 1e6 * latencies[int(0.99 * (len(latencies) - 1))]
+        print(f"{label:>11} {mean:>9.1f} {p99:>9.1f} {found / len(keys):>7.1%}")
+        means.append(mean)
+    verdict = "met" if max(means) < 1000 else "missed"
+    print(f"Sub-millisecond mean lookup target: {verdict}")
+
+
+def bench_delta(args):
+    """
+    Time applying the last --rows rows of stars.csv as a delta to a
+    server-ready load of the rest, against a full reload of the whole
+    data with components and name index rebuilt.
+    """
+    def reload(directory, cache):
+        for table in (degrees.names, degrees.people, degrees.movies):
+            table.clear()
+        start = time.perf_counter()
+        degrees.load_data(directory, cache=cache)
+        degrees.analyze()
+        degrees.index_names()
+        return time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as scratch:
+        full = os.path.join(scratch, "full")
+        base = os.path.join(scratch, "base")
+        delta = os.path.join(scratch, "delta")
+        for directory in (full, base, delta):
+            os.mkdir(directory)
+        for filename in ("people.csv", "movies.csv", "stars.csv"):
+            shutil.copy(os.path.join(args.directory, filename), full)
+        for filename in ("people.csv", "movies.csv"):
+            shutil.copy(os.path.join(args.directory, filename), base)
+        with open(os.path.join(args.directory, "stars.csv"), encoding="utf-8") as f:
+            lines = f.readlines()
+        rows = min(args.rows, len(lines) - 1)
+        for directory, body in ((base, lines[1:len(lines) - rows]),
+                                (delta, lines[len(lines) - rows:])):
+            with open(os.path.join(directory, "stars.csv"), "w", encoding="utf-8") as f:
+                f.writelines([lines[0]] + body)
+
+        print(f"{'update':>16} {'seconds':>9}")
+        print(f"{'reload':>16} {reload(full, False):>9.3f}")
+        reload(full, True)
+        print(f"{'snapshot reload':>16} {reload(full, True):>9.3f}")
+        reload(base, False)
+        start = time.perf_counter()
+        added = degrees.apply_delta(delta)
+        print(f"{'delta':>16} {time.perf_counter() - start:>9.3f}")
+        print(f"Applied {rows} rows: {added}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for degrees.")
+    benchmarks = parser.add_subparsers(dest="benchmark", required=True)
+
+    frontier = benchmarks.add_parser(
+        "frontier", help="list-backed vs deque-backed BFS frontier"
+    )
+    frontier.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    frontier.add_argument("--degree", type=int, default=2)
+    frontier.add_argument("--seed", type=int, default=0)
+    frontier.add_argument(
+        "--legacy-limit", type=int, default=10_000,
+        help="largest graph to run the quadratic QueueFrontier on"
+    )
+    frontier.set_defaults(run=bench_frontier)
+
+    bidirectional = benchmarks.add_parser(
+        "bidirectional", help="one-sided vs bidirectional BFS on real data"
+    )
+    bidirectional.add_argument("directory", nargs="?", default="large")
+    bidirectional.add_argument("--pairs", type=int, default=100)
+    bidirectional.add_argument("--seed", type=int, default=0)
+    bidirectional.set_defaults(run=bench_bidirectional)
+
+    compact = benchmarks.add_parser(
+        "graph", help="dict-of-sets adjacency vs compact CSR graph"
+    )
+    compact.add_argument("directory", nargs="?", default="large")
+    compact.add_argument("--pairs", type=int, default=100)
+    compact.add_argument("--seed", type=int, default=0)
+    compact.set_defaults(run=bench_graph)
+
+    startup = benchmarks.add_parser(
+        "startup", help="load_data time with and without the snapshot cache"
+    )
+    startup.add_argument("directory", nargs="?", default="large")
+    startup.set_defaults(run=bench_startup)
+
+    scaling = benchmarks.add_parser(
+        "scaling", help="multi-source BFS with 1 to N worker processes"
+    )
+    scaling.add_argument("directory", nargs="?", default="large")
+    scaling.add_argument("--sources", type=int, default=64)
+    scaling.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    scaling.add_argument("--method", choices=("fork", "shared"), default=None)
+    scaling.add_argument("--seed", type=int, default=0)
+    scaling.set_defaults(run=bench_scaling)
+
+    load = benchmarks.add_parser(
+        "load", help="rows/s and peak RSS of the original and streaming loaders"
+    )
+    load.add_argument("directory", nargs="?", default="large")
+    load.set_defaults(run=bench_load)
+
+    components = benchmarks.add_parser(
+        "components", help="unreachable queries with and without components"
+    )
+    components.add_argument("directory", nargs="?", default="large")
+    components.add_argument("--pairs", type=int, default=200)
+    components.add_argument("--seed", type=int, default=0)
+    components.set_defaults(run=bench_components)
+
+    names = benchmarks.add_parser(
+        "names", help="fuzzy name lookups over the whole people table"
+    )
+    names.add_argument("directory", nargs="?", default="large")
+    names.add_argument("--lookups", type=int, default=2000)
+    names.add_argument("--seed", type=int, default=0)
+    names.set_defaults(run=bench_names)
+
+    delta = benchmarks.add_parser(
+        "delta", help="apply a delta of new star rows vs reload everything"
+    )
+    delta.add_argument("directory", nargs="?", default="large")
+    delta.add_argument("--rows", type=int, default=10_000)
+    delta.set_defaults(run=bench_delta)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
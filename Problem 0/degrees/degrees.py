@@ -1,152 +1,323 @@
-import csv
+import argparse
+import json
+import os
+import re
 import sys
+from itertools import chain, islice
 
-from util import Node, StackFrontier, QueueFrontier
+import loader
+import snapshot
+from analytics import Analytics
+from graph import Graph
+from lru import LRUCache
+from name_index import NameIndex
+from util import ALGORITHMS, solve
 
 # Maps names to a set of corresponding person_ids
 names = {}
 
-# Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
+# Maps person_ids to a dictionary of: name, birth, and, unless the
+# graph below holds the edges instead, movies (a set of movie_ids)
 people = {}
 
-# Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
+# Maps movie_ids to a dictionary of: title, year, and, unless the
+# graph below holds the edges instead, stars (a set of person_ids)
 movies = {}
 
+# Compact Graph of who starred in what, once built by load_data
+# or build_graph; searches fall back to the sets above while it is None
+graph = None
 
-def load_data(directory):
+# Components and degree statistics for graph, once built by analyze()
+analytics = None
+
+# Fuzzy index over names, built on first use by index_names()
+name_index = None
+
+# Lowest find_people score worth suggesting for a name that is not found
+SUGGESTION_SCORE = 0.3
+
+# Number of people expanded by the most recent search
+num_explored = 0
+
+# Recently used neighbor lists, by person_id, and search results, by
+# unordered pair of person_ids; cleared whenever the data is reloaded
+NEIGHBOR_CACHE_SIZE = 4096
+PATH_CACHE_SIZE = 1024
+neighbor_cache = LRUCache(NEIGHBOR_CACHE_SIZE)
+path_cache = LRUCache(PATH_CACHE_SIZE)
+_MISSING = object()
+
+
+def load_data(directory, cache=True):
     """
     Load data from CSV files into memory.
+    The files are streamed by loader.load, and star edges go straight
+    into the compact graph.
+
+    With `cache`, the parsed data is also saved to a binary snapshot
+    in `directory`, and later calls memory-map that snapshot instead
+    of parsing the CSV files, until any of them changes.
     """
-    # Load people
-    with open(f"{directory}/people.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
-
-    # Load movies
-    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
-
-    # Load stars
-    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
-                pass
+    global graph, analytics, name_index
+    analytics = None
+    name_index = None
+    clear_caches()
+
+    if cache:
+        stats = snapshot.source_stats(directory)
+        path = snapshot.snapshot_path(directory)
+        loaded = snapshot.read(path, stats)
+        if loaded is not None:
+            cached_people, cached_movies, graph = loaded
+            people.update(cached_people)
+            movies.update(cached_movies)
+            for person_id, person in cached_people.items():
+                _add_name(person["name"], person_id)
+            return
+
+    graph, _ = loader.load(directory, people, movies, _add_name)
+
+    if cache:
+        try:
+            snapshot.write(path, stats, people, movies, graph)
+        except OSError:
+            pass
 
 
-def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+def _add_name(name, person_id):
+    if name.lower() not in names:
+        names[name.lower()] = {person_id}
+        if name_index is not None:
+            name_index.add(name.lower())
+    else:
+        names[name.lower()].add(person_id)
 
-    # Load data from files into memory
-    print("Loading data...")
-    load_data(directory)
-    print("Data loaded.")
 
-    source = person_id_for_name(input("Name: "))
-    if source is None:
-        sys.exit("Person not found.")
-    target = person_id_for_name(input("Name: "))
-    if target is None:
-        sys.exit("Person not found.")
+def apply_delta(directory):
+    """
+    Apply the rows of whichever of people.csv, movies.csv and stars.csv
+    exist in directory to the loaded data, as update does.
+    """
+    rows = []
+    for filename, columns in (("people.csv", ("id", "name", "birth")),
+                              ("movies.csv", ("id", "title", "year")),
+                              ("stars.csv", ("person_id", "movie_id"))):
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            rows.append(chain.from_iterable(loader.read_chunks(path, columns)))
+        else:
+            rows.append(())
+    return update(*rows)
+
+
+def update(new_people=(), new_movies=(), new_stars=()):
+    """
+    Apply new rows to the loaded data without reloading it: tuples of
+    (id, name, birth), (id, title, year) and (person_id, movie_id), as
+    in the CSV files. Rows for known people and movies replace their
+    details; stars with an unknown person or movie are skipped.
+
+    The graph, components and name index are extended in place. Only
+    the cached neighbor lists of the casts that changed are dropped,
+    and only the cached paths within components that gained edges.
+    Returns counts of the people, movies and stars added.
+    """
+    added = {"people": 0, "movies": 0, "stars": 0}
+    stats = analytics if analytics is not None and analytics.graph is graph else None
+
+    for person_id, name, birth in new_people:
+        person_id = sys.intern(person_id)
+        person = people.get(person_id)
+        if person is not None:
+            if person["name"].lower() != name.lower():
+                names[person["name"].lower()].discard(person_id)
+                _add_name(name, person_id)
+            person.update(name=name, birth=sys.intern(birth))
+            continue
+        people[person_id] = {"name": name, "birth": sys.intern(birth)}
+        if graph is not None:
+            graph.add_person(person_id)
+        else:
+            people[person_id]["movies"] = set()
+        _add_name(name, person_id)
+        added["people"] += 1
+    if stats is not None:
+        stats.add_people()
+
+    for movie_id, title, year in new_movies:
+        movie_id = sys.intern(movie_id)
+        if movie_id in movies:
+            movies[movie_id].update(title=title, year=sys.intern(year))
+            continue
+        movies[movie_id] = {"title": title, "year": sys.intern(year)}
+        if graph is not None:
+            graph.add_movie(movie_id)
+        else:
+            movies[movie_id]["stars"] = set()
+        added["movies"] += 1
+
+    # People whose neighbor lists change, and components that do
+    changed_people = set()
+    roots = set()
+    for person_id, movie_id in new_stars:
+        if person_id not in people or movie_id not in movies:
+            continue
+        if graph is None:
+            cast = movies[movie_id]["stars"]
+            if person_id in cast:
+                continue
+            changed_people.update(cast)
+            cast.add(person_id)
+            people[person_id]["movies"].add(movie_id)
+        else:
+            person = graph.person_index[person_id]
+            movie = graph.movie_index[movie_id]
+            if not graph.add_star(person, movie):
+                continue
+            cast = [graph.person_ids[star] for star in graph.stars_of(movie)]
+            changed_people.update(cast)
+            if stats is not None:
+                roots.add(stats.find(person))
+                roots.add(stats.find(graph.person_index[cast[0]]))
+                stats.add_star(person, movie)
+        changed_people.add(person_id)
+        added["stars"] += 1
+
+    for person_id in changed_people:
+        neighbor_cache.discard(person_id)
+    if added["stars"]:
+        if stats is None:
+            path_cache.clear()
+        else:
+            # Components only ever merge, so paths, and the lack of
+            # them, only change for pairs in the merged components
+            changed = {stats.find(root) for root in roots}
+            index = graph.person_index
+            path_cache.discard_where(lambda pair: stats.find(index[pair[0]]) in changed)
+    return added
+
+
+def build_graph():
+    """
+    Build the compact graph from the "movies" and "stars" sets in
+    `people` and `movies`, for data that was filled in by hand.
+    """
+    global graph, analytics
+    graph = Graph.from_data(people, movies)
+    analytics = None
+    clear_caches()
 
-    path = shortest_path(source, target)
 
-    if path is None:
-        print("Not connected.")
-    else:
-        degrees = len(path)
-        print(f"{degrees} degrees of separation.")
-        path = [(None, source)] + path
-        for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
-            print(f"{i + 1}: {person1} and {person2} starred in {movie}")
+def analyze():
+    """
+    Compute connected components and degree statistics for the graph,
+    building the graph first if needed. Once built, shortest_path
+    answers unreachable pairs without searching.
+    """
+    global analytics
+    if graph is None:
+        build_graph()
+    if analytics is None:
+        analytics = Analytics(graph)
+    return analytics
 
 
-import csv
-import sys
+def connected(source, target):
+    """
+    Returns whether any path joins two person_ids.
+    """
+    stats = analyze()
+    return stats.connected(graph.person_index[source], graph.person_index[target])
 
-from util import Node, StackFrontier, QueueFrontier
 
-# Maps names to a set of corresponding person_ids
-names = {}
+def configure_caches(neighbors=None, paths=None):
+    """
+    Resize the neighbor and path caches; 0 turns a cache off.
+    """
+    if neighbors is not None:
+        neighbor_cache.resize(neighbors)
+    if paths is not None:
+        path_cache.resize(paths)
 
-# Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
-people = {}
 
-# Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
-movies = {}
+def clear_caches():
+    neighbor_cache.clear()
+    path_cache.clear()
 
 
-def load_data(directory):
+def cache_stats():
     """
-    Load data from CSV files into memory.
+    Returns hit, miss and eviction counters for both caches.
     """
-    # Load people
-    with open(f"{directory}/people.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
-
-    # Load movies
-    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
-
-    # Load stars
-    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
-                pass
+    return {"neighbors": neighbor_cache.stats(), "paths": path_cache.stats()}
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
-
-    # Load data from files into memory
-    print("Loading data...")
-    load_data(directory)
-    print("Data loaded.")
+    parser = argparse.ArgumentParser(description="Degrees of separation.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument(
+        "--batch", metavar="FILE",
+        help="answer 'source<TAB>target' name pairs from FILE ('-' for stdin) "
+             "as JSON lines instead of prompting"
+    )
+    parser.add_argument(
+        "--serve", metavar="PORT", type=int,
+        help="load the data once and answer queries over HTTP on PORT"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--bidirectional", action="store_true")
+    parser.add_argument("--algorithm", choices=ALGORITHMS,
+                        help="search with the shared search engine instead")
+    parser.add_argument("--paths", type=int, metavar="K",
+                        help="also list up to K shortest paths, most popular movies first")
+    parser.add_argument("--neighbor-cache", type=int, default=NEIGHBOR_CACHE_SIZE,
+                        metavar="N", help="neighbor lists to keep cached")
+    parser.add_argument("--path-cache", type=int, default=PATH_CACHE_SIZE,
+                        metavar="N", help="search results to keep cached")
+    args = parser.parse_args()
+    configure_caches(args.neighbor_cache, args.path_cache)
+
+    # Load data from files into memory; keep stdout clean for batch output
+    log = sys.stderr if args.batch else sys.stdout
+    print("Loading data...", file=log)
+    load_data(args.directory)
+    print("Data loaded.", file=log)
+
+    # Long-running modes answer many queries, so indexes pay off
+    if args.batch is not None or args.serve is not None:
+        analyze()
+        index_names()
+
+    if args.batch is not None:
+        if args.batch == "-":
+            run_batch(sys.stdin, sys.stdout, args.bidirectional, args.paths, args.algorithm)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                run_batch(f, sys.stdout, args.bidirectional, args.paths, args.algorithm)
+        return
+    if args.serve is not None:
+        import server
+
+        # Queries only read the data and run side by side; updates
+        # change it in place, so they wait for queries and block them
+        lock = server.ReadWriteLock()
+
+        def answer(source, target):
+            with lock.read():
+                return connection(source, target, args.bidirectional,
+                                  algorithm=args.algorithm)
+
+        def search(query, limit):
+            with lock.read():
+                return find_people(query, limit)
+
+        def apply(rows):
+            with lock.write():
+                return update(rows["people"], rows["movies"], rows["stars"])
+
+        server.serve(args.host, args.serve, answer, cache_stats, search, apply)
+        return
 
     source = person_id_for_name(input("Name: "))
     if source is None:
@@ -155,112 +326,381 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    path = shortest_path(source, target, args.bidirectional, args.algorithm)
 
     if path is None:
         print("Not connected.")
+    elif args.paths:
+        print(f"{len(path)} degrees of separation, "
+              f"{count_shortest_paths(source, target)} shortest paths.")
+        for n, path in enumerate(islice(all_shortest_paths(source, target, True), args.paths)):
+            print(f"Path {n + 1}:")
+            print_path(source, path)
     else:
-        degrees = len(path)
-        print(f"{degrees} degrees of separation.")
-        path = [(None, source)] + path
-        for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
-            print(f"{i + 1}: {person1} and {person2} starred in {movie}")
+        print(f"{len(path)} degrees of separation.")
+        print_path(source, path)
 
 
-def shortest_path(source, target):
+def print_path(source, path):
+    degrees = len(path)
+    path = [(None, source)] + path
+    for i in range(degrees):
+        person1 = people[path[i][1]]["name"]
+        person2 = people[path[i + 1][1]]["name"]
+        movie = movies[path[i + 1][0]]["title"]
+        print(f"{i + 1}: {person1} and {person2} starred in {movie}")
+
+
+def run_batch(lines, out, bidirectional=False, paths=None, algorithm=None):
     """
-    Returns the shortest list of (movie_id, person_id) pairs
-    that connect the source to the target.
-    If no possible path, returns None.
+    Answer one 'source<TAB>target' query per line of `lines`,
+    writing one JSON object per line to `out` as soon as it is found.
+    """
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        pair = line.split("\t")
+        if len(pair) != 2:
+            result = {"query": line, "error": "expected 'source<TAB>target'"}
+        else:
+            result = connection(pair[0], pair[1], bidirectional, paths, algorithm)
+        out.write(json.dumps(result) + "\n")
+        out.flush()
+
+
+def connection(source_name, target_name, bidirectional=False, paths=None, algorithm=None):
+    """
+    Answers a query between two names (or person_ids) without prompting.
+    Returns a dict with the source, target, degrees (None if not
+    connected) and path steps, or with an error message instead.
+    With `paths`, it also holds the number of shortest paths ("count")
+    and the steps of up to that many of them, most popular first.
     """
+    result = {"source": source_name, "target": target_name}
+    source, error = resolve_person(source_name)
+    if error is None:
+        target, error = resolve_person(target_name)
+    if error is not None:
+        result["error"] = error
+        return result
+
+    path = shortest_path(source, target, bidirectional, algorithm)
+    if path is None:
+        result["degrees"] = None
+        result["path"] = []
+        return result
+    result["degrees"] = len(path)
+    result["path"] = _steps(source, path)
+    if paths:
+        current, dag = _path_dag(source, target)
+        result["count"] = dag.count()
+        result["paths"] = [
+            _steps(source, path)
+            for path in islice(_dag_paths(current, dag, ranked=True), paths)
+        ]
+    return result
+
+
+def _steps(source, path):
+    """
+    Describes a path from source as a list of person1/person2/movie dicts.
+    """
+    steps = []
+    previous = source
+    for movie_id, person_id in path:
+        steps.append({
+            "person1": people[previous]["name"],
+            "person2": people[person_id]["name"],
+            "movie": movies[movie_id]["title"],
+        })
+        previous = person_id
+    return steps
+
+
+def resolve_person(name, birth=None):
+    """
+    Returns (person_id, None) for a name or person_id that identifies
+    exactly one person, or (None, error message) otherwise.
+    People who share a name are told apart by birth year, given either
+    as `birth` or at the end of the name, as in "Chris Evans (1981)".
+    """
+    if name in people:
+        return name, None
+    if birth is None:
+        match = re.fullmatch(r"\s*(.*?)\s*\((\d{4})\)\s*", name)
+        if match:
+            name, birth = match.groups()
+    person_ids = sorted(names.get(" ".join(name.lower().split()), set()))
+    if birth is not None:
+        person_ids = [p for p in person_ids if people[p]["birth"] == str(birth)]
+    if len(person_ids) == 0:
+        error = f"Person not found: {name}" + ("" if birth is None else f" ({birth})")
+        suggestions = [
+            _describe(match) for match in find_people(name, 3)
+            if match["score"] >= SUGGESTION_SCORE
+        ]
+        if suggestions:
+            error += f". Did you mean: {'; '.join(suggestions)}?"
+        return None, error
+    if len(person_ids) > 1:
+        choices = "; ".join(_describe({"person_id": p, **people[p]}) for p in person_ids)
+        return None, f"Ambiguous name: {name}. Add a birth year: {choices}"
+    return person_ids[0], None
+
+
+def find_people(query, limit=10):
+    """
+    Returns up to limit people whose names match query exactly, by
+    prefix or approximately, best first, as dicts of person_id, name,
+    birth and score.
+    """
+    matches = []
+    for key, score in index_names().search(query, limit):
+        for person_id in sorted(names.get(key, ())):
+            person = people[person_id]
+            matches.append({
+                "person_id": person_id,
+                "name": person["name"],
+                "birth": person["birth"],
+                "score": round(score, 3),
+            })
+    return matches[:limit]
+
 
-    # 1. Инициализация начальной точки
-    start = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
-    frontier.add(start)
+def index_names():
+    """
+    Returns the fuzzy name index, building it if needed.
+    """
+    global name_index
+    if name_index is None:
+        name_index = NameIndex(names)
+    return name_index
 
-    # 2. Создаём множество уже исследованных актёров
-    explored = set()
 
-    # 3. Запускаем цикл поиска
-    while True:
+def _describe(person):
+    birth = f" ({person['birth']})" if person["birth"] else ""
+    return f"{person['name']}{birth}, ID {person['person_id']}"
+
+
+def shortest_path(source, target, bidirectional=False, algorithm=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target.
+    If no possible path, returns None.
 
-        # Если очередь пуста — пути нет
-        if frontier.empty():
+    Naming an algorithm from ALGORITHMS runs the shared search engine
+    instead. "dfs" and "greedy" may find longer paths, so results of a
+    named algorithm are not cached.
+    """
+    global num_explored
+    if algorithm is not None:
+        return _engine_search(source, target, algorithm)
+
+    # Results are cached once per unordered pair, as the path from
+    # the smaller person_id to the larger one
+    key = (source, target) if source <= target else (target, source)
+    cached = path_cache.get(key, _MISSING)
+    if cached is not _MISSING:
+        num_explored = 0
+        if cached is None:
             return None
+        return list(cached) if key[0] == source else _reverse_path(target, cached)
 
-        # Берём следующий узел из очереди
-        node = frontier.remove()
+    path = _search(source, target, bidirectional)
+    if path is None:
+        path_cache.put(key, None)
+    elif key[0] == source:
+        path_cache.put(key, tuple(path))
+    else:
+        path_cache.put(key, tuple(_reverse_path(source, path)))
+    return path
 
-        # Если нашли цель — восстанавливаем путь
-        if node.state == target:
-            path = []
 
-            # Поднимаемся по цепочке родителей до источника
-            while node.parent is not None:
-                path.append((node.action, node.state))
-                node = node.parent
+def _reverse_path(source, path):
+    """
+    Turns a path that starts at source into the same path walked
+    from its other end back to source.
+    """
+    previous = [source] + [person_id for _, person_id in path[:-1]]
+    return [
+        (movie_id, person_id)
+        for (movie_id, _), person_id in zip(reversed(path), reversed(previous))
+    ]
+
+
+def _search(source, target, bidirectional):
+    global num_explored
+    if (analytics is not None and analytics.graph is graph and source != target
+            and not connected(source, target)):
+        num_explored = 0
+        return None
+    if bidirectional:
+        return bidirectional_shortest_path(source, target)
+    if graph is not None:
+        path, num_explored = graph.shortest_path(
+            graph.person_index[source], graph.person_index[target]
+        )
+        if path is None:
+            return None
+        return [
+            (graph.movie_ids[movie], graph.person_ids[person])
+            for movie, person in path
+        ]
+    return _engine_search(source, target, "bfs")
 
-            path.reverse()
-            return path
 
-        # Помечаем актёра как исследованного
-        explored.add(node.state)
+def _engine_search(source, target, algorithm):
+    """
+    Search with the shared search engine over neighbors_for_person.
+    The data offers no distance estimate, so "greedy" and "astar" run
+    without a heuristic.
+    """
+    global num_explored
+    solution = solve(
+        source, lambda state: state == target, _neighbor_list, algorithm
+    )
+    num_explored = solution.num_explored
+    if not solution.found:
+        return None
+    return list(zip(solution.actions, solution.states))
 
-        # Добавляем соседей
-        for movie_id, person_id in neighbors_for_person(node.state):
-            if not frontier.contains_state(person_id) and person_id not in explored:
-                child = Node(state=person_id, parent=node, action=movie_id)
-                frontier.add(child)
 
+def all_shortest_paths(source, target, ranked=False):
+    """
+    Yields every shortest path between two person_ids, in the format
+    of shortest_path, one at a time. With `ranked`, paths through more
+    popular movies come first, popularity being the number of people
+    who starred in a movie, since the data has no ratings.
+    """
+    current, dag = _path_dag(source, target)
+    if dag is not None:
+        yield from _dag_paths(current, dag, ranked)
 
 
-def person_id_for_name(name):
+def count_shortest_paths(source, target):
     """
-    Returns the IMDB id for a person's name,
-    resolving ambiguities as needed.
+    Returns the number of shortest paths between two person_ids.
     """
-    person_ids = list(names.get(name.lower(), set()))
-    if len(person_ids) == 0:
-        return None
-    elif len(person_ids) > 1:
-        print(f"Which '{name}'?")
-        for person_id in person_ids:
-            person = people[person_id]
-            name = person["name"]
-            birth = person["birth"]
-            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
-        try:
-            person_id = input("Intended Person ID: ")
-            if person_id in person_ids:
-                return person_id
-        except ValueError:
-            pass
-        return None
-    else:
-        return person_ids[0]
+    _, dag = _path_dag(source, target)
+    return 0 if dag is None else dag.count()
 
 
-def neighbors_for_person(person_id):
+def _path_dag(source, target):
     """
-    Returns (movie_id, person_id) pairs for people
-    who starred with a given person.
+    Returns the graph searched and its ShortestPaths between two
+    person_ids, or None for the latter if they are not connected.
     """
-    movie_ids = people[person_id]["movies"]
-    neighbors = set()
-    for movie_id in movie_ids:
-        for person_id in movies[movie_id]["stars"]:
-            neighbors.add((movie_id, person_id))
-    return neighbors
+    current = graph if graph is not None else Graph.from_data(people, movies)
+    return current, current.shortest_paths(
+        current.person_index[source], current.person_index[target]
+    )
 
 
-if __name__ == "__main__":
-    main()
+def _dag_paths(current, dag, ranked):
+    paths = dag.best(current.star_count) if ranked else dag
+    person_ids, movie_ids = current.person_ids, current.movie_ids
+    for path in paths:
+        yield [(movie_ids[movie], person_ids[person]) for movie, person in path]
+
 
-    raise NotImplementedError
+def single_source(source):
+    """
+    Returns a dict mapping every person reachable from source to
+    (degrees, movie_id, person_id), where the movie and person are the
+    previous step on a shortest path back to source. The source itself
+    maps to (0, None, None).
+    """
+    current = graph if graph is not None else Graph.from_data(people, movies)
+    distance, parent, via = current.single_source(current.person_index[source])
+    person_ids, movie_ids = current.person_ids, current.movie_ids
+    reachable = {}
+    for person, degrees in enumerate(distance):
+        if degrees > 0:
+            reachable[person_ids[person]] = (
+                degrees, movie_ids[via[person]], person_ids[parent[person]]
+            )
+    reachable[source] = (0, None, None)
+    return reachable
+
+
+def bidirectional_shortest_path(source, target):
+    """
+    Same result as shortest_path, but searches from both ends at once,
+    always expanding whichever side has the smaller frontier, and
+    joins the two parent chains where they meet.
+    """
+    global num_explored
+    num_explored = 0
+    if source == target:
+        return []
+
+    # Each side maps a person to (movie_id, person_id) one step closer
+    # to its own end, and to their distance from that end
+    forward = {source: None}
+    backward = {target: None}
+    forward_depth = {source: 0}
+    backward_depth = {target: 0}
+    forward_layer = [source]
+    backward_layer = [target]
+
+    while forward_layer and backward_layer:
+
+        # Grow the smaller side by one whole layer
+        if len(forward_layer) <= len(backward_layer):
+            parents, depth, layer = forward, forward_depth, forward_layer
+            other_depth = backward_depth
+        else:
+            parents, depth, layer = backward, backward_depth, backward_layer
+            other_depth = forward_depth
+
+        next_layer = []
+        meeting = None
+        best = None
+        for person in layer:
+            num_explored += 1
+            for movie_id, person_id in _neighbor_list(person):
+                if person_id in parents:
+                    continue
+                parents[person_id] = (movie_id, person)
+                depth[person_id] = depth[person] + 1
+                next_layer.append(person_id)
+                if person_id in other_depth:
+                    total = depth[person_id] + other_depth[person_id]
+                    if best is None or total < best:
+                        meeting, best = person_id, total
+
+        # The best meeting point in the first layer that meets is optimal
+        if meeting is not None:
+            return _join_paths(forward, backward, meeting)
+
+        if parents is forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+
+    return None
+
+
+def _join_paths(forward, backward, meeting):
+    """
+    Builds the (movie_id, person_id) path through `meeting` from the
+    forward and backward parent maps of a bidirectional search.
+    """
+    path = []
+    person = meeting
+    while forward[person] is not None:
+        movie_id, parent = forward[person]
+        path.append((movie_id, person))
+        person = parent
+    path.reverse()
+
+    person = meeting
+    while backward[person] is not None:
+        movie_id, child = backward[person]
+        path.append((movie_id, child))
+        person = child
+    return path
 
 
 def person_id_for_name(name):
@@ -294,13 +734,34 @@ def neighbors_for_person(person_id):
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
-    movie_ids = people[person_id]["movies"]
-    neighbors = set()
-    for movie_id in movie_ids:
-        for person_id in movies[movie_id]["stars"]:
-            neighbors.add((movie_id, person_id))
+    return set(_neighbor_list(person_id))
+
+
+def _neighbor_list(person_id):
+    """
+    Returns the same pairs as neighbors_for_person as a tuple,
+    from the neighbor cache when possible.
+    """
+    neighbors = neighbor_cache.get(person_id)
+    if neighbors is None:
+        neighbors = tuple(_iter_neighbors(person_id))
+        neighbor_cache.put(person_id, neighbors)
     return neighbors
 
 
+def _iter_neighbors(person_id):
+    """
+    Yields the pairs for neighbors_for_person straight from the data.
+    """
+    if graph is not None:
+        person_ids, movie_ids = graph.person_ids, graph.movie_ids
+        for movie, person in graph.neighbors(graph.person_index[person_id]):
+            yield movie_ids[movie], person_ids[person]
+        return
+    for movie_id in people[person_id]["movies"]:
+        for person_id in movies[movie_id]["stars"]:
+            yield movie_id, person_id
+
+
 if __name__ == "__main__":
     main()
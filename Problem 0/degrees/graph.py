@@ -0,0 +1,469 @@
+import heapq
+from array import array
+from collections import deque
+from functools import cached_property
+
+
+class Graph():
+    """
+    Compact person/movie graph.
+
+    People and movies are numbered densely from 0, and the bipartite
+    star edges are kept twice in CSR form: the movies of person p are
+    person_movies[person_offsets[p]:person_offsets[p + 1]], and the
+    stars of movie m are movie_stars[movie_offsets[m]:movie_offsets[m + 1]].
+
+    People, movies and star edges added later (see add_person, add_movie
+    and add_star) go to small overlay dicts of arrays, extra_movies by
+    person and extra_stars by movie, which searches read alongside the
+    CSR arrays; compact() folds them back in.
+    """
+
+    def __init__(self, person_ids, movie_ids,
+                 person_offsets, person_movies, movie_offsets, movie_stars):
+        self.person_ids = person_ids
+        self.movie_ids = movie_ids
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+        self.extra_movies = {}
+        self.extra_stars = {}
+
+    @classmethod
+    def from_edges(cls, person_ids, movie_ids, edge_people, edge_movies):
+        """
+        Build a graph from parallel arrays of (person index, movie index)
+        star edges. Repeated edges are dropped.
+        """
+        person_offsets, person_movies = _csr(len(person_ids), edge_people, edge_movies)
+        movie_offsets, movie_stars = _csr(len(movie_ids), edge_movies, edge_people)
+        return cls(person_ids, movie_ids,
+                   person_offsets, person_movies, movie_offsets, movie_stars)
+
+    @classmethod
+    def from_data(cls, people, movies):
+        """
+        Build a graph from degrees-style `people` and `movies` dicts
+        whose entries carry "movies" and "stars" sets.
+        """
+        person_ids = list(people)
+        movie_ids = list(movies)
+        movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+        edge_people = array("i")
+        edge_movies = array("i")
+        for i, person_id in enumerate(person_ids):
+            for movie_id in people[person_id]["movies"]:
+                edge_people.append(i)
+                edge_movies.append(movie_index[movie_id])
+        return cls.from_edges(person_ids, movie_ids, edge_people, edge_movies)
+
+    @cached_property
+    def person_index(self):
+        """
+        Maps person_ids to person indexes, built on first use.
+        """
+        return {person_id: i for i, person_id in enumerate(self.person_ids)}
+
+    @cached_property
+    def movie_index(self):
+        """
+        Maps movie_ids to movie indexes, built on first use.
+        """
+        return {movie_id: i for i, movie_id in enumerate(self.movie_ids)}
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    def movies_of(self, person):
+        """
+        Yields the movie indexes a person index starred in.
+        """
+        movies = self.person_movies
+        for k in range(self.person_offsets[person], self.person_offsets[person + 1]):
+            yield movies[k]
+        yield from self.extra_movies.get(person, ())
+
+    def stars_of(self, movie):
+        """
+        Yields the person indexes that starred in a movie index.
+        """
+        stars = self.movie_stars
+        for k in range(self.movie_offsets[movie], self.movie_offsets[movie + 1]):
+            yield stars[k]
+        yield from self.extra_stars.get(movie, ())
+
+    def movie_count(self, person):
+        """
+        Number of movies a person index starred in.
+        """
+        extra = self.extra_movies.get(person, ())
+        return self.person_offsets[person + 1] - self.person_offsets[person] + len(extra)
+
+    def star_count(self, movie):
+        """
+        Number of people who starred in a movie index.
+        """
+        extra = self.extra_stars.get(movie, ())
+        return self.movie_offsets[movie + 1] - self.movie_offsets[movie] + len(extra)
+
+    def neighbors(self, person):
+        """
+        Yields (movie index, person index) pairs for everyone who starred
+        with a person index, including the person themselves.
+        """
+        for movie in self.movies_of(person):
+            for star in self.stars_of(movie):
+                yield movie, star
+
+    def add_person(self, person_id):
+        """
+        Appends a person with no movies yet. Returns its index.
+        """
+        self.person_offsets = _growable(self.person_offsets)
+        self.person_offsets.append(self.person_offsets[-1])
+        person = len(self.person_ids)
+        self.person_ids.append(person_id)
+        self.person_index[person_id] = person
+        return person
+
+    def add_movie(self, movie_id):
+        """
+        Appends a movie with no stars yet. Returns its index.
+        """
+        self.movie_offsets = _growable(self.movie_offsets)
+        self.movie_offsets.append(self.movie_offsets[-1])
+        movie = len(self.movie_ids)
+        self.movie_ids.append(movie_id)
+        self.movie_index[movie_id] = movie
+        return movie
+
+    def add_star(self, person, movie):
+        """
+        Adds a star edge between a person index and a movie index.
+        Returns False if the edge was already there.
+        """
+        if movie in self.movies_of(person):
+            return False
+        self.extra_movies.setdefault(person, array("i")).append(movie)
+        self.extra_stars.setdefault(movie, array("i")).append(person)
+        return True
+
+    def compact(self):
+        """
+        Returns an equal graph with the added edges merged into new
+        CSR arrays, or this graph if none were added.
+        """
+        if not self.extra_movies:
+            return self
+        edge_people = array("i")
+        edge_movies = array("i")
+        for person in range(len(self.person_ids)):
+            movies = list(self.movies_of(person))
+            edge_people.extend([person] * len(movies))
+            edge_movies.extend(movies)
+        graph = Graph.from_edges(self.person_ids, self.movie_ids, edge_people, edge_movies)
+        graph.person_index = self.person_index
+        graph.movie_index = self.movie_index
+        return graph
+
+    def shortest_path(self, source, target):
+        """
+        Breadth-first search between two person indexes.
+        Returns (path, expanded) where path is a list of
+        (movie index, person index) pairs, or None if not connected.
+        """
+        if source == target:
+            return [], 0
+
+        person_offsets, person_movies = self.person_offsets, self.person_movies
+        movie_offsets, movie_stars = self.movie_offsets, self.movie_stars
+        extra_movies, extra_stars = self.extra_movies, self.extra_stars
+
+        # parent[p] is the person p was reached from, via movie via[p];
+        # a movie is only ever scanned once, since all its stars are
+        # reached together
+        parent = array("i", [-1]) * len(self.person_ids)
+        via = array("i", [-1]) * len(self.person_ids)
+        seen_movie = bytearray(len(self.movie_ids))
+        parent[source] = source
+
+        queue = deque([source])
+        expanded = 0
+        while queue:
+            person = queue.popleft()
+            expanded += 1
+            movies = person_movies[person_offsets[person]:person_offsets[person + 1]]
+            if person in extra_movies:
+                movies = [*movies, *extra_movies[person]]
+            for movie in movies:
+                if seen_movie[movie]:
+                    continue
+                seen_movie[movie] = 1
+                stars = movie_stars[movie_offsets[movie]:movie_offsets[movie + 1]]
+                if movie in extra_stars:
+                    stars = [*stars, *extra_stars[movie]]
+                for star in stars:
+                    if parent[star] != -1:
+                        continue
+                    parent[star] = person
+                    via[star] = movie
+                    if star == target:
+                        return self._path(parent, via, source, target), expanded
+                    queue.append(star)
+        return None, expanded
+
+    def single_source(self, source):
+        """
+        Breadth-first search from one person index to everyone.
+        Returns (distance, parent, via) arrays indexed by person: the
+        distance from source (-1 if unreachable), and the person and
+        movie through which each reachable person was first reached.
+        """
+        person_offsets, person_movies = self.person_offsets, self.person_movies
+        movie_offsets, movie_stars = self.movie_offsets, self.movie_stars
+        extra_movies, extra_stars = self.extra_movies, self.extra_stars
+
+        distance = array("i", [-1]) * len(self.person_ids)
+        parent = array("i", [-1]) * len(self.person_ids)
+        via = array("i", [-1]) * len(self.person_ids)
+        seen_movie = bytearray(len(self.movie_ids))
+        distance[source] = 0
+        parent[source] = source
+
+        queue = deque([source])
+        while queue:
+            person = queue.popleft()
+            step = distance[person] + 1
+            movies = person_movies[person_offsets[person]:person_offsets[person + 1]]
+            if person in extra_movies:
+                movies = [*movies, *extra_movies[person]]
+            for movie in movies:
+                if seen_movie[movie]:
+                    continue
+                seen_movie[movie] = 1
+                stars = movie_stars[movie_offsets[movie]:movie_offsets[movie + 1]]
+                if movie in extra_stars:
+                    stars = [*stars, *extra_stars[movie]]
+                for star in stars:
+                    if distance[star] == -1:
+                        distance[star] = step
+                        parent[star] = person
+                        via[star] = movie
+                        queue.append(star)
+        return distance, parent, via
+
+    def shortest_paths(self, source, target):
+        """
+        Breadth-first search between two person indexes that keeps every
+        shortest path rather than one. Returns them as a ShortestPaths
+        DAG, or None if the two are not connected.
+        """
+        person_offsets, person_movies = self.person_offsets, self.person_movies
+        movie_offsets, movie_stars = self.movie_offsets, self.movie_stars
+        extra_movies, extra_stars = self.extra_movies, self.extra_stars
+
+        # Label people with their distance from source, a layer at a
+        # time, up to the layer that holds target
+        distance = array("i", [-1]) * len(self.person_ids)
+        seen_movie = bytearray(len(self.movie_ids))
+        distance[source] = 0
+        layer = [source]
+        depth = 0
+        while layer and distance[target] == -1:
+            depth += 1
+            next_layer = []
+            for person in layer:
+                movies = person_movies[person_offsets[person]:person_offsets[person + 1]]
+                if person in extra_movies:
+                    movies = [*movies, *extra_movies[person]]
+                for movie in movies:
+                    if seen_movie[movie]:
+                        continue
+                    seen_movie[movie] = 1
+                    stars = movie_stars[movie_offsets[movie]:movie_offsets[movie + 1]]
+                    if movie in extra_stars:
+                        stars = [*stars, *extra_stars[movie]]
+                    for star in stars:
+                        if distance[star] == -1:
+                            distance[star] = depth
+                            next_layer.append(star)
+            layer = next_layer
+        if distance[target] == -1:
+            return None
+
+        # Walk back from target, keeping only the steps that lead one
+        # layer closer to source
+        steps = {}
+        layer = {target}
+        for depth in range(distance[target], 0, -1):
+            previous = set()
+            for person in layer:
+                for movie in self.movies_of(person):
+                    for star in self.stars_of(movie):
+                        if distance[star] == depth - 1:
+                            pairs = steps.get(star)
+                            if pairs is None:
+                                pairs = steps[star] = array("i")
+                            pairs.append(movie)
+                            pairs.append(person)
+                            previous.add(star)
+            layer = previous
+        return ShortestPaths(source, target, distance[target], steps)
+
+    def _path(self, parent, via, source, target):
+        path = []
+        person = target
+        while person != source:
+            path.append((via[person], person))
+            person = parent[person]
+        path.reverse()
+        return path
+
+    def nbytes(self):
+        """
+        Bytes held by the CSR arrays and the overlay arrays.
+        """
+        arrays = [self.person_offsets, self.person_movies, self.movie_offsets, self.movie_stars]
+        arrays.extend(self.extra_movies.values())
+        arrays.extend(self.extra_stars.values())
+        return sum(len(a) * a.itemsize for a in arrays)
+
+
+class ShortestPaths():
+    """
+    Every shortest path between two person indexes, as a layered DAG:
+    steps[p] is an array of flattened (movie, person) pairs, one for
+    each step from p to a person one layer closer to target. The DAG
+    only holds people on some shortest path, so it stays small even
+    when the number of paths through it grows exponentially; paths are
+    produced one at a time as lists of (movie index, person index).
+    """
+
+    def __init__(self, source, target, length, steps):
+        self.source = source
+        self.target = target
+        self.length = length
+        self.steps = steps
+
+    def count(self):
+        """
+        Number of shortest paths, without listing them.
+        """
+        ways = {self.target: 1}
+
+        def count_from(person):
+            if person not in ways:
+                pairs = self.steps[person]
+                ways[person] = sum(count_from(pairs[i + 1]) for i in range(0, len(pairs), 2))
+            return ways[person]
+
+        return count_from(self.source)
+
+    def __iter__(self):
+        """
+        Yields every shortest path, depth first, keeping only the
+        current path and one cursor per step on it.
+        """
+        if self.source == self.target:
+            yield []
+            return
+        path = []
+        stack = [[self.steps[self.source], 0]]
+        while stack:
+            frame = stack[-1]
+            pairs, i = frame
+            if i == len(pairs):
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            frame[1] = i + 2
+            movie, person = pairs[i], pairs[i + 1]
+            if person == self.target:
+                yield path + [(movie, person)]
+            else:
+                path.append((movie, person))
+                stack.append([self.steps[person], 0])
+
+    def best(self, weight):
+        """
+        Yields every shortest path, highest total weight(movie index)
+        first. Each path popped is the best left, since the search
+        knows the best possible rest of the path from every person.
+        """
+        # best[p] is the highest weight of any path from p to target
+        best = {self.target: 0}
+
+        def best_from(person):
+            if person not in best:
+                pairs = self.steps[person]
+                best[person] = max(
+                    weight(pairs[i]) + best_from(pairs[i + 1])
+                    for i in range(0, len(pairs), 2)
+                )
+            return best[person]
+
+        if self.source == self.target:
+            yield []
+            return
+
+        # Heap of (-bound, -steps, tie, person, weight so far, path so
+        # far), where paths are linked (movie, person, rest) tuples that
+        # share their common prefixes. Equal bounds, the usual case, go
+        # to the longest path first, so the search runs depth first and
+        # the first path costs O(length * branching), not a whole layer
+        tie = 0
+        heap = [(-best_from(self.source), 0, tie, self.source, 0, None)]
+        while heap:
+            _, depth, _, person, total, path = heapq.heappop(heap)
+            if person == self.target:
+                steps = []
+                while path is not None:
+                    movie, step, path = path
+                    steps.append((movie, step))
+                steps.reverse()
+                yield steps
+                continue
+            pairs = self.steps[person]
+            for i in range(0, len(pairs), 2):
+                movie, step = pairs[i], pairs[i + 1]
+                reached = total + weight(movie)
+                tie += 1
+                heapq.heappush(heap, (
+                    -(reached + best_from(step)), depth - 1, tie, step, reached, (movie, step, path)
+                ))
+
+
+def _growable(offsets):
+    """
+    Returns offsets as an array that can be appended to, copying it
+    if it is a read-only view such as a memory-mapped snapshot.
+    """
+    return offsets if isinstance(offsets, array) else array("i", offsets)
+
+
+def _csr(count, sources, targets):
+    """
+    Group parallel (source, target) index arrays by source.
+    Returns (offsets, index) arrays with each segment sorted and unique.
+    """
+    offsets = array("i", [0]) * (count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    index = array("i", [0]) * len(sources)
+    cursor = array("i", offsets)
+    for source, target in zip(sources, targets):
+        index[cursor[source]] = target
+        cursor[source] += 1
+
+    # Drop repeated edges, keeping each segment sorted
+    unique_offsets = array("i", [0])
+    unique_index = array("i")
+    for i in range(count):
+        unique_index.extend(sorted(set(index[offsets[i]:offsets[i + 1]])))
+        unique_offsets.append(len(unique_index))
+    return unique_offsets, unique_index
@@ -0,0 +1,118 @@
+"""
+Streaming CSV loader for degrees data.
+
+Rows are read with a plain csv.reader, a chunk at a time, and only the
+needed columns are picked out by index, so no per-row dicts are built.
+People and movies are numbered as they are read, star edges go straight
+into int arrays, and repeated strings (ids, birth years, release years)
+are interned so each distinct value is stored once.
+"""
+
+import csv
+import sys
+import time
+from array import array
+from itertools import islice
+from operator import itemgetter
+
+from graph import Graph
+
+CHUNK_SIZE = 65536
+
+
+def read_chunks(path, columns, chunk_size=CHUNK_SIZE):
+    """
+    Yields lists of up to chunk_size tuples holding the named columns
+    of each row of the CSV file at path.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        pick = itemgetter(*(header.index(column) for column in columns))
+        while True:
+            chunk = [pick(row) for row in islice(reader, chunk_size)]
+            if not chunk:
+                return
+            yield chunk
+
+
+def load(directory, people, movies, add_name, chunk_size=CHUNK_SIZE):
+    """
+    Fill `people` and `movies` from the CSV files in directory, calling
+    add_name(name, person_id) for every person.
+    Returns (graph, stats) where stats maps each file name to
+    (rows, seconds), plus "peak rss" in bytes when it can be measured.
+    """
+    intern = sys.intern
+    stats = {}
+
+    # Load people, numbering them in file order
+    start = time.perf_counter()
+    rows = 0
+    person_ids = list(people)
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+    for chunk in read_chunks(f"{directory}/people.csv", ("id", "name", "birth"), chunk_size):
+        for person_id, name, birth in chunk:
+            person_id = intern(person_id)
+            if person_id not in person_index:
+                person_index[person_id] = len(person_ids)
+                person_ids.append(person_id)
+            people[person_id] = {"name": name, "birth": intern(birth)}
+            add_name(name, person_id)
+        rows += len(chunk)
+    stats["people.csv"] = (rows, time.perf_counter() - start)
+
+    # Load movies
+    start = time.perf_counter()
+    rows = 0
+    movie_ids = list(movies)
+    movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+    for chunk in read_chunks(f"{directory}/movies.csv", ("id", "title", "year"), chunk_size):
+        for movie_id, title, year in chunk:
+            movie_id = intern(movie_id)
+            if movie_id not in movie_index:
+                movie_index[movie_id] = len(movie_ids)
+                movie_ids.append(movie_id)
+            movies[movie_id] = {"title": title, "year": intern(year)}
+        rows += len(chunk)
+    stats["movies.csv"] = (rows, time.perf_counter() - start)
+
+    # Load stars as parallel arrays of person and movie indexes
+    start = time.perf_counter()
+    rows = 0
+    edge_people = array("i")
+    edge_movies = array("i")
+    for chunk in read_chunks(f"{directory}/stars.csv", ("person_id", "movie_id"), chunk_size):
+        for person_id, movie_id in chunk:
+            person = person_index.get(person_id)
+            movie = movie_index.get(movie_id)
+            if person is not None and movie is not None:
+                edge_people.append(person)
+                edge_movies.append(movie)
+        rows += len(chunk)
+    graph = Graph.from_edges(person_ids, movie_ids, edge_people, edge_movies)
+    graph.person_index = person_index
+    graph.movie_index = movie_index
+    stats["stars.csv"] = (rows, time.perf_counter() - start)
+
+    rss = peak_rss()
+    if rss is not None:
+        stats["peak rss"] = rss
+    return graph, stats
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of this process in bytes,
+    or None where the resource module is unavailable.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,103 @@
+"""
+Load generator for the degrees HTTP server.
+
+Sends shortest-path queries from several concurrent connections and
+reports throughput and latency. Query pairs come from a
+'source<TAB>target' file, or are sampled from a dataset's people.csv.
+
+Usage: python loadgen.py (--pairs FILE | --directory DIR) [options]
+"""
+
+import argparse
+import csv
+import http.client
+import random
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+
+def load_pairs(args):
+    if args.pairs:
+        with open(args.pairs, encoding="utf-8") as f:
+            return [
+                tuple(line.rstrip("\r\n").split("\t"))
+                for line in f if line.count("\t") == 1
+            ]
+    with open(f"{args.directory}/people.csv", encoding="utf-8") as f:
+        person_ids = [row["id"] for row in csv.DictReader(f)]
+    rng = random.Random(args.seed)
+    return [
+        (rng.choice(person_ids), rng.choice(person_ids))
+        for _ in range(min(args.requests, 10_000))
+    ]
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for server.py.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pairs", help="file of 'source<TAB>target' queries")
+    source.add_argument("--directory", help="sample person ids from DIR/people.csv")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pairs = load_pairs(args)
+    if not pairs:
+        sys.exit("No query pairs.")
+    url = urlsplit(args.url)
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def worker():
+        connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            source, target = pairs[i % len(pairs)]
+            query = urlencode({"source": source, "target": target})
+            start = time.perf_counter()
+            try:
+                connection.request("GET", f"/path?{query}")
+                response = connection.getresponse()
+                response.read()
+                failed = response.status >= 500
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                failed = True
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                errors[0] += failed
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Requests: {len(latencies)} ({errors[0]} failed), "
+          f"concurrency {args.concurrency}")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} queries/s")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"Latency {label}: {1000 * percentile(latencies, fraction):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache():
+    """
+    Bounded least-recently-used cache with hit, miss and eviction
+    counters. A maxsize of 0 disables caching. Safe to share between
+    threads.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached for key and marks it recently used,
+        or default if key is not cached.
+        """
+        with self.lock:
+            try:
+                value = self.data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        Caches value for key, evicting the least recently used
+        entries beyond maxsize.
+        """
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key):
+        """
+        Drops the entry for key, if any.
+        """
+        with self.lock:
+            self.data.pop(key, None)
+
+    def discard_where(self, predicate):
+        """
+        Drops every entry whose key satisfies predicate.
+        Returns the number dropped.
+        """
+        with self.lock:
+            keys = [key for key in self.data if predicate(key)]
+            for key in keys:
+                del self.data[key]
+            return len(keys)
+
+    def resize(self, maxsize):
+        with self.lock:
+            self.maxsize = maxsize
+            while len(self.data) > max(maxsize, 0):
+                self.data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drops every entry; the counters are kept.
+        """
+        with self.lock:
+            self.data.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self.data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit rate": self.hits / lookups if lookups else None,
+            }
@@ -0,0 +1,218 @@
+"""
+Fuzzy lookup over the lowercase names in degrees.names.
+
+Names are kept sorted, for prefix matches by bisection, and indexed on
+two levels: every name is listed under each word in it, and every
+distinct word is listed under each of its character trigrams. A query
+finds, for each of its words, the known words that equal it, extend it
+(for the last word) or share most of its trigrams; candidate names are
+those holding a match for every query word that has one, starting from
+the word with the fewest names. Candidates are ranked by trigram overlap
+with the whole query. The word vocabulary is far smaller than the name
+list, and both the trigram postings scanned per word and the names
+ranked per query are capped, aiming at lookups under a millisecond on
+a million names, common and misspelled words included; "benchmark.py
+names" reports whether the mean lookup meets that.
+
+Names added later are appended, so existing postings stay valid, and
+also kept in small sorted side lists for prefix matching.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+
+# Word-trigram posting entries one query word may scan
+SCAN_BUDGET = 1000
+
+# Most similar words kept per query word, and how similar they must be
+WORD_MATCHES = 8
+WORD_SIMILARITY = 0.3
+
+# Most candidate names ranked per query
+CANDIDATES = 200
+
+
+def normalize(text):
+    return " ".join(text.lower().split())
+
+
+def trigrams(text):
+    """
+    Returns the set of trigrams of text, padded so that the start
+    and end of the text count for more.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a, b):
+    """
+    Jaccard similarity of two trigram sets.
+    """
+    return len(a & b) / len(a | b)
+
+
+class NameIndex():
+
+    def __init__(self, names):
+        """
+        Index the keys of `names`, a dict of lowercase names.
+        """
+        self.keys = sorted(names)
+        self.words = {}
+        for i, key in enumerate(self.keys):
+            for word in set(key.split()):
+                postings = self.words.get(word)
+                if postings is None:
+                    postings = self.words[word] = array("i")
+                postings.append(i)
+
+        # keys and vocabulary are sorted up to these counts; later
+        # additions are appended and also insorted into added_*
+        self.sorted_keys = len(self.keys)
+        self.added_keys = []
+
+        self.vocabulary = sorted(self.words)
+        self.sorted_words = len(self.vocabulary)
+        self.added_words = []
+        self.grams = {}
+        for i, word in enumerate(self.vocabulary):
+            for gram in trigrams(word):
+                postings = self.grams.get(gram)
+                if postings is None:
+                    postings = self.grams[gram] = array("i")
+                postings.append(i)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, name):
+        """
+        Index one more lowercase name, which must not be indexed yet.
+        """
+        i = len(self.keys)
+        self.keys.append(name)
+        insort(self.added_keys, name)
+        for word in set(name.split()):
+            postings = self.words.get(word)
+            if postings is None:
+                postings = self.words[word] = array("i")
+                self._add_word(word)
+            postings.append(i)
+
+    def _add_word(self, word):
+        i = len(self.vocabulary)
+        self.vocabulary.append(word)
+        insort(self.added_words, word)
+        for gram in trigrams(word):
+            postings = self.grams.get(gram)
+            if postings is None:
+                postings = self.grams[gram] = array("i")
+            postings.append(i)
+
+    def search(self, query, limit=10):
+        """
+        Returns up to limit (name, score) pairs for names matching
+        query exactly, by prefix or approximately, best first.
+        Scores run from 0 to 1, with 1 for an exact match.
+        """
+        query = normalize(query)
+        if not query:
+            return []
+        scores = {}
+
+        # Names that start with the query
+        for key in _starting_with(self.keys, self.sorted_keys, self.added_keys,
+                                  query, limit * 5):
+            scores[key] = 1.0 if key == query else 0.5 + 0.49 * len(query) / len(key)
+
+        # Names with a matching word for every query word that has any
+        tokens = query.split()
+        matches = [
+            self.similar_words(token, prefix=(i == len(tokens) - 1))
+            for i, token in enumerate(tokens)
+        ]
+        matches = [words for words in matches if words]
+        matches.sort(key=lambda words: sum(len(self.words[word]) for word in words))
+        candidates = []
+        for word in (matches[0] if matches else ()):
+            candidates.extend(self.words[word])
+
+            # With no other word to filter by, the best words' names suffice
+            if len(matches) == 1 and len(candidates) >= CANDIDATES:
+                break
+        keys = self.keys
+        for words in matches[1:]:
+            # Intersect with the other word's names when that is cheaper
+            # than splitting every candidate
+            if sum(len(self.words[word]) for word in words) < 2 * len(candidates):
+                allowed = set()
+                for word in words:
+                    allowed.update(self.words[word])
+                candidates = [i for i in candidates if i in allowed]
+            else:
+                candidates = [
+                    i for i in candidates
+                    if any(part in words for part in keys[i].split())
+                ]
+
+        grams = trigrams(query)
+        for i in candidates[:CANDIDATES]:
+            key = keys[i]
+            if key not in scores:
+                scores[key] = 0.98 * similarity(grams, trigrams(key))
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def similar_words(self, token, prefix=False):
+        """
+        Returns the indexed words equal to token, or, with prefix,
+        starting with it, then those sharing most of its trigrams, as
+        the keys of a dict in that order.
+        """
+        words = {}
+        if token in self.words:
+            words[token] = None
+        if prefix:
+            words.update(dict.fromkeys(_starting_with(
+                self.vocabulary, self.sorted_words, self.added_words, token, WORD_MATCHES
+            )))
+            if len(words) >= WORD_MATCHES:
+                return words
+
+        # Count shared trigrams, scanning the rarest postings first
+        grams = trigrams(token)
+        lists = sorted(
+            (self.grams[gram] for gram in grams if gram in self.grams), key=len
+        )
+        counts = Counter()
+        scanned = 0
+        for postings in lists:
+            if counts and scanned + len(postings) > SCAN_BUDGET:
+                break
+            counts.update(postings)
+            scanned += len(postings)
+        for i, _ in counts.most_common(WORD_MATCHES * 4):
+            word = self.vocabulary[i]
+            if word not in words and similarity(grams, trigrams(word)) >= WORD_SIMILARITY:
+                words[word] = None
+                if len(words) >= WORD_MATCHES * 2:
+                    break
+        return words
+
+
+def _starting_with(items, count, added, prefix, limit):
+    """
+    Returns up to limit strings starting with prefix from the sorted
+    items[:count], then up to limit more from the sorted list added.
+    """
+    matches = []
+    for sorted_items, end in ((items, count), (added, len(added))):
+        start = bisect_left(sorted_items, prefix, 0, end)
+        for item in sorted_items[start:min(start + limit, end)]:
+            if not item.startswith(prefix):
+                break
+            matches.append(item)
+    return matches
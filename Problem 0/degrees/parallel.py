@@ -0,0 +1,173 @@
+"""
+Multi-source degrees computation across processes.
+
+Each worker runs Graph.single_source for a share of the sources and
+sends back only a small distance histogram. The read-only graph is not
+pickled: where the platform can fork, workers inherit it copy-on-write;
+otherwise the CSR arrays are copied once into shared memory and every
+worker maps them.
+
+Usage: python parallel.py [directory] [--hub NAME] [--sample N] [--workers N]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+from collections import Counter
+from multiprocessing import shared_memory
+
+from graph import Graph
+
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_stars")
+
+# Graph used by the current worker process, and the shared memory
+# block behind it when the graph was not inherited through fork
+_graph = None
+_shared = None
+
+
+def histogram(graph, source):
+    """
+    Returns (source, counts, unreachable) for one source person index,
+    where counts[d] is the number of people exactly d degrees away.
+    """
+    distance, _, _ = graph.single_source(source)
+    tally = Counter(distance)
+    unreachable = tally.pop(-1, 0)
+    counts = [tally[d] for d in range(max(tally) + 1)]
+    return source, counts, unreachable
+
+
+def distance_histograms(graph, sources, workers=None, method=None):
+    """
+    Returns histogram(graph, source) for every source person index,
+    in order, computed by a pool of `workers` processes.
+    `method` forces "fork" or "shared" graph sharing.
+    """
+    global _graph
+    workers = workers or os.cpu_count() or 1
+    if method is None:
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "shared"
+    chunksize = max(1, len(sources) // (workers * 4))
+
+    if method == "fork":
+        _graph = graph
+        try:
+            with multiprocessing.get_context("fork").Pool(workers) as pool:
+                return pool.map(_worker_histogram, sources, chunksize)
+        finally:
+            _graph = None
+
+    # Only the CSR arrays are shared, so fold in any added edges
+    graph = graph.compact()
+    shared, layout = _share(graph)
+    try:
+        initargs = (shared.name, layout, len(graph.person_ids), len(graph.movie_ids))
+        with multiprocessing.get_context("spawn").Pool(
+            workers, initializer=_attach, initargs=initargs
+        ) as pool:
+            return pool.map(_worker_histogram, sources, chunksize)
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def summarize(results):
+    """
+    Combines histograms into all-pairs statistics over the sources.
+    """
+    counts = []
+    unreachable = 0
+    for _, source_counts, source_unreachable in results:
+        unreachable += source_unreachable
+        for d, count in enumerate(source_counts):
+            if d == len(counts):
+                counts.append(0)
+            counts[d] += count
+
+    # Leave out each source's distance to itself
+    pairs = sum(counts[1:])
+    total = sum(d * count for d, count in enumerate(counts))
+    return {
+        "sources": len(results),
+        "reachable pairs": pairs,
+        "unreachable pairs": unreachable,
+        "mean degrees": total / pairs if pairs else None,
+        "max degrees": len(counts) - 1 if pairs else None,
+        "histogram": counts,
+    }
+
+
+def _worker_histogram(source):
+    return histogram(_graph, source)
+
+
+def _share(graph):
+    """
+    Copy the CSR arrays of graph into one shared memory block.
+    Returns the block and {name: (offset, length)} for each array.
+    """
+    layout = {}
+    size = 0
+    for name in ARRAYS:
+        length = len(getattr(graph, name))
+        layout[name] = (size, length)
+        size += 4 * length
+    shared = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    for name in ARRAYS:
+        offset, length = layout[name]
+        target = shared.buf[offset:offset + 4 * length]
+        target[:] = memoryview(getattr(graph, name)).cast("B")
+        target.release()
+    return shared, layout
+
+
+def _attach(name, layout, person_count, movie_count):
+    """
+    Pool initializer: map the shared CSR arrays into a worker Graph.
+    """
+    global _graph, _shared
+    _shared = shared_memory.SharedMemory(name=name)
+    arrays = {
+        array_name: _shared.buf[offset:offset + 4 * length].cast("i")
+        for array_name, (offset, length) in layout.items()
+    }
+    _graph = Graph(range(person_count), range(movie_count), **arrays)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Degrees from many sources.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--hub", default="Kevin Bacon",
+                        help="report everyone's degrees from this person")
+    parser.add_argument("--sample", type=int, default=100,
+                        help="random sources for all-pairs statistics")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import degrees
+    degrees.load_data(args.directory)
+    graph = degrees.graph
+
+    hub, error = degrees.resolve_person(args.hub)
+    if error is not None:
+        sys.exit(error)
+    _, counts, unreachable = histogram(graph, graph.person_index[hub])
+    print(f"Degrees from {degrees.people[hub]['name']}:")
+    for d, count in enumerate(counts):
+        print(f"  {d}: {count}")
+    print(f"  not connected: {unreachable}")
+
+    rng = random.Random(args.seed)
+    sources = rng.sample(range(len(graph)), min(args.sample, len(graph)))
+    stats = summarize(distance_histograms(graph, sources, args.workers))
+    print(f"All-pairs statistics over {stats['sources']} sources:")
+    for key, value in stats.items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
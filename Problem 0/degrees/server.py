@@ -0,0 +1,186 @@
+"""
+HTTP front end for degrees.
+
+Answers GET /path?source=NAME&target=NAME with the JSON produced by
+degrees.connection, GET /people?q=NAME[&limit=N] with ranked name
+matches, and GET /stats with the cache counters, from data loaded once
+at startup. POST /update applies new rows without a restart; its body
+is a JSON object whose optional "people", "movies" and "stars" lists
+hold rows in the order of the CSV columns; the whole body is checked
+before any row is applied. Each request runs on its own thread.
+
+The query functions are passed in rather than imported, since degrees
+usually runs as __main__ and a fresh `import degrees` would be empty.
+
+Usage: python degrees.py [directory] --serve PORT
+"""
+
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Columns of the rows in each list of an /update body
+COLUMNS = {"people": 3, "movies": 3, "stars": 2}
+
+
+def parse_update(body):
+    """
+    Returns the rows of an /update body as a dict of lists of string
+    tuples, or raises ValueError if any part of it is malformed.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("expected a JSON object")
+    unknown = set(body) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown keys: {', '.join(sorted(unknown))}")
+    rows = {}
+    for key, columns in COLUMNS.items():
+        values = body.get(key, [])
+        if not isinstance(values, list):
+            raise ValueError(f"{key} must be a list")
+        for row in values:
+            if (not isinstance(row, list) or len(row) != columns
+                    or not all(isinstance(value, str) for value in row)):
+                raise ValueError(f"{key} rows must be lists of {columns} strings")
+        rows[key] = [tuple(row) for row in values]
+    return rows
+
+
+class ReadWriteLock():
+    """
+    Lets any number of readers in at once, or one writer alone.
+    Waiting writers keep new readers out, so updates are not starved.
+    """
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.readers = 0
+        self.writing = False
+        self.waiting = 0
+
+    def acquire_read(self):
+        with self.condition:
+            while self.writing or self.waiting:
+                self.condition.wait()
+            self.readers += 1
+
+    def release_read(self):
+        with self.condition:
+            self.readers -= 1
+            if not self.readers:
+                self.condition.notify_all()
+
+    def acquire_write(self):
+        with self.condition:
+            self.waiting += 1
+            while self.writing or self.readers:
+                self.condition.wait()
+            self.waiting -= 1
+            self.writing = True
+
+    def release_write(self):
+        with self.condition:
+            self.writing = False
+            self.condition.notify_all()
+
+    @contextmanager
+    def read(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    # Keep connections open so clients can send many queries
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    # Set by make_server: answer(source, target) -> JSON-ready dict,
+    # stats() -> JSON-ready dict, search(query, limit) -> JSON-ready list,
+    # update(rows) -> JSON-ready dict, given the rows from parse_update
+    answer = None
+    stats = None
+    search = None
+    update = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == "/stats" and self.stats is not None:
+            return self.reply(200, self.stats())
+        if url.path == "/people" and self.search is not None:
+            if "q" not in query:
+                return self.reply(400, {"error": "q is required"})
+            try:
+                limit = int(query.get("limit", ["10"])[0])
+            except ValueError:
+                return self.reply(400, {"error": "limit must be an integer"})
+            if limit < 1:
+                return self.reply(400, {"error": "limit must be at least 1"})
+            return self.reply(200, self.search(query["q"][0], limit))
+        if url.path != "/path":
+            return self.reply(404, {"error": "not found"})
+        if "source" not in query or "target" not in query:
+            return self.reply(400, {"error": "source and target are required"})
+        result = self.answer(query["source"][0], query["target"][0])
+        self.reply(400 if "error" in result else 200, result)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/update" or self.update is None:
+            return self.reply(404, {"error": "not found"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            rows = parse_update(json.loads(self.rfile.read(length)))
+        except ValueError as e:
+            return self.reply(400, {"error": f"expected a JSON object of row lists: {e}"})
+        return self.reply(200, self.update(rows))
+
+    def reply(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host, port, answer, stats=None, search=None, update=None):
+    """
+    Returns an HTTP server that answers queries with `answer`.
+    """
+    handler = type("Handler", (Handler,), {
+        "answer": staticmethod(answer),
+        "stats": staticmethod(stats) if stats is not None else None,
+        "search": staticmethod(search) if search is not None else None,
+        "update": staticmethod(update) if update is not None else None,
+    })
+    httpd = ThreadingHTTPServer((host, port), handler)
+    httpd.daemon_threads = True
+    return httpd
+
+
+def serve(host, port, answer, stats=None, search=None, update=None):
+    httpd = make_server(host, port, answer, stats, search, update)
+    print(f"Serving on http://{host}:{httpd.server_port}/path?source=...&target=...")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
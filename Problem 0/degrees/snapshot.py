@@ -0,0 +1,174 @@
+"""
+Binary snapshot of parsed degrees data.
+
+A snapshot file holds everything load_data builds from the CSV files.
+Its layout is
+
+    MAGIC | header length (uint32, little-endian) | JSON header | sections
+
+where the header records the size and mtime of every CSV file the
+snapshot was built from, and the byte range of each section. The four
+CSR arrays are stored as raw native int32 and are used in place through
+a read-only memory map; the string tables are NUL-joined UTF-8.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+from graph import Graph
+
+# Bump the last byte whenever the layout changes
+MAGIC = b"DEGREES\x01"
+
+FILENAME = ".degrees-cache"
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+
+ARRAYS = ("person_offsets", "person_movies", "movie_offsets", "movie_stars")
+STRINGS = ("person_ids", "person_names", "person_births",
+           "movie_ids", "movie_titles", "movie_years")
+
+
+def snapshot_path(directory):
+    return os.path.join(directory, FILENAME)
+
+
+def source_stats(directory):
+    """
+    Returns [filename, size, mtime_ns] for each CSV file in directory.
+    """
+    stats = []
+    for filename in SOURCES:
+        stat = os.stat(os.path.join(directory, filename))
+        stats.append([filename, stat.st_size, stat.st_mtime_ns])
+    return stats
+
+
+def write(path, stats, people, movies, graph):
+    """
+    Write a snapshot of `people`, `movies` and `graph` built from
+    CSV files with the given source_stats.
+    """
+    graph = graph.compact()
+    person_ids, movie_ids = graph.person_ids, graph.movie_ids
+    tables = {
+        "person_ids": person_ids,
+        "person_names": [people[person_id]["name"] for person_id in person_ids],
+        "person_births": [people[person_id]["birth"] for person_id in person_ids],
+        "movie_ids": movie_ids,
+        "movie_titles": [movies[movie_id]["title"] for movie_id in movie_ids],
+        "movie_years": [movies[movie_id]["year"] for movie_id in movie_ids],
+    }
+    blobs = [(name, bytes(getattr(graph, name))) for name in ARRAYS]
+    blobs += [(name, "\0".join(tables[name]).encode("utf-8")) for name in STRINGS]
+
+    # Section offsets are relative to the end of the header, which is
+    # padded so that the int32 arrays stay aligned
+    sections = {}
+    position = 0
+    for name, blob in blobs:
+        sections[name] = [position, len(blob)]
+        position += len(blob)
+        position += -position % 8
+    header = {
+        "byteorder": sys.byteorder,
+        "sources": stats,
+        "people": len(person_ids),
+        "movies": len(movie_ids),
+        "sections": sections,
+    }
+    encoded = json.dumps(header).encode("utf-8")
+    encoded += b" " * (-(len(MAGIC) + 4 + len(encoded)) % 8)
+
+    # Write to a temporary file first so readers never see half a snapshot
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(encoded)))
+        f.write(encoded)
+        for name, blob in blobs:
+            f.write(blob)
+            f.write(b"\0" * (-len(blob) % 8))
+    os.replace(temporary, path)
+
+
+def read(path, stats):
+    """
+    Memory-map a snapshot and return (people, movies, graph),
+    or None if it is missing, unreadable, or does not match `stats`.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    # Release the map of a snapshot that is not used, so its file closes
+    loaded = _load(data, stats)
+    if loaded is None:
+        data.close()
+    return loaded
+
+
+def _load(data, stats):
+    """
+    Returns (people, movies, graph) from the mapped snapshot data,
+    or None if it does not match `stats` or is corrupt.
+    """
+    start = len(MAGIC) + 4
+    if len(data) < start or data[:len(MAGIC)] != MAGIC:
+        return None
+    length, = struct.unpack_from("<I", data, len(MAGIC))
+
+    # A corrupt or truncated file is as good as a stale one
+    try:
+        header = json.loads(data[start:start + length])
+        if header["byteorder"] != sys.byteorder or header["sources"] != stats:
+            return None
+        tables, arrays = _sections(data, start + length, header)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+    people = {
+        person_id: {"name": name, "birth": birth}
+        for person_id, name, birth in zip(
+            tables["person_ids"], tables["person_names"], tables["person_births"]
+        )
+    }
+    movies = {
+        movie_id: {"title": title, "year": year}
+        for movie_id, title, year in zip(
+            tables["movie_ids"], tables["movie_titles"], tables["movie_years"]
+        )
+    }
+    graph = Graph(tables["person_ids"], tables["movie_ids"], **arrays)
+    return people, movies, graph
+
+
+def _sections(data, base, header):
+    """
+    Returns the string tables and int32 arrays of a snapshot whose
+    sections start at base, raising ValueError if any is cut short.
+    """
+    view = memoryview(data)
+
+    def section(name):
+        offset, size = header["sections"][name]
+        if offset < 0 or size < 0 or base + offset + size > len(data):
+            raise ValueError(f"section {name} is truncated")
+        return view[base + offset:base + offset + size]
+
+    def strings(name, count):
+        if count == 0:
+            return []
+        table = bytes(section(name)).decode("utf-8").split("\0")
+        if len(table) != count:
+            raise ValueError(f"section {name} has {len(table)} strings, not {count}")
+        return table
+
+    count = {"person": header["people"], "movie": header["movies"]}
+    tables = {name: strings(name, count[name.split("_")[0]]) for name in STRINGS}
+    arrays = {name: section(name).cast("i") for name in ARRAYS}
+    return tables, arrays
@@ -1,5 +1,31 @@
+import copy
+import heapq
+import io
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
 import unittest
+from unittest import mock
+from array import array
+from itertools import islice
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import degrees
+import loader
+from analytics import Analytics, log_buckets
+import parallel
+from lru import LRUCache
+from name_index import NameIndex, trigrams
+import server
+import snapshot
+from graph import Graph
 from degrees import shortest_path, neighbors_for_person, people, movies, names
+from degrees import bidirectional_shortest_path, connection, run_batch, single_source
+from util import Node, DequeQueueFrontier, DequeStackFrontier
 
 # Тестовая мини-база, похожая на ту, что мы делали вручную
 names.clear()
@@ -60,6 +86,552 @@ class TestDegrees(unittest.TestCase):
         path = shortest_path("1", "4")
         self.assertIsNone(path)
 
+    def test_named_algorithms(self):
+        """Тест: поиск общим движком с выбором алгоритма по имени"""
+        for algorithm in ("bfs", "astar"):
+            self.assertEqual(shortest_path("1", "2", algorithm=algorithm),
+                             [("10", "3"), ("12", "2")])
+        self.assertEqual(shortest_path("2", "1", algorithm="dfs")[-1][1], "1")
+        self.assertIsNone(shortest_path("1", "4", algorithm="greedy"))
+
+
+class TestBidirectional(unittest.TestCase):
+
+    def test_same_as_bfs(self):
+        """Тест: двунаправленный поиск находит пути той же длины"""
+        for source in people:
+            for target in people:
+                expected = shortest_path(source, target)
+                path = bidirectional_shortest_path(source, target)
+                if expected is None:
+                    self.assertIsNone(path)
+                else:
+                    self.assertEqual(len(path), len(expected))
+
+    def test_path_format(self):
+        """Тест: путь состоит из пар (movie_id, person_id) от источника"""
+        path = shortest_path("2", "1", bidirectional=True)
+        self.assertEqual(path, [("12", "3"), ("10", "1")])
+        self.assertEqual(shortest_path("1", "1", bidirectional=True), [])
+
+
+class TestGraph(unittest.TestCase):
+
+    def setUp(self):
+        degrees.build_graph()
+
+    def tearDown(self):
+        degrees.graph = None
+        degrees.clear_caches()
+
+    def test_neighbors_match_sets(self):
+        """Тест: соседи из графа совпадают с соседями из множеств"""
+        for person_id in people:
+            from_graph = neighbors_for_person(person_id)
+            degrees.graph = None
+            degrees.clear_caches()
+            self.assertEqual(from_graph, neighbors_for_person(person_id))
+            degrees.build_graph()
+
+    def test_paths(self):
+        """Тест: поиск по графу даёт те же пути"""
+        self.assertEqual(shortest_path("1", "2"), [("10", "3"), ("12", "2")])
+        self.assertIsNone(shortest_path("1", "4"))
+        self.assertEqual(shortest_path("1", "1"), [])
+        self.assertEqual(len(shortest_path("2", "1", bidirectional=True)), 2)
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, snapshot.FILENAME)
+        self.stats = [["stars.csv", 100, 1]]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """Тест: снимок восстанавливает людей, фильмы и граф"""
+        graph = Graph.from_data(people, movies)
+        snapshot.write(self.path, self.stats, people, movies, graph)
+        cached_people, cached_movies, cached_graph = snapshot.read(self.path, self.stats)
+        self.assertEqual(cached_people["2"], {"name": "Kevin Bacon", "birth": "1958"})
+        self.assertEqual(cached_movies["13"]["title"], "Harry Potter")
+        self.assertEqual(cached_graph.person_ids, graph.person_ids)
+        self.assertEqual(list(cached_graph.movie_stars), list(graph.movie_stars))
+        source, target = graph.person_index["1"], graph.person_index["2"]
+        self.assertEqual(
+            cached_graph.shortest_path(source, target),
+            graph.shortest_path(source, target)
+        )
+
+    def test_stale_snapshot(self):
+        """Тест: снимок не используется, если CSV изменились"""
+        snapshot.write(self.path, self.stats, people, movies, Graph.from_data(people, movies))
+        self.assertIsNone(snapshot.read(self.path, [["stars.csv", 101, 1]]))
+        self.assertIsNone(snapshot.read(self.path + ".missing", self.stats))
+
+    def test_corrupt_snapshot(self):
+        """Тест: повреждённый или обрезанный снимок считается устаревшим"""
+        snapshot.write(self.path, self.stats, people, movies, Graph.from_data(people, movies))
+        with open(self.path, "rb") as f:
+            data = f.read()
+        header = json.dumps({"byteorder": sys.byteorder, "sources": self.stats}).encode()
+        corrupt = [
+            data[:len(data) // 2],
+            snapshot.MAGIC + struct.pack("<I", len(header)) + header,
+            snapshot.MAGIC + struct.pack("<I", 2) + b"[]",
+        ]
+        maps = []
+
+        def mapped(*args, **kwargs):
+            maps.append(real(*args, **kwargs))
+            return maps[-1]
+
+        real = mmap.mmap
+        for broken in corrupt:
+            with open(self.path, "wb") as f:
+                f.write(broken)
+            with mock.patch("mmap.mmap", side_effect=mapped):
+                self.assertIsNone(snapshot.read(self.path, self.stats))
+        # Неиспользованные отображения закрываются вместе с файлом
+        self.assertEqual(len(maps), len(corrupt))
+        self.assertTrue(all(m.closed for m in maps))
+
+
+class TestSingleSource(unittest.TestCase):
+
+    def test_single_source(self):
+        """Тест: расстояния и предшественники от одного актёра"""
+        reachable = single_source("1")
+        self.assertEqual(reachable["1"], (0, None, None))
+        self.assertEqual(reachable["3"], (1, "10", "1"))
+        self.assertEqual(reachable["2"], (2, "12", "3"))
+        self.assertNotIn("4", reachable)
+
+    def test_histograms(self):
+        """Тест: гистограмма расстояний и сводная статистика"""
+        graph = Graph.from_data(people, movies)
+        results = [parallel.histogram(graph, graph.person_index[p]) for p in ("1", "4")]
+        self.assertEqual(results[0][1:], ([1, 1, 1], 1))
+        stats = parallel.summarize(results)
+        self.assertEqual(stats["reachable pairs"], 2)
+        self.assertEqual(stats["unreachable pairs"], 4)
+        self.assertEqual(stats["mean degrees"], 1.5)
+
+
+class TestCaches(unittest.TestCase):
+
+    def setUp(self):
+        degrees.clear_caches()
+
+    def test_lru_counters(self):
+        """Тест: LRU-кэш вытесняет самый старый элемент и считает попадания"""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 1))
+
+    def test_path_cache_is_unordered(self):
+        """Тест: путь в обратную сторону берётся из кэша и разворачивается"""
+        forward = shortest_path("1", "2")
+        hits = degrees.path_cache.hits
+        backward = shortest_path("2", "1")
+        self.assertEqual(degrees.path_cache.hits, hits + 1)
+        self.assertEqual(backward, [("12", "3"), ("10", "1")])
+        self.assertEqual(shortest_path("1", "2"), forward)
+        self.assertIsNone(shortest_path("4", "1"))
+        self.assertIsNone(shortest_path("1", "4"))
+
+    def test_disabled_cache(self):
+        """Тест: размер 0 отключает кэш"""
+        degrees.configure_caches(neighbors=0, paths=0)
+        try:
+            shortest_path("1", "2")
+            shortest_path("1", "2")
+            self.assertEqual(len(degrees.path_cache), 0)
+        finally:
+            degrees.configure_caches(degrees.NEIGHBOR_CACHE_SIZE, degrees.PATH_CACHE_SIZE)
+
+
+class TestLoader(unittest.TestCase):
+
+    def test_chunks(self):
+        """Тест: CSV читается кусками по нужным столбцам"""
+        path = os.path.join(os.path.dirname(__file__), "small", "stars.csv")
+        chunks = list(loader.read_chunks(path, ("movie_id", "person_id"), chunk_size=7))
+        self.assertTrue(all(len(chunk) <= 7 for chunk in chunks))
+        self.assertEqual(chunks[0][0], ("104257", "102"))
+
+    def test_load(self):
+        """Тест: потоковая загрузка строит тот же граф"""
+        directory = os.path.join(os.path.dirname(__file__), "small")
+        loaded_people, loaded_movies, loaded_names = {}, {}, {}
+        graph, stats = loader.load(
+            directory, loaded_people, loaded_movies,
+            lambda name, person_id: loaded_names.setdefault(name.lower(), set()).add(person_id),
+            chunk_size=4
+        )
+        self.assertEqual(stats["people.csv"][0], len(loaded_people))
+        self.assertEqual(loaded_names["kevin bacon"], {"102"})
+        self.assertEqual(loaded_people["102"], {"name": "Kevin Bacon", "birth": "1958"})
+        path, _ = graph.shortest_path(graph.person_index["102"], graph.person_index["158"])
+        self.assertEqual(len(path), 1)
+        self.assertEqual(graph.movie_ids[path[0][0]], "112384")
+
+
+class TestAnalytics(unittest.TestCase):
+
+    def setUp(self):
+        self.stats = Analytics(Graph.from_data(people, movies))
+        self.index = self.stats.graph.person_index
+
+    def tearDown(self):
+        degrees.graph = None
+        degrees.analytics = None
+        degrees.clear_caches()
+
+    def test_components(self):
+        """Тест: компоненты связности"""
+        self.assertEqual(self.stats.components, 2)
+        self.assertEqual(self.stats.component_sizes(), [3, 1])
+        self.assertTrue(self.stats.connected(self.index["1"], self.index["2"]))
+        self.assertFalse(self.stats.connected(self.index["1"], self.index["4"]))
+
+    def test_degrees(self):
+        """Тест: распределение степеней и хабы"""
+        self.assertEqual(self.stats.degree_distribution("movies"), {1: 2, 2: 2})
+        person, fanout = self.stats.top_hubs(1)[0]
+        self.assertEqual(self.stats.graph.person_ids[person], "3")
+        self.assertEqual(fanout, 4)
+        self.assertEqual(log_buckets({0: 1, 3: 2, 5: 1}), [(0, 0, 1), (2, 3, 2), (4, 7, 1)])
+
+    def test_unreachable_without_search(self):
+        """Тест: несвязанные актёры отсекаются без поиска"""
+        degrees.analyze()
+        self.assertFalse(degrees.connected("1", "4"))
+        self.assertIsNone(shortest_path("1", "4"))
+        self.assertEqual(degrees.num_explored, 0)
+        self.assertEqual(len(shortest_path("1", "2")), 2)
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_connection(self):
+        """Тест: запрос по именам без input()"""
+        result = connection("Tom Hanks", "kevin bacon")
+        self.assertEqual(result["degrees"], 2)
+        self.assertEqual(result["path"][1], {
+            "person1": "Gary Sinise", "person2": "Kevin Bacon", "movie": "Trapped"
+        })
+        self.assertIsNone(connection("1", "4")["degrees"])
+        self.assertIn("error", connection("Nobody", "Tom Hanks"))
+
+    def test_run_batch(self):
+        """Тест: пакетный режим выдаёт по строке JSON на запрос"""
+        out = io.StringIO()
+        run_batch(io.StringIO("Tom Hanks\tGary Sinise\n\nbroken\n"), out)
+        results = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["degrees"], 1)
+        self.assertIn("error", results[1])
+
+    def test_server(self):
+        """Тест: HTTP-сервер отвечает на запрос пути"""
+        httpd = server.make_server("127.0.0.1", 0, connection)
+        thread = threading.Thread(target=httpd.serve_forever)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{httpd.server_port}/path?source=1&target=2"
+            with urlopen(url) as response:
+                self.assertEqual(json.loads(response.read())["degrees"], 2)
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join()
+
+    def test_people_limit(self):
+        """Тест: limit меньше единицы и не число отклоняются"""
+        httpd = server.make_server("127.0.0.1", 0, connection,
+                                   search=lambda query, limit: [query] * limit)
+        thread = threading.Thread(target=httpd.serve_forever)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{httpd.server_port}/people?q=Tom"
+            with urlopen(url + "&limit=2") as response:
+                self.assertEqual(json.loads(response.read()), ["Tom", "Tom"])
+            for limit in ("0", "-1", "x"):
+                with self.assertRaises(HTTPError) as raised:
+                    urlopen(f"{url}&limit={limit}")
+                self.assertEqual(raised.exception.code, 400)
+                raised.exception.close()
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join()
+
+
+class TestDequeFrontier(unittest.TestCase):
+
+    def test_queue_order(self):
+        """Тест: очередь отдаёт узлы в порядке FIFO"""
+        frontier = DequeQueueFrontier()
+        for state in "abc":
+            frontier.add(Node(state=state, parent=None, action=None))
+        self.assertEqual([frontier.remove().state for _ in range(3)], list("abc"))
+        self.assertTrue(frontier.empty())
+
+    def test_stack_order(self):
+        """Тест: стек отдаёт узлы в порядке LIFO"""
+        frontier = DequeStackFrontier()
+        for state in "abc":
+            frontier.add(Node(state=state, parent=None, action=None))
+        self.assertEqual([frontier.remove().state for _ in range(3)], list("cba"))
+
+    def test_contains_state(self):
+        """Тест: состояние пропадает из фронтира после удаления"""
+        frontier = DequeQueueFrontier()
+        frontier.add(Node(state="a", parent=None, action=None))
+        self.assertTrue(frontier.contains_state("a"))
+        frontier.remove()
+        self.assertFalse(frontier.contains_state("a"))
+        with self.assertRaises(Exception):
+            frontier.remove()
+
+
+class TestNames(unittest.TestCase):
+
+    def tearDown(self):
+        degrees.name_index = None
+
+    def test_trigrams(self):
+        """Тест: триграммы с отступами по краям"""
+        self.assertEqual(trigrams("ab"), {"  a", " ab", "ab "})
+
+    def test_fuzzy_search(self):
+        """Тест: опечатка и префикс находят нужное имя"""
+        index = NameIndex(names)
+        self.assertEqual(index.search("kevn bacon")[0][0], "kevin bacon")
+        self.assertEqual(index.search("Tom Hnaks")[0][0], "tom hanks")
+        self.assertEqual(index.search("emma")[0][0], "emma watson")
+        self.assertEqual(index.search("gary sinise")[0], ("gary sinise", 1.0))
+
+    def test_birth_year(self):
+        """Тест: тёзок различаем по году рождения"""
+        people["5"] = {"name": "Tom Hanks", "birth": "1900"}
+        names["tom hanks"].add("5")
+        try:
+            person_id, error = degrees.resolve_person("Tom Hanks")
+            self.assertIsNone(person_id)
+            self.assertIn("Ambiguous", error)
+            self.assertEqual(degrees.resolve_person("tom hanks (1956)"), ("1", None))
+            self.assertEqual(degrees.resolve_person("Tom Hanks", 1900), ("5", None))
+        finally:
+            names["tom hanks"].discard("5")
+            del people["5"]
+
+    def test_suggestions(self):
+        """Тест: для ненайденного имени предлагаем похожие"""
+        person_id, error = degrees.resolve_person("Kevin Bakon")
+        self.assertIsNone(person_id)
+        self.assertIn("Did you mean: Kevin Bacon (1958), ID 2", error)
+
+
+class TestUpdate(unittest.TestCase):
+
+    # Даниэль Рэдклифф связывает Эмму Уотсон с остальными через новый фильм
+    PEOPLE = [("5", "Daniel Radcliffe", "1989")]
+    MOVIES = [("14", "December Boys", "2007")]
+    STARS = [("5", "13"), ("5", "14"), ("2", "14"), ("5", "99")]
+
+    def setUp(self):
+        self.saved = copy.deepcopy((names, people, movies))
+
+    def tearDown(self):
+        for current, saved in zip((names, people, movies), self.saved):
+            current.clear()
+            current.update(saved)
+        degrees.graph = None
+        degrees.analytics = None
+        degrees.name_index = None
+        degrees.clear_caches()
+
+    def test_graph_update(self):
+        """Тест: новые строки попадают в граф, компоненты и индекс имён"""
+        degrees.analyze()
+        degrees.index_names()
+        self.assertIsNone(shortest_path("1", "4"))
+        self.assertEqual(degrees.analytics.components, 2)
+        added = degrees.update(self.PEOPLE, self.MOVIES, self.STARS)
+        self.assertEqual(added, {"people": 1, "movies": 1, "stars": 3})
+        self.assertEqual(degrees.analytics.components, 1)
+        self.assertEqual(len(shortest_path("1", "4")), 4)
+        self.assertIn(("13", "5"), neighbors_for_person("4"))
+        self.assertEqual(degrees.find_people("daniel radclife")[0]["person_id"], "5")
+
+        # Повторное применение ничего не меняет, а слияние даёт тот же граф
+        self.assertEqual(degrees.update([], [], self.STARS)["stars"], 0)
+        graph = degrees.graph
+        self.assertEqual(graph.single_source(0)[0], graph.compact().single_source(0)[0])
+
+    def test_selective_invalidation(self):
+        """Тест: кэш путей сбрасывается только в изменённых компонентах"""
+        degrees.analyze()
+        for source, target in (("1", "3"), ("1", "4"), ("4", "4")):
+            shortest_path(source, target)
+        degrees.update(self.PEOPLE, [], [("5", "13")])
+        self.assertIn(("1", "3"), degrees.path_cache.data)
+        # 1 и 4 по-прежнему не связаны, ведь компонента 1 не менялась
+        self.assertIn(("1", "4"), degrees.path_cache.data)
+        self.assertNotIn(("4", "4"), degrees.path_cache.data)
+        self.assertEqual(degrees.analytics.component_sizes(), [3, 2])
+
+    def test_sets_update(self):
+        """Тест: без графа обновляются множества фильмов и актёров"""
+        added = degrees.update(self.PEOPLE, self.MOVIES, self.STARS)
+        self.assertEqual(added["stars"], 3)
+        self.assertEqual(people["5"]["movies"], {"13", "14"})
+        self.assertEqual(len(shortest_path("4", "1")), 4)
+
+    def test_apply_delta(self):
+        """Тест: изменения читаются из CSV-файлов"""
+        degrees.build_graph()
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "stars.csv"), "w") as f:
+                f.write("person_id,movie_id\n4,12\n")
+            self.assertEqual(degrees.apply_delta(directory)["stars"], 1)
+        self.assertEqual(len(shortest_path("4", "2")), 1)
+
+    def test_parse_update(self):
+        """Тест: изменения проверяются целиком до применения"""
+        rows = server.parse_update({"stars": [["4", "12"]]})
+        self.assertEqual(rows, {"people": [], "movies": [], "stars": [("4", "12")]})
+        for body in ([], {"actors": []}, {"stars": "4,12"},
+                     {"stars": [["4", "12"], ["4"]]}, {"people": [["5", "Daniel", 1989]]}):
+            with self.assertRaises(ValueError):
+                server.parse_update(body)
+
+    def test_server_update(self):
+        """Тест: испорченное обновление отклоняется, не меняя данных"""
+        applied = []
+        httpd = server.make_server("127.0.0.1", 0, connection, update=applied.append)
+        thread = threading.Thread(target=httpd.serve_forever)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{httpd.server_port}/update"
+            body = json.dumps({"stars": [["4", "12"], ["broken"]]}).encode()
+            with self.assertRaises(HTTPError) as raised:
+                urlopen(Request(url, body, method="POST"))
+            self.assertEqual(raised.exception.code, 400)
+            raised.exception.close()
+            self.assertEqual(applied, [])
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+            thread.join()
+
+    def test_read_write_lock(self):
+        """Тест: читатели работают вместе, писатель ждёт их всех"""
+        lock = server.ReadWriteLock()
+        events = []
+
+        def write():
+            with lock.write():
+                events.append("write")
+
+        with lock.read():
+            with lock.read():
+                writer = threading.Thread(target=write)
+                writer.start()
+                writer.join(0.1)
+                self.assertEqual(events, [])
+        writer.join(5)
+        self.assertEqual(events, ["write"])
+
+
+class TestAllPaths(unittest.TestCase):
+
+    def diamond(self):
+        # 0 и 3 связаны через 1 (фильмы 0, 2) и через 2 (фильмы 1, 3)
+        return Graph.from_edges(
+            list("abcd"), list("wxyz"),
+            array("i", [0, 1, 0, 2, 1, 3, 2, 3]), array("i", [0, 0, 1, 1, 2, 2, 3, 3])
+        )
+
+    def test_diamond(self):
+        """Тест: оба кратчайших пути, в порядке веса фильмов"""
+        dag = self.diamond().shortest_paths(0, 3)
+        self.assertEqual(dag.count(), 2)
+        self.assertEqual(sorted(dag), [[(0, 1), (2, 3)], [(1, 2), (3, 3)]])
+        weights = [1, 5, 1, 1]
+        self.assertEqual(list(dag.best(weights.__getitem__))[0], [(1, 2), (3, 3)])
+        self.assertEqual([path for path in self.diamond().shortest_paths(0, 0)], [[]])
+
+    def test_many_paths(self):
+        """Тест: число путей растёт экспоненциально, а DAG — нет"""
+        width, layers = 3, 12
+        edge_people, edge_movies = array("i"), array("i")
+        movie = 0
+        for layer in range(layers):
+            for a in range(width):
+                for b in range(width):
+                    edge_people.extend((layer * width + a, (layer + 1) * width + b))
+                    edge_movies.extend((movie, movie))
+                    movie += 1
+        count = (layers + 1) * width
+        graph = Graph.from_edges(list(range(count)), list(range(movie)), edge_people, edge_movies)
+        dag = graph.shortest_paths(0, count - 1)
+        self.assertEqual(dag.length, layers)
+        self.assertEqual(dag.count(), width ** (layers - 1))
+        self.assertLessEqual(len(dag.steps), count)
+        first = list(islice(dag, 100))
+        self.assertEqual(len(set(map(tuple, first))), 100)
+        self.assertTrue(all(len(path) == layers for path in first))
+        self.assertEqual(len(list(islice(dag.best(lambda movie: movie), 10))), 10)
+
+    def test_ranked_equal_weights(self):
+        """Тест: при равных весах первый путь находится сразу, без обхода слоями"""
+        width, layers = 6, 8
+        edge_people, edge_movies = array("i"), array("i")
+        movie = 0
+        for layer in range(layers):
+            for a in range(width):
+                for b in range(width):
+                    edge_people.extend((layer * width + a, (layer + 1) * width + b))
+                    edge_movies.extend((movie, movie))
+                    movie += 1
+        count = (layers + 1) * width
+        graph = Graph.from_edges(list(range(count)), list(range(movie)), edge_people, edge_movies)
+        dag = graph.shortest_paths(0, count - 1)
+        self.assertEqual(dag.count(), width ** (layers - 1))
+        pops = []
+        real = heapq.heappop
+
+        def heappop(heap):
+            pops.append(len(heap))
+            return real(heap)
+
+        with mock.patch("heapq.heappop", side_effect=heappop):
+            ranked = list(islice(dag.best(lambda movie: 1), 3))
+        self.assertEqual(ranked[0], next(iter(dag)))
+        self.assertEqual(len(set(map(tuple, ranked))), 3)
+        # Глубина на ширину, а не миллионы частичных путей
+        self.assertLess(len(pops), 3 * layers * width)
+        self.assertLess(max(pops), 2 * layers * width)
+
+    def test_connection_paths(self):
+        """Тест: запрос возвращает число и список кратчайших путей"""
+        result = connection("Tom Hanks", "Kevin Bacon", paths=5)
+        self.assertEqual(result["count"], 1)
+        self.assertEqual(result["paths"], [result["path"]])
+        self.assertEqual(list(degrees.all_shortest_paths("1", "4")), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,18 @@
-class Node():
-    def __init__(self, state, parent, action):
-        self.state = state
-        self.parent = parent
-        self.action = action
+"""
+Search helpers for degrees. Nodes, frontiers and solve() come from the
+search package shared with Maze, one directory up; the original
+list-backed StackFrontier and QueueFrontier stay here as the baseline
+for benchmark.py.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from search import ALGORITHMS, Node, solve
+from search import QueueFrontier as DequeQueueFrontier
+from search import StackFrontier as DequeStackFrontier
 
 
 class StackFrontier():
@@ -0,0 +1,12 @@
+"""
+Search shared by the Maze and degrees problems.
+
+solve() runs depth-first, breadth-first, greedy best-first or A*
+search over any state space given as a neighbors function. Frontiers
+find queued states through a dict instead of scanning, and the
+priority frontier lowers costs by lazy deletion, so every frontier
+operation is O(1) or O(log n).
+"""
+
+from .engine import ALGORITHMS, Solution, solve
+from .frontier import Node, PriorityFrontier, QueueFrontier, StackFrontier
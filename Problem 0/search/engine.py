@@ -0,0 +1,90 @@
+from .frontier import Node, PriorityFrontier, QueueFrontier, StackFrontier
+
+ALGORITHMS = ("dfs", "bfs", "greedy", "astar")
+
+
+class Solution():
+    """
+    Outcome of a search: the actions and states from the start to the
+    goal (None if no goal was reached), the cost of that path, and how
+    many and which states were explored.
+    """
+    __slots__ = ("actions", "states", "cost", "num_explored", "explored")
+
+    def __init__(self, node, num_explored, explored):
+        self.num_explored = num_explored
+        self.explored = explored
+        if node is None:
+            self.actions = self.states = self.cost = None
+            return
+        self.cost = node.cost
+        self.actions = []
+        self.states = []
+        while node.parent is not None:
+            self.actions.append(node.action)
+            self.states.append(node.state)
+            node = node.parent
+        self.actions.reverse()
+        self.states.reverse()
+
+    @property
+    def found(self):
+        return self.actions is not None
+
+
+def solve(start, goal, neighbors, algorithm="bfs", heuristic=None, step_cost=None):
+    """
+    Searches from state start for a state where goal(state) is true.
+
+    neighbors(state) returns (action, state) pairs. algorithm is one of
+    ALGORITHMS: "dfs" and "bfs" ignore costs, "greedy" always expands
+    the state with the lowest heuristic(state), and "astar" the one with
+    the lowest cost so far plus heuristic(state). Steps cost
+    step_cost(state, next_state), or 1 without it; a missing heuristic
+    counts as 0, which makes A* a uniform-cost search.
+
+    Returns a Solution.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}")
+    if heuristic is None:
+        heuristic = _zero
+    informed = algorithm in ("greedy", "astar")
+    if algorithm == "dfs":
+        frontier = StackFrontier()
+    elif algorithm == "bfs":
+        frontier = QueueFrontier()
+    else:
+        frontier = PriorityFrontier()
+
+    frontier.add(Node(state=start, parent=None, action=None), heuristic(start))
+    explored = set()
+    num_explored = 0
+    while not frontier.empty():
+        node = frontier.remove()
+        num_explored += 1
+        if goal(node.state):
+            return Solution(node, num_explored, explored)
+        explored.add(node.state)
+
+        for action, state in neighbors(node.state):
+            if state in explored:
+                continue
+            cost = node.cost + (1 if step_cost is None else step_cost(node.state, state))
+            if not informed:
+                if not frontier.contains_state(state):
+                    frontier.add(Node(state, node, action, cost))
+                continue
+
+            # Queue a state again only if this path to it is cheaper
+            queued = frontier.get(state)
+            if queued is not None and (algorithm == "greedy" or queued.cost <= cost):
+                continue
+            h = heuristic(state)
+            frontier.add(Node(state, node, action, cost), h if algorithm == "greedy" else cost + h)
+
+    return Solution(None, num_explored, explored)
+
+
+def _zero(state):
+    return 0
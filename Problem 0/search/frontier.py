@@ -0,0 +1,107 @@
+import heapq
+from collections import deque
+from itertools import count
+
+
+class Node():
+    __slots__ = ("state", "parent", "action", "cost")
+
+    def __init__(self, state, parent, action, cost=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+
+
+class StackFrontier():
+    """
+    Last in, first out frontier with O(1) add, remove and
+    contains_state: nodes live in a deque and their states are
+    counted in a dict alongside it.
+    """
+
+    def __init__(self):
+        self.frontier = deque()
+        self.states = {}
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def add(self, node, priority=None):
+        self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def _forget(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        return self._forget(self.frontier.pop())
+
+
+class QueueFrontier(StackFrontier):
+    """
+    First in, first out frontier with O(1) add, remove and
+    contains_state.
+    """
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        return self._forget(self.frontier.popleft())
+
+
+class PriorityFrontier():
+    """
+    Lowest priority first frontier on a binary heap.
+
+    Each state keeps only its latest node in a dict; adding a state
+    again (to lower its cost) pushes a new heap entry and leaves the
+    old one in place, to be skipped when it surfaces. Equal priorities
+    come out newest first, which favours deeper nodes.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.nodes = {}
+        self.counter = count()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def add(self, node, priority):
+        self.nodes[node.state] = node
+        heapq.heappush(self.heap, (priority, -next(self.counter), node))
+
+    def contains_state(self, state):
+        return state in self.nodes
+
+    def get(self, state):
+        """
+        Returns the node queued for state, or None.
+        """
+        return self.nodes.get(state)
+
+    def empty(self):
+        return len(self.nodes) == 0
+
+    def remove(self):
+        heap, nodes = self.heap, self.nodes
+        while heap:
+            _, _, node = heapq.heappop(heap)
+            if nodes.get(node.state) is node:
+                del nodes[node.state]
+                return node
+        raise Exception("empty frontier")
@@ -0,0 +1,112 @@
+"""
+Jump Point Search on 4-connected grids with unit step costs.
+
+A* on an open grid expands every cell of a wide band around the
+optimal path, most of them ties. Jump Point Search only expands cells
+where an optimal path may have to turn: searches run straight along a
+row until a cell above or below opens up that the row before had
+walled off, and straight along a column until a row scan from a cell
+finds such a point. Everything in between is skipped without being
+queued, and the full path is filled back in at the end.
+
+Row moves are only ever followed by column moves where they are
+forced, so among paths of equal length only those that turn "early"
+are searched; one of them is always optimal.
+"""
+
+from .engine import Solution
+from .frontier import Node, PriorityFrontier
+
+# Unit steps, as (action, row step, column step)
+STEPS = (("up", -1, 0), ("down", 1, 0), ("left", 0, -1), ("right", 0, 1))
+ACTIONS = {(dr, dc): action for action, dr, dc in STEPS}
+
+
+def jump_point_search(walls, start, goal):
+    """
+    Searches a grid given as rows of booleans, True for a wall, from
+    cell start to cell goal, each a (row, column) tuple.
+    Returns a Solution over every cell of the path, whose num_explored
+    and explored count only the jump points expanded.
+    """
+    height = len(walls)
+    width = len(walls[0]) if height else 0
+    goal_row, goal_col = goal
+
+    def free(r, c):
+        return 0 <= r < height and 0 <= c < width and not walls[r][c]
+
+    def jump_row(r, c, dc):
+        while True:
+            c += dc
+            if not free(r, c):
+                return None
+            if r == goal_row and c == goal_col:
+                return r, c
+            if ((free(r - 1, c) and not free(r - 1, c - dc))
+                    or (free(r + 1, c) and not free(r + 1, c - dc))):
+                return r, c
+
+    def jump_column(r, c, dr):
+        while True:
+            r += dr
+            if not free(r, c):
+                return None
+            if (r == goal_row and c == goal_col) or jump_row(r, c, 1) or jump_row(r, c, -1):
+                return r, c
+
+    def directions(node):
+        r, c = node.state
+        if node.action is None:
+            return [(dr, dc) for _, dr, dc in STEPS]
+        dr, dc = node.action
+        if dr:
+            return [(dr, 0), (0, 1), (0, -1)]
+        result = [(0, dc)]
+        for side in (-1, 1):
+            if free(r + side, c) and not free(r + side, c - dc):
+                result.append((side, 0))
+        return result
+
+    def heuristic(cell):
+        return abs(cell[0] - goal_row) + abs(cell[1] - goal_col)
+
+    frontier = PriorityFrontier()
+    frontier.add(Node(state=start, parent=None, action=None), heuristic(start))
+    explored = set()
+    while not frontier.empty():
+        node = frontier.remove()
+        if node.state == goal:
+            return _fill(Solution(node, len(explored) + 1, explored), start)
+        explored.add(node.state)
+
+        r, c = node.state
+        for dr, dc in directions(node):
+            cell = jump_column(r, c, dr) if dr else jump_row(r, c, dc)
+            if cell is None or cell in explored:
+                continue
+            cost = node.cost + abs(cell[0] - r) + abs(cell[1] - c)
+            queued = frontier.get(cell)
+            if queued is not None and queued.cost <= cost:
+                continue
+            frontier.add(Node(cell, node, (dr, dc), cost), cost + heuristic(cell))
+
+    return Solution(None, len(explored), explored)
+
+
+def _fill(solution, start):
+    """
+    Replaces the jump points of a solution with every cell between
+    them, and their directions with unit step actions.
+    """
+    actions = []
+    states = []
+    cell = start
+    for (dr, dc), target in zip(solution.actions, solution.states):
+        while cell != target:
+            cell = (cell[0] + dr, cell[1] + dc)
+            actions.append(ACTIONS[(dr, dc)])
+            states.append(cell)
+    solution.actions = actions
+    solution.states = states
+    return solution
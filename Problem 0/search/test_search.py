@@ -0,0 +1,134 @@
+import random
+import unittest
+
+from search import ALGORITHMS, Node, PriorityFrontier, QueueFrontier, StackFrontier, solve
+from search.grid import jump_point_search
+
+# Небольшой лабиринт: # — стена, A — старт, B — цель
+GRID = [
+    "A  #    ",
+    " # # ## ",
+    " #   #  ",
+    " ### # #",
+    "     #B ",
+]
+
+
+def find(char):
+    for i, row in enumerate(GRID):
+        if char in row:
+            return i, row.index(char)
+
+
+def neighbors(state):
+    row, col = state
+    result = []
+    for action, (r, c) in (("up", (row - 1, col)), ("down", (row + 1, col)),
+                           ("left", (row, col - 1)), ("right", (row, col + 1))):
+        if 0 <= r < len(GRID) and 0 <= c < len(GRID[0]) and GRID[r][c] != "#":
+            result.append((action, (r, c)))
+    return result
+
+
+START, GOAL = find("A"), find("B")
+
+
+def manhattan(state):
+    return abs(state[0] - GOAL[0]) + abs(state[1] - GOAL[1])
+
+
+class TestFrontiers(unittest.TestCase):
+
+    def test_priority_order(self):
+        """Тест: узел с меньшим приоритетом выходит первым"""
+        frontier = PriorityFrontier()
+        for state, priority in (("a", 3), ("b", 1), ("c", 2)):
+            frontier.add(Node(state, None, None), priority)
+        self.assertEqual([frontier.remove().state for _ in range(3)], list("bca"))
+        self.assertTrue(frontier.empty())
+
+    def test_lazy_deletion(self):
+        """Тест: повторное добавление заменяет узел, старая запись пропускается"""
+        frontier = PriorityFrontier()
+        frontier.add(Node("a", None, None, cost=5), 5)
+        frontier.add(Node("b", None, None), 3)
+        frontier.add(Node("a", None, None, cost=1), 1)
+        self.assertEqual(len(frontier), 2)
+        self.assertEqual(frontier.get("a").cost, 1)
+        self.assertEqual([frontier.remove().state for _ in range(2)], list("ab"))
+        with self.assertRaises(Exception):
+            frontier.remove()
+
+    def test_stack_and_queue(self):
+        """Тест: стек и очередь отдают узлы в своём порядке"""
+        for frontier_class, expected in ((StackFrontier, "cba"), (QueueFrontier, "abc")):
+            frontier = frontier_class()
+            for state in "abc":
+                frontier.add(Node(state, None, None))
+            self.assertTrue(frontier.contains_state("b"))
+            self.assertEqual("".join(frontier.remove().state for _ in range(3)), expected)
+
+
+class TestSolve(unittest.TestCase):
+
+    def test_all_algorithms(self):
+        """Тест: каждый алгоритм доходит до цели"""
+        for algorithm in ALGORITHMS:
+            solution = solve(START, lambda s: s == GOAL, neighbors, algorithm, manhattan)
+            self.assertTrue(solution.found, algorithm)
+            self.assertEqual(solution.states[-1], GOAL)
+            self.assertEqual(len(solution.actions), solution.cost)
+
+    def test_optimal(self):
+        """Тест: BFS и A* находят кратчайший путь, A* исследует не больше"""
+        bfs = solve(START, lambda s: s == GOAL, neighbors, "bfs")
+        astar = solve(START, lambda s: s == GOAL, neighbors, "astar", manhattan)
+        self.assertEqual(astar.cost, bfs.cost)
+        self.assertLessEqual(astar.num_explored, bfs.num_explored)
+
+    def test_no_solution(self):
+        """Тест: недостижимая цель — пустое решение"""
+        solution = solve(START, lambda s: s == (9, 9), neighbors, "astar", manhattan)
+        self.assertFalse(solution.found)
+        self.assertEqual(solution.num_explored, len(solution.explored))
+        with self.assertRaises(ValueError):
+            solve(START, lambda s: False, neighbors, "bogus")
+
+
+class TestJumpPointSearch(unittest.TestCase):
+
+    def test_small_maze(self):
+        """Тест: JPS находит кратчайший путь по соседним клеткам"""
+        walls = [[char == "#" for char in row] for row in GRID]
+        solution = jump_point_search(walls, START, GOAL)
+        bfs = solve(START, lambda s: s == GOAL, neighbors, "bfs")
+        self.assertEqual(len(solution.actions), len(bfs.actions))
+        self.assertEqual(solution.cost, bfs.cost)
+        self.assertEqual(dict(neighbors(START))[solution.actions[0]], solution.states[0])
+        self.assertLess(solution.num_explored, bfs.num_explored)
+
+    def test_random_grids(self):
+        """Тест: на случайных сетках длина пути JPS совпадает с BFS"""
+        rng = random.Random(0)
+        for _ in range(200):
+            height, width = rng.randint(1, 12), rng.randint(1, 12)
+            walls = [[rng.random() < 0.3 for _ in range(width)] for _ in range(height)]
+            cells = [(r, c) for r in range(height) for c in range(width) if not walls[r][c]]
+            if len(cells) < 2:
+                continue
+            start, goal = rng.sample(cells, 2)
+
+            def grid_neighbors(state):
+                row, col = state
+                return [
+                    (None, (r, c)) for r, c in
+                    ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                    if 0 <= r < height and 0 <= c < width and not walls[r][c]
+                ]
+
+            bfs = solve(start, lambda s: s == goal, grid_neighbors, "bfs")
+            solution = jump_point_search(walls, start, goal)
+            self.assertEqual(solution.found, bfs.found)
+            if bfs.found:
+                self.assertEqual(len(solution.states), len(bfs.states))
+                self.assertEqual(solution.states[-1], goal)
@@ -0,0 +1,119 @@
+"""
+AI moves computed off the caller's thread.
+
+An AsyncMove runs engine(board), any function returning an action such
+as tictactoe.minimax or mnk.Game.minimax, in a worker thread or worker
+process, and is polled for the result, so that an event loop keeps
+running while the AI thinks. A move in a process can be cancelled
+outright; a cancelled thread is left to finish on its own and its move
+is thrown away. Until it finishes it still uses its engine, so the next
+move should be made with an engine whose state it does not share.
+Nothing here needs a display, so engines can be driven and timed
+headless.
+"""
+
+import multiprocessing
+import threading
+import time
+
+
+def _run(engine, board, connection):
+    """
+    Worker process body: sends back engine(board), or the exception
+    it raised.
+    """
+    try:
+        connection.send((True, engine(board)))
+    except Exception as e:
+        connection.send((False, e))
+    finally:
+        connection.close()
+
+
+class AsyncMove():
+    """
+    One AI move being computed by engine(board) in a worker thread,
+    or in a worker process with process=True.
+    """
+
+    def __init__(self, engine, board, process=False):
+        self.start = time.perf_counter()
+        self.end = None
+        self.cancelled = False
+        self._outcome = None
+        if process:
+            receive, send = multiprocessing.Pipe(duplex=False)
+            self._connection = receive
+            self._worker = multiprocessing.Process(
+                target=_run, args=(engine, board, send), daemon=True
+            )
+            self._worker.start()
+            send.close()
+        else:
+            self._connection = None
+            self._worker = threading.Thread(
+                target=self._think, args=(engine, board), daemon=True
+            )
+            self._worker.start()
+
+    def _think(self, engine, board):
+        try:
+            outcome = (True, engine(board))
+        except Exception as e:
+            outcome = (False, e)
+        self._outcome = outcome
+        self.end = time.perf_counter()
+
+    def done(self):
+        """
+        Returns whether the move is ready, without waiting.
+        """
+        if self.cancelled:
+            return False
+        if self._outcome is None and self._connection is not None:
+            if self._connection.poll():
+                self._outcome = self._connection.recv()
+                self.end = time.perf_counter()
+                self._worker.join()
+        return self._outcome is not None
+
+    def result(self, timeout=None):
+        """
+        Waits up to timeout seconds (forever if None) for the move and
+        returns it, re-raising any exception the engine raised.
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.done():
+            if self.cancelled:
+                raise RuntimeError("move was cancelled")
+            wait = 0.01
+            if deadline is not None:
+                wait = min(wait, deadline - time.perf_counter())
+                if wait <= 0:
+                    raise TimeoutError("move not ready")
+            if self._connection is not None:
+                self._connection.poll(wait)
+            else:
+                self._worker.join(wait)
+        ok, value = self._outcome
+        if not ok:
+            raise value
+        return value
+
+    def elapsed(self):
+        """
+        Seconds spent on the move so far, or in total once it is done.
+        """
+        return (self.end or time.perf_counter()) - self.start
+
+    def cancel(self):
+        """
+        Stops waiting for the move; a worker process is terminated.
+        """
+        if self.cancelled or self._outcome is not None:
+            return
+        self.cancelled = True
+        if self._connection is not None:
+            self._worker.terminate()
+            self._worker.join()
+            self._connection.close()
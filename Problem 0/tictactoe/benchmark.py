@@ -0,0 +1,94 @@
+"""
+Benchmark of the tictactoe search on the opening move.
+
+Compares the original list-based full-tree minimax, and the same search
+applying moves in place to a Position, with the bitboard AlphaBeta
+engine, with pruning, the transposition table and symmetry
+canonicalization switched on one at a time, and with a lookup in the
+opening book. Each engine variant starts from an empty table.
+
+Usage: python benchmark.py [--repeat N] [--skip-reference]
+"""
+
+import argparse
+import time
+
+import tictactoe as ttt
+
+# Engine options of each variant, from plain minimax to the default
+VARIANTS = {
+    "minimax": dict(pruning=False, table=False),
+    "alphabeta": dict(table=False),
+    "alphabeta+table": dict(symmetry=False),
+    "alphabeta+table+symmetry": dict(),
+}
+
+
+def full_value(position):
+    """
+    Returns the value to X of position by full-tree minimax, making and
+    unmaking moves in place rather than copying boards.
+    """
+    x, o = position.marks
+    if ttt.WINNING[x] or ttt.WINNING[o] or x | o == ttt.FULL:
+        return 1 if ttt.WINNING[x] else -1 if ttt.WINNING[o] else 0
+    occupied = x | o
+    best = -2 if position.turn == 0 else 2
+    for square in ttt.ORDER:
+        if occupied >> square & 1:
+            continue
+        position.make(square)
+        value = full_value(position)
+        position.unmake(square)
+        best = max(best, value) if position.turn == 0 else min(best, value)
+    return best
+
+
+def opening(options):
+    """
+    Searches the opening move with a fresh engine.
+    Returns (move, nodes searched, table entries, seconds).
+    """
+    engine = ttt.AlphaBeta(**options)
+    start = time.perf_counter()
+    _, square = engine.best(0, 0)
+    elapsed = time.perf_counter() - start
+    entries = len(engine.table) if engine.table is not None else 0
+    return divmod(square, 3), engine.nodes, entries, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the tictactoe opening move.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="time each variant this many times and keep the fastest")
+    parser.add_argument("--skip-reference", action="store_true",
+                        help="skip the original list-based minimax, which takes seconds")
+    args = parser.parse_args()
+
+    print(f"{'variant':>26} {'move':>7} {'nodes':>8} {'entries':>8} {'ms':>9}")
+    if not args.skip_reference:
+        start = time.perf_counter()
+        move = ttt.plain_minimax(ttt.initial_state())
+        elapsed = time.perf_counter() - start
+        print(f"{'reference (lists)':>26} {str(move):>7} {'-':>8} {'-':>8} {elapsed * 1000:>9.1f}")
+        start = time.perf_counter()
+        full_value(ttt.Position())
+        elapsed = time.perf_counter() - start
+        print(f"{'reference (make/unmake)':>26} {'-':>7} {'-':>8} {'-':>8} {elapsed * 1000:>9.1f}")
+    for name, options in VARIANTS.items():
+        runs = [opening(options) for _ in range(args.repeat)]
+        move, nodes, entries, _ = runs[0]
+        elapsed = min(run[3] for run in runs)
+        print(f"{name:>26} {str(move):>7} {nodes:>8} {entries:>8} {elapsed * 1000:>9.1f}")
+
+    if ttt.lookup(ttt.initial_state()) is not None:
+        board = ttt.initial_state()
+        start = time.perf_counter()
+        for _ in range(1000):
+            move = ttt.minimax(board)
+        elapsed = (time.perf_counter() - start) / 1000
+        print(f"{'opening book':>26} {str(move):>7} {0:>8} {'-':>8} {elapsed * 1000:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Builds the tictactoe opening book.
+
+Every board reachable in play, 5478 of them, is solved once with the
+AlphaBeta engine, and its value and best move are written to one byte
+of a 3^9-byte file indexed by the board's base-3 number (see
+tictactoe.BOOK). tictactoe.minimax then answers with a single lookup.
+
+Usage: python book.py [path]
+"""
+
+import sys
+
+import tictactoe as ttt
+
+
+def reachable():
+    """
+    Yields the (X, O) masks of every board reachable from the empty
+    board, once each.
+    """
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        x, o = stack.pop()
+        if (x, o) in seen:
+            continue
+        seen.add((x, o))
+        yield x, o
+        occupied = x | o
+        if ttt.WINNING[x] or ttt.WINNING[o] or occupied == ttt.FULL:
+            continue
+        x_to_move = x.bit_count() == o.bit_count()
+        for square in range(9):
+            bit = 1 << square
+            if not occupied & bit:
+                stack.append((x | bit, o) if x_to_move else (x, o | bit))
+
+
+def build():
+    """
+    Returns the opening book as a bytearray.
+    """
+    engine = ttt.AlphaBeta()
+    book = bytearray([ttt.UNREACHABLE]) * ttt.POSITIONS
+    for x, o in reachable():
+        if ttt.WINNING[x] or ttt.WINNING[o] or x | o == ttt.FULL:
+            value = 1 if ttt.WINNING[x] else -1 if ttt.WINNING[o] else 0
+            square = ttt.NO_MOVE
+        elif x.bit_count() == o.bit_count():
+            value, square = engine.best(x, o)
+        else:
+            value, square = engine.best(o, x)
+            value = -value
+        book[ttt.TERNARY[x] + 2 * ttt.TERNARY[o]] = (value + 1) << 4 | square
+    return book
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else ttt.BOOK
+    book = build()
+    with open(path, "wb") as f:
+        f.write(book)
+    print(f"{len(book) - book.count(ttt.UNREACHABLE)} positions written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+m,n,k-games: k in a row on a board of m rows and n columns.
+
+A Game offers the tictactoe API (initial_state, player, actions,
+result, winner, terminal, utility, minimax) over the same list-of-lists
+boards, for any board size, so 4x4 tictactoe or 15x15 Gomoku run
+through the same calls as the 3x3 game.
+
+Inside, a position is a pair of bitboards, one int per player, with bit
+i * n + j set for a mark in row i, column j. Every line of k squares is
+precomputed as a mask, as is the tuple of lines through each square, so
+after a move only those lines are checked for a win. minimax runs
+iterative-deepening alpha-beta with a transposition table: each depth
+is searched in turn, the best move of the last one tried first, until
+the position is solved or the time budget runs out. Positions at the
+depth limit are scored by the open lines each player has.
+"""
+
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Score of a win; wins sooner score higher, by one per ply
+WIN = 10 ** 9
+
+# Boards with more squares only consider moves next to a mark
+SMALL_BOARD = 25
+
+# Transposition table entries kept before it is cleared
+TABLE_SIZE = 1_000_000
+
+# Nodes searched between checks of the clock
+CHECK_EVERY = 256
+
+# Transposition table entry bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class _Timeout(Exception):
+    pass
+
+
+class Game():
+    """
+    An m,n,k-game. budget is the time in seconds minimax may take,
+    or None to always search until the position is solved.
+    After each minimax call, value holds the score of the position to
+    the player to move, depth the deepest search completed, nodes the
+    positions searched and time the seconds taken.
+    """
+
+    def __init__(self, rows=3, cols=3, k=3, budget=1.0):
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError("k must fit on the board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.budget = budget
+        self.size = rows * cols
+        self.full = (1 << self.size) - 1
+
+        # Masks of every line of k squares, and of those through each square
+        self.lines = []
+        for i in range(rows):
+            for j in range(cols):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < rows and 0 <= end_j < cols:
+                        self.lines.append(sum(
+                            1 << ((i + di * step) * cols + j + dj * step) for step in range(k)
+                        ))
+        self.lines_through = tuple(
+            tuple(line for line in self.lines if line >> square & 1)
+            for square in range(self.size)
+        )
+
+        # Squares around each square, and all squares from the center out
+        self.near = tuple(
+            sum(
+                1 << (a * cols + b)
+                for a in range(max(0, i - 1), min(rows, i + 2))
+                for b in range(max(0, j - 1), min(cols, j + 2))
+            )
+            for i, j in (divmod(square, cols) for square in range(self.size))
+        )
+        center = ((rows - 1) / 2, (cols - 1) / 2)
+        self.order = sorted(
+            range(self.size),
+            key=lambda square: (abs(square // cols - center[0]) + abs(square % cols - center[1]), square)
+        )
+
+        # Score of a line holding this many marks of one player only
+        self.line_scores = [0] + [4 ** count for count in range(1, k + 1)]
+
+        self.table = {}
+        self.deadline = None
+        self.value = self.depth = self.nodes = self.time = None
+
+    def initial_state(self):
+        return [[EMPTY] * self.cols for _ in range(self.rows)]
+
+    def player(self, board):
+        x_count = sum(row.count(X) for row in board)
+        o_count = sum(row.count(O) for row in board)
+        return X if x_count <= o_count else O
+
+    def actions(self, board):
+        return {
+            (i, j) for i in range(self.rows) for j in range(self.cols)
+            if board[i][j] is EMPTY
+        }
+
+    def result(self, board, action):
+        i, j = action
+        if not (0 <= i < self.rows and 0 <= j < self.cols):
+            raise Exception("Invalid action")
+        if board[i][j] is not EMPTY:
+            raise Exception("Invalid action")
+        new_board = [row[:] for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def encode(self, board):
+        """
+        Returns the (X, O) pair of bitboards of board.
+        """
+        x = o = 0
+        for i, row in enumerate(board):
+            for j, cell in enumerate(row):
+                if cell == X:
+                    x |= 1 << (i * self.cols + j)
+                elif cell == O:
+                    o |= 1 << (i * self.cols + j)
+        return x, o
+
+    def winner(self, board):
+        x, o = self.encode(board)
+        for line in self.lines:
+            if x & line == line:
+                return X
+            if o & line == line:
+                return O
+        return None
+
+    def terminal(self, board):
+        if self.winner(board) is not None:
+            return True
+        return all(EMPTY not in row for row in board)
+
+    def utility(self, board):
+        won = self.winner(board)
+        return 1 if won == X else -1 if won == O else 0
+
+    def wins(self, bits, square):
+        """
+        Returns whether the mark at square completes a line of bits.
+        """
+        return any(bits & line == line for line in self.lines_through[square])
+
+    def minimax(self, board, budget=None):
+        """
+        Returns the best action (i, j) found for the current player
+        within budget seconds (by default self.budget), or None if
+        the game is over.
+        """
+        if self.terminal(board):
+            return None
+        x, o = self.encode(board)
+        me, them = (x, o) if self.player(board) == X else (o, x)
+        square = self.search(me, them, self.budget if budget is None else budget)
+        return divmod(square, self.cols)
+
+    def search(self, me, them, budget=None):
+        """
+        Iterative-deepening alpha-beta from a position where me is to
+        move. Returns the best square of the deepest search completed.
+        """
+        start = time.perf_counter()
+        self.deadline = None if budget is None else start + budget
+        self.nodes = 0
+        if len(self.table) > TABLE_SIZE:
+            self.table.clear()
+        empty = self.size - (me | them).bit_count()
+        moves = self.moves(me, them)
+        best, self.value, self.depth = moves[0], 0, 0
+
+        for depth in range(1, empty + 1):
+            try:
+                value, square = self.root(me, them, depth, moves)
+            except _Timeout:
+                break
+            best, self.value, self.depth = square, value, depth
+
+            # Search the best move first next time; stop once solved
+            moves.remove(square)
+            moves.insert(0, square)
+            if abs(value) >= WIN - self.size:
+                break
+        self.time = time.perf_counter() - start
+        return best
+
+    def root(self, me, them, depth, moves):
+        alpha = -2 * WIN
+        best = moves[0]
+        for square in moves:
+            value = -self.negamax(them, me | 1 << square, square, depth - 1, -2 * WIN, -alpha, 1)
+            if value > alpha:
+                alpha, best = value, square
+        return alpha, best
+
+    def moves(self, me, them, first=None):
+        """
+        Returns the squares worth trying, center out, with first (if
+        any) in front.
+        """
+        occupied = me | them
+        if self.size <= SMALL_BOARD or not occupied:
+            candidates = self.full & ~occupied
+        else:
+            candidates = 0
+            bits = occupied
+            while bits:
+                low = bits & -bits
+                candidates |= self.near[low.bit_length() - 1]
+                bits ^= low
+            candidates &= ~occupied
+        moves = [square for square in self.order if candidates >> square & 1]
+        if first is not None and first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+        return moves
+
+    def evaluate(self, me, them):
+        """
+        Heuristic score of a position to the player to move: lines
+        only one player has marks in, weighted by how full they are.
+        """
+        scores = self.line_scores
+        score = 0
+        for line in self.lines:
+            mine, theirs = me & line, them & line
+            if mine and not theirs:
+                score += scores[mine.bit_count()]
+            elif theirs and not mine:
+                score -= scores[theirs.bit_count()]
+        return score
+
+    def negamax(self, me, them, last, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.deadline is not None and self.nodes % CHECK_EVERY == 0:
+            if time.perf_counter() > self.deadline:
+                raise _Timeout
+
+        # Only the player who just moved can have won
+        if self.wins(them, last):
+            return ply - WIN
+        occupied = me | them
+        if occupied == self.full:
+            return 0
+        if depth == 0:
+            return self.evaluate(me, them)
+
+        key = (me << self.size) | them
+        entry = self.table.get(key)
+        first = None
+        if entry is not None:
+            stored_depth, value, bound, first = entry
+            if stored_depth >= depth:
+                # Wins and losses are stored relative to this position
+                if value >= WIN - self.size:
+                    value -= ply
+                elif value <= self.size - WIN:
+                    value += ply
+                if bound == EXACT:
+                    return value
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        start = alpha
+        best, best_square = -2 * WIN, None
+        for square in self.moves(me, them, first):
+            value = -self.negamax(them, me | 1 << square, square, depth - 1, -beta, -alpha, ply + 1)
+            if value > best:
+                best, best_square = value, square
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        stored = best
+        if stored >= WIN - self.size:
+            stored += ply
+        elif stored <= self.size - WIN:
+            stored -= ply
+        bound = EXACT if start < best < beta else LOWER if best >= beta else UPPER
+        self.table[key] = (depth, stored, bound, best_square)
+        return best
@@ -1,146 +1,282 @@
-import pygame
+"""
+Play tictactoe, or any m,n,k-game, against the computer.
+
+The AI thinks in a worker thread (or process, with --process) while the
+window keeps handling events; a Cancel button or Escape stops it and
+takes back the last move. With --headless the computer plays itself in
+the terminal, with no display, printing how long each move took.
+A cancelled thread keeps searching until it finishes, so after a
+cancel the next move gets its own engine from fresh_engine.
+
+Usage: python runner.py [--board ROWS COLS K] [--budget SECONDS]
+                        [--process] [--headless [--games N]]
+"""
+
+import argparse
+import functools
 import sys
 import time
 
 import tictactoe as ttt
+from ai import AsyncMove
 
-pygame.init()
-size = width, height = 600, 400
+# Shortest time an AI move stays "thinking", so it is seen to happen
+MIN_THINK = 0.5
 
 # Colors
 black = (0, 0, 0)
 white = (255, 255, 255)
 
-screen = pygame.display.set_mode(size)
-
-mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
-largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
-moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
-
-user = None
-board = ttt.initial_state()
-ai_turn = False
-
-while True:
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            sys.exit()
-
-    screen.fill(black)
-
-    # Let user choose a player.
-    if user is None:
-
-        # Draw title
-        title = largeFont.render("Play Tic-Tac-Toe", True, white)
-        titleRect = title.get_rect()
-        titleRect.center = ((width / 2), 50)
-        screen.blit(title, titleRect)
-
-        # Draw buttons
-        playXButton = pygame.Rect((width / 8), (height / 2), width / 4, 50)
-        playX = mediumFont.render("Play as X", True, black)
-        playXRect = playX.get_rect()
-        playXRect.center = playXButton.center
-        pygame.draw.rect(screen, white, playXButton)
-        screen.blit(playX, playXRect)
-
-        playOButton = pygame.Rect(5 * (width / 8), (height / 2), width / 4, 50)
-        playO = mediumFont.render("Play as O", True, black)
-        playORect = playO.get_rect()
-        playORect.center = playOButton.center
-        pygame.draw.rect(screen, white, playOButton)
-        screen.blit(playO, playORect)
-
-        # Check if button is clicked
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1:
-            mouse = pygame.mouse.get_pos()
-            if playXButton.collidepoint(mouse):
-                time.sleep(0.2)
-                user = ttt.X
-            elif playOButton.collidepoint(mouse):
-                time.sleep(0.2)
-                user = ttt.O
 
-    else:
+def make_game(board, budget):
+    """
+    Returns the module or object with the tictactoe API for a board of
+    (rows, cols, k): the tictactoe module itself for 3x3, and an
+    mnk.Game otherwise.
+    """
+    if tuple(board) == (3, 3, 3):
+        return ttt
+    import mnk
+    return mnk.Game(*board, budget=budget)
 
-        # Draw game board
-        tile_size = 80
-        tile_origin = (width / 2 - (1.5 * tile_size),
-                       height / 2 - (1.5 * tile_size))
-        tiles = []
-        for i in range(3):
-            row = []
-            for j in range(3):
-                rect = pygame.Rect(
-                    tile_origin[0] + j * tile_size,
-                    tile_origin[1] + i * tile_size,
-                    tile_size, tile_size
-                )
-                pygame.draw.rect(screen, white, rect, 3)
-
-                if board[i][j] != ttt.EMPTY:
-                    move = moveFont.render(board[i][j], True, white)
-                    moveRect = move.get_rect()
-                    moveRect.center = rect.center
-                    screen.blit(move, moveRect)
-                row.append(rect)
-            tiles.append(row)
-
-        game_over = ttt.terminal(board)
-        player = ttt.player(board)
-
-        # Show title
-        if game_over:
-            winner = ttt.winner(board)
-            if winner is None:
-                title = f"Game Over: Tie."
-            else:
-                title = f"Game Over: {winner} wins."
-        elif user == player:
-            title = f"Play as {user}"
-        else:
-            title = f"Computer thinking..."
-        title = largeFont.render(title, True, white)
-        titleRect = title.get_rect()
-        titleRect.center = ((width / 2), 30)
-        screen.blit(title, titleRect)
-
-        # Check for AI move
-        if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
-
-        # Check for a user move
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1 and user == player and not game_over:
-            mouse = pygame.mouse.get_pos()
-            for i in range(3):
-                for j in range(3):
-                    if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
-                        board = ttt.result(board, (i, j))
-
-        if game_over:
-            againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
-            againRect = again.get_rect()
-            againRect.center = againButton.center
-            pygame.draw.rect(screen, white, againButton)
-            screen.blit(again, againRect)
+
+def fresh_engine(game):
+    """
+    Returns a move function like game.minimax whose search state is its
+    own, so that a cancelled thread still searching with the old one
+    cannot race the next move over tables, nodes or the deadline.
+    """
+    if game is ttt:
+        return functools.partial(ttt.minimax, engine=ttt.AlphaBeta())
+    return type(game)(game.rows, game.cols, game.k, game.budget).minimax
+
+
+def headless(game, games=1, process=False, out=sys.stdout):
+    """
+    Plays games of the computer against itself with no display,
+    writing each move and its time to out.
+    Returns the list of winners, None for a tie.
+    """
+    winners = []
+    for number in range(1, games + 1):
+        board = game.initial_state()
+        while not game.terminal(board):
+            move = AsyncMove(game.minimax, board, process)
+            action = move.result()
+            out.write(f"game {number}: {game.player(board)} plays {action} "
+                      f"in {move.elapsed() * 1000:.1f} ms\n")
+            board = game.result(board, action)
+        winner = game.winner(board)
+        out.write(f"game {number}: {'tie' if winner is None else winner + ' wins'}\n")
+        winners.append(winner)
+    return winners
+
+
+def gui(game, process=False):
+    import pygame
+
+    pygame.init()
+    size = width, height = 600, 400
+
+    screen = pygame.display.set_mode(size)
+
+    mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
+    largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
+
+    board = game.initial_state()
+    rows, cols = len(board), len(board[0])
+    tile_size = int(min(80, (height - 120) / rows, (width - 40) / cols))
+    moveFont = pygame.font.Font("OpenSans-Regular.ttf", max(8, tile_size * 3 // 4))
+
+    user = None
+    history = []
+    thinking = None
+    engine = game.minimax
+    failed = False
+
+    while True:
+
+        cancelled = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                if thinking is not None:
+                    thinking.cancel()
+                sys.exit()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                cancelled = True
+
+        screen.fill(black)
+
+        # Let user choose a player.
+        if user is None:
+
+            # Draw title
+            title = largeFont.render("Play Tic-Tac-Toe", True, white)
+            titleRect = title.get_rect()
+            titleRect.center = ((width / 2), 50)
+            screen.blit(title, titleRect)
+
+            # Draw buttons
+            playXButton = pygame.Rect((width / 8), (height / 2), width / 4, 50)
+            playX = mediumFont.render("Play as X", True, black)
+            playXRect = playX.get_rect()
+            playXRect.center = playXButton.center
+            pygame.draw.rect(screen, white, playXButton)
+            screen.blit(playX, playXRect)
+
+            playOButton = pygame.Rect(5 * (width / 8), (height / 2), width / 4, 50)
+            playO = mediumFont.render("Play as O", True, black)
+            playORect = playO.get_rect()
+            playORect.center = playOButton.center
+            pygame.draw.rect(screen, white, playOButton)
+            screen.blit(playO, playORect)
+
+            # Check if button is clicked
             click, _, _ = pygame.mouse.get_pressed()
             if click == 1:
                 mouse = pygame.mouse.get_pos()
-                if againButton.collidepoint(mouse):
+                if playXButton.collidepoint(mouse):
+                    time.sleep(0.2)
+                    user = ttt.X
+                elif playOButton.collidepoint(mouse):
+                    time.sleep(0.2)
+                    user = ttt.O
+
+        else:
+
+            # Draw game board
+            tile_origin = (width / 2 - (cols / 2 * tile_size),
+                           height / 2 - (rows / 2 * tile_size))
+            tiles = []
+            for i in range(rows):
+                row = []
+                for j in range(cols):
+                    rect = pygame.Rect(
+                        tile_origin[0] + j * tile_size,
+                        tile_origin[1] + i * tile_size,
+                        tile_size, tile_size
+                    )
+                    pygame.draw.rect(screen, white, rect, 3)
+
+                    if board[i][j] != ttt.EMPTY:
+                        move = moveFont.render(board[i][j], True, white)
+                        moveRect = move.get_rect()
+                        moveRect.center = rect.center
+                        screen.blit(move, moveRect)
+                    row.append(rect)
+                tiles.append(row)
+
+            game_over = game.terminal(board)
+            player = game.player(board)
+
+            # Show title
+            if game_over:
+                winner = game.winner(board)
+                if winner is None:
+                    title = f"Game Over: Tie."
+                else:
+                    title = f"Game Over: {winner} wins."
+            elif user == player:
+                title = "Computer failed, play on" if failed else f"Play as {user}"
+            else:
+                # Dots count up while the search runs
+                dots = "." * (1 + int(time.perf_counter() * 3) % 3)
+                title = f"Computer thinking{dots:<3}"
+            title = largeFont.render(title, True, white)
+            titleRect = title.get_rect()
+            titleRect.center = ((width / 2), 30)
+            screen.blit(title, titleRect)
+
+            # Start the AI move in the background, and play it once ready
+            if user != player and not game_over:
+                if thinking is None:
+                    thinking = AsyncMove(engine, board, process)
+                elif thinking.done() and time.perf_counter() - thinking.start >= MIN_THINK:
+                    try:
+                        board = game.result(board, thinking.result())
+                    except Exception as e:
+                        # Take back the user's move, as for a cancel
+                        print(f"Computer move failed: {e!r}", file=sys.stderr)
+                        failed = cancelled = True
+                    else:
+                        thinking = None
+
+            # Let the user cancel the AI move, taking back their own
+            if thinking is not None:
+                cancelButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
+                cancel = mediumFont.render("Cancel", True, black)
+                cancelRect = cancel.get_rect()
+                cancelRect.center = cancelButton.center
+                pygame.draw.rect(screen, white, cancelButton)
+                screen.blit(cancel, cancelRect)
+                click, _, _ = pygame.mouse.get_pressed()
+                if click == 1 and cancelButton.collidepoint(pygame.mouse.get_pos()):
                     time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
+                    cancelled = True
+                if cancelled:
+                    thinking.cancel()
+                    thinking = None
+
+                    # A cancelled thread keeps searching with its engine
+                    if not process:
+                        engine = fresh_engine(game)
+                    if history:
+                        board = history.pop()
+                    else:
+                        user = None
+                        board = game.initial_state()
+
+            # Check for a user move
+            click, _, _ = pygame.mouse.get_pressed()
+            if click == 1 and user == player and not game_over:
+                mouse = pygame.mouse.get_pos()
+                for i in range(rows):
+                    for j in range(cols):
+                        if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
+                            history.append(board)
+                            board = game.result(board, (i, j))
+                            failed = False
+
+            if game_over:
+                againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
+                again = mediumFont.render("Play Again", True, black)
+                againRect = again.get_rect()
+                againRect.center = againButton.center
+                pygame.draw.rect(screen, white, againButton)
+                screen.blit(again, againRect)
+                click, _, _ = pygame.mouse.get_pressed()
+                if click == 1:
+                    mouse = pygame.mouse.get_pos()
+                    if againButton.collidepoint(mouse):
+                        time.sleep(0.2)
+                        user = None
+                        board = game.initial_state()
+                        history = []
+
+        pygame.display.flip()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play tictactoe against the computer.")
+    parser.add_argument("--board", type=int, nargs=3, default=[3, 3, 3],
+                        metavar=("ROWS", "COLS", "K"),
+                        help="board size and how many in a row win")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="seconds the AI may think on boards other than 3x3")
+    parser.add_argument("--process", action="store_true",
+                        help="think in a worker process instead of a thread")
+    parser.add_argument("--headless", action="store_true",
+                        help="let the computer play itself in the terminal")
+    parser.add_argument("--games", type=int, default=1,
+                        help="games to play with --headless")
+    args = parser.parse_args(argv)
+
+    game = make_game(args.board, args.budget)
+    if args.headless:
+        headless(game, args.games, args.process)
+    else:
+        gui(game, args.process)
+
 
-    pygame.display.flip()
+if __name__ == "__main__":
+    main()
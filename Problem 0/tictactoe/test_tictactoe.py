@@ -0,0 +1,318 @@
+import io
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import book
+import mnk
+import runner
+import tictactoe as ttt
+import tournament
+from ai import AsyncMove
+
+X, O, EMPTY = ttt.X, ttt.O, ttt.EMPTY
+
+
+def reachable():
+    """Все достижимые позиции как пары масок (ходящий, соперник)"""
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        me, them = stack.pop()
+        if (me, them) in seen:
+            continue
+        seen.add((me, them))
+        if ttt.WINNING[them] or me | them == ttt.FULL:
+            continue
+        for square in range(9):
+            if not (me | them) >> square & 1:
+                stack.append((them, me | 1 << square))
+    return seen
+
+
+class TestBoard(unittest.TestCase):
+
+    def test_result_copies(self):
+        """Тест: result не меняет исходную доску и ставит метку ходящего"""
+        board = ttt.initial_state()
+        after = ttt.result(board, (1, 1))
+        self.assertEqual(board, ttt.initial_state())
+        self.assertEqual(after[1][1], X)
+        self.assertEqual(ttt.result(after, (0, 0))[0][0], O)
+        with self.assertRaises(Exception):
+            ttt.result(after, (1, 1))
+        with self.assertRaises(Exception):
+            ttt.result(after, (3, 0))
+
+    def test_encode_and_utility(self):
+        """Тест: кодирование в битовые маски и выигрыш по линии"""
+        board = [[X, X, X], [O, O, EMPTY], [EMPTY, EMPTY, EMPTY]]
+        self.assertEqual(ttt.encode(board), (0b111, 0b11000))
+        self.assertTrue(ttt.WINNING[0b111])
+        self.assertEqual(ttt.utility(board), 1)
+        self.assertTrue(ttt.terminal(board))
+
+    def test_canonical(self):
+        """Тест: все 8 симметричных позиций получают один ключ"""
+        x, o = 1 << 0, 1 << 5
+        keys = {ttt.canonical(table[x], table[o]) for table in ttt.SYMMETRIES}
+        self.assertEqual(len(keys), 1)
+        self.assertNotEqual(ttt.canonical(1 << 0, 1 << 1), ttt.canonical(1 << 0, 1 << 4))
+
+    def test_make_unmake(self):
+        """Тест: ход на месте и его отмена возвращают позицию"""
+        position = ttt.Position()
+        position.make(4)
+        position.make(0)
+        self.assertEqual(position.marks, [1 << 4, 1 << 0])
+        self.assertEqual(position.turn, 0)
+        position.unmake(0)
+        self.assertEqual(position.marks, [1 << 4, 0])
+        self.assertEqual(position.turn, 1)
+        position.unmake(4)
+        self.assertEqual(position.marks, [0, 0])
+        self.assertEqual(ttt.Position(*ttt.encode([[X, EMPTY, EMPTY], [EMPTY] * 3, [EMPTY] * 3])).turn, 1)
+
+
+class TestSearch(unittest.TestCase):
+
+    def test_values_match_full_search(self):
+        """Тест: альфа-бета с таблицей даёт те же оценки и ходы, что полный перебор"""
+        reference = ttt.AlphaBeta(pruning=False, table=False)
+        engine = ttt.AlphaBeta()
+        for me, them in reachable():
+            if (me | them).bit_count() < 3:
+                continue
+            expected = reference.value(me, them)
+            self.assertEqual(engine.value(me, them), expected)
+            if not ttt.WINNING[them] and me | them != ttt.FULL:
+                value, square = engine.best(me, them)
+                self.assertEqual(value, expected)
+                self.assertEqual(-reference.value(them, me | 1 << square), expected)
+
+    def test_fewer_nodes(self):
+        """Тест: отсечения, таблица и симметрии сокращают перебор"""
+        nodes = []
+        for options in (dict(pruning=False, table=False), dict(table=False),
+                        dict(symmetry=False), dict()):
+            engine = ttt.AlphaBeta(**options)
+            self.assertEqual(engine.best(0, 0)[0], 0)
+            nodes.append(engine.nodes)
+        self.assertEqual(nodes, sorted(nodes, reverse=True))
+
+    def test_minimax(self):
+        """Тест: minimax выигрывает, блокирует и молчит в конце игры"""
+        board = [[X, X, EMPTY], [O, O, EMPTY], [EMPTY, EMPTY, EMPTY]]
+        self.assertEqual(ttt.minimax(board), (0, 2))
+        board = [[X, X, EMPTY], [EMPTY, O, EMPTY], [EMPTY, EMPTY, EMPTY]]
+        self.assertEqual(ttt.minimax(board), (0, 2))
+        self.assertIsNone(ttt.minimax([[X, X, X], [O, O, EMPTY], [EMPTY] * 3]))
+
+    def test_plain_minimax(self):
+        """Тест: эталонный полный перебор по спискам выбирает ход той же цены"""
+        board = [[X, EMPTY, EMPTY], [EMPTY, O, EMPTY], [EMPTY, EMPTY, X]]
+        move = ttt.plain_minimax(board)
+        reference = ttt.AlphaBeta(pruning=False, table=False)
+        x, o = ttt.encode(board)
+        after_x, after_o = ttt.encode(ttt.result(board, move))
+        self.assertEqual(-reference.value(after_x, after_o), reference.value(o, x))
+        self.assertIn(move, {(0, 1), (1, 0), (1, 2), (2, 1)})
+
+
+class TestBook(unittest.TestCase):
+
+    def test_book_file(self):
+        """Тест: файл книги совпадает с заново построенной книгой"""
+        self.assertIsNotNone(ttt.load_book())
+        self.assertEqual(ttt.load_book(), bytes(book.build()))
+        self.assertIsNone(ttt.load_book(os.path.join(os.path.dirname(ttt.BOOK), "missing.bin")))
+
+    def test_lookup(self):
+        """Тест: ходы и оценки из книги — как у поиска, для всех позиций"""
+        reference = ttt.AlphaBeta()
+        positions = list(book.reachable())
+        self.assertEqual(len(positions), 5478)
+        for x, o in positions:
+            board = [[X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY
+                      for j in range(3)] for i in range(3)]
+            action, value = ttt.lookup(board)
+            if ttt.terminal(board):
+                self.assertIsNone(action)
+                self.assertEqual(value, ttt.utility(board))
+                continue
+            x_to_move = ttt.player(board) == X
+            me, them = (x, o) if x_to_move else (o, x)
+            expected = reference.value(me, them)
+            self.assertEqual(value, expected if x_to_move else -expected)
+            square = 3 * action[0] + action[1]
+            self.assertEqual(-reference.value(them, me | 1 << square), expected)
+            self.assertEqual(ttt.minimax(board), action)
+
+    def test_fallback(self):
+        """Тест: без файла книги minimax ищет ход сам"""
+        saved, ttt._book = ttt._book, None
+        try:
+            self.assertIsNone(ttt.lookup(ttt.initial_state()))
+            self.assertEqual(ttt.minimax([[X, X, EMPTY], [EMPTY, O, EMPTY], [EMPTY] * 3]), (0, 2))
+        finally:
+            ttt._book = saved
+        unreachable = [[X, X, X], [X, EMPTY, EMPTY], [EMPTY] * 3]
+        self.assertIsNone(ttt.lookup(unreachable))
+
+
+class TestGame(unittest.TestCase):
+
+    def test_same_api(self):
+        """Тест: m,n,k-игра 3x3 ведёт себя как модуль tictactoe"""
+        game = mnk.Game(3, 3, 3, budget=None)
+        board = game.initial_state()
+        self.assertEqual(board, ttt.initial_state())
+        board = game.result(board, (1, 1))
+        self.assertEqual(board, ttt.result(ttt.initial_state(), (1, 1)))
+        self.assertEqual(game.player(board), O)
+        self.assertEqual(len(game.actions(board)), 8)
+        board = [[X, X, X], [O, O, EMPTY], [EMPTY] * 3]
+        self.assertEqual(game.winner(board), X)
+        self.assertEqual(game.utility(board), 1)
+        self.assertTrue(game.terminal(board))
+        self.assertIsNone(game.minimax(board))
+
+    def test_solves_3x3(self):
+        """Тест: без ограничения времени 3x3 решается точно"""
+        game = mnk.Game(3, 3, 3, budget=None)
+        reference = ttt.AlphaBeta()
+        for me, them in reachable():
+            if (me | them).bit_count() < 2 or ttt.WINNING[them] or me | them == ttt.FULL:
+                continue
+            square = game.search(me, them)
+            expected = reference.value(me, them)
+            self.assertEqual((game.value > 0) - (game.value < 0), expected)
+            self.assertEqual(-reference.value(them, me | 1 << square), expected)
+
+    def test_lines(self):
+        """Тест: маски линий и проверка победы только по линиям через ход"""
+        game = mnk.Game(15, 15, 5)
+        self.assertEqual(len(game.lines), 2 * 15 * 11 + 2 * 11 * 11)
+        row = sum(1 << (7 * 15 + j) for j in range(3, 8))
+        self.assertTrue(game.wins(row, 7 * 15 + 5))
+        self.assertFalse(game.wins(row ^ 1 << (7 * 15 + 3), 7 * 15 + 5))
+
+    def test_forced_win(self):
+        """Тест: на 4x4 до трёх в ряд первый игрок находит выигрыш"""
+        game = mnk.Game(4, 4, 3, budget=None)
+        board = game.initial_state()
+        while not game.terminal(board):
+            board = game.result(board, game.minimax(board))
+        self.assertEqual(game.winner(board), X)
+
+    def test_budget(self):
+        """Тест: на большой доске ход укладывается в бюджет времени"""
+        game = mnk.Game(15, 15, 5, budget=0.2)
+        board = game.result(game.initial_state(), (7, 7))
+        move = game.minimax(board)
+        self.assertIn(move, game.actions(board))
+        self.assertLess(game.time, 0.5)
+        self.assertGreaterEqual(game.depth, 1)
+
+
+class TestAsyncMove(unittest.TestCase):
+
+    def test_thread_and_process(self):
+        """Тест: ход считается в потоке и в процессе и совпадает с minimax"""
+        board = [[X, EMPTY, EMPTY], [EMPTY, O, EMPTY], [EMPTY, EMPTY, X]]
+        for process in (False, True):
+            move = AsyncMove(ttt.minimax, board, process)
+            self.assertEqual(move.result(timeout=10), ttt.minimax(board))
+            self.assertTrue(move.done())
+            self.assertGreaterEqual(move.elapsed(), 0)
+
+    def test_cancel(self):
+        """Тест: ход в процессе отменяется сразу, не дожидаясь движка"""
+        move = AsyncMove(time.sleep, 30, process=True)
+        self.assertFalse(move.done())
+        with self.assertRaises(TimeoutError):
+            move.result(timeout=0.05)
+        start = time.perf_counter()
+        move.cancel()
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertFalse(move.done())
+        with self.assertRaises(RuntimeError):
+            move.result()
+
+    def test_fresh_engine(self):
+        """Тест: после отмены потока следующий ход считает свой движок"""
+        game = runner.make_game((5, 5, 4), 0.2)
+        abandoned = AsyncMove(game.minimax, game.initial_state())
+        abandoned.cancel()
+        engine = runner.fresh_engine(game)
+        self.assertIsNot(engine.__self__, game)
+        self.assertEqual(engine.__self__.table, {})
+        move = AsyncMove(engine, game.initial_state())
+        self.assertIn(move.result(timeout=10), game.actions(game.initial_state()))
+        abandoned._worker.join(10)
+
+        engine = runner.fresh_engine(ttt)
+        self.assertIsNot(engine.keywords["engine"], ttt._engine)
+        board = [[X, X, EMPTY], [EMPTY, O, EMPTY], [EMPTY] * 3]
+        self.assertEqual(engine(board), ttt.minimax(board))
+
+    def test_errors(self):
+        """Тест: исключение движка передаётся вызывающему"""
+        for process in (False, True):
+            with self.assertRaises(ValueError):
+                AsyncMove(int, "x", process).result(timeout=10)
+
+    def test_headless(self):
+        """Тест: без экрана компьютер играет сам с собой вничью"""
+        out = io.StringIO()
+        self.assertEqual(runner.headless(ttt, games=2, out=out), [None, None])
+        self.assertIn("game 2: tie", out.getvalue())
+        game = runner.make_game((4, 4, 3), 0.05)
+        self.assertEqual(runner.headless(game, out=out), [X])
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_reference_value(self):
+        """Тест: эталонное значение совпадает с полным перебором"""
+        self.assertEqual(tournament.reference_value(ttt.initial_state()), 0)
+        board = [[X, X, EMPTY], [O, O, EMPTY], [EMPTY, EMPTY, EMPTY]]
+        self.assertEqual(tournament.reference_value(board), 1)
+
+    def test_tree_size(self):
+        """Тест: размер дерева игры совпадает с известным"""
+        self.assertEqual(tournament.tree_size(ttt.initial_state()), 549946)
+        board = [[X, O, X], [X, O, O], [O, X, EMPTY]]
+        self.assertEqual(tournament.tree_size(board), 2)
+
+    def test_play(self):
+        """Тест: все варианты ходят не хуже эталонного минимакса"""
+        for seed in range(5):
+            for variant in tournament.ENGINES:
+                x_variant, o_variant, winner, moves = tournament.play((variant, "book", seed, 3))
+                self.assertEqual((x_variant, o_variant), (variant, "book"))
+                self.assertTrue(moves)
+                self.assertTrue(all(kept for _, _, _, kept in moves))
+                if variant in ("minimax", "alphabeta", "mnk"):
+                    self.assertTrue(all(nodes > 0 for name, _, nodes, _ in moves if name == variant))
+
+    def test_tournament(self):
+        """Тест: в пуле процессов играются все пары вариантов"""
+        variants = ["alphabeta", "book"]
+        latencies, nodes, mistakes, outcomes = tournament.tournament(variants, 3, workers=2)
+        self.assertEqual(mistakes, {"alphabeta": 0, "book": 0})
+        self.assertGreater(nodes["alphabeta"], 0)
+        self.assertEqual(len(outcomes), 4)
+        self.assertTrue(all(sum(counts.values()) == 3 for counts in outcomes.values()))
+        for values in latencies.values():
+            self.assertEqual(values, sorted(values))
+        self.assertEqual(tournament.percentile([1, 2, 3, 4], 0.5), 2)
+        self.assertEqual(tournament.percentile([1, 2, 3, 4], 0.99), 4)
+        self.assertEqual(tournament.percentile([], 0.5), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
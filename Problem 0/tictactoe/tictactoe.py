@@ -2,13 +2,66 @@
 Tic Tac Toe Player
 """
 
-import math
-import copy
+import os
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# Boards are also encoded as a pair of 9-bit masks, one per player,
+# with bit 3 * i + j set for a mark in row i, column j
+FULL = (1 << 9) - 1
+
+LINES = tuple(
+    sum(1 << (3 * i + j) for i, j in line) for line in (
+        [[(i, j) for j in range(3)] for i in range(3)]
+        + [[(i, j) for i in range(3)] for j in range(3)]
+        + [[(i, i) for i in range(3)], [(i, 2 - i) for i in range(3)]]
+    )
+)
+
+# WINNING[mask] is True if the marks in mask complete a line
+WINNING = tuple(any(mask & line == line for line in LINES) for mask in range(1 << 9))
+
+# Center first, then corners, then edges: good moves first prune most
+ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7)
+
+
+def _symmetries():
+    """
+    Returns, for each of the 8 symmetries of the square, a table
+    mapping every 9-bit mask to its image under that symmetry.
+    """
+    maps = (
+        lambda i, j: (i, j), lambda i, j: (j, 2 - i),
+        lambda i, j: (2 - i, 2 - j), lambda i, j: (2 - j, i),
+        lambda i, j: (i, 2 - j), lambda i, j: (2 - i, j),
+        lambda i, j: (j, i), lambda i, j: (2 - j, 2 - i),
+    )
+    tables = []
+    for transform in maps:
+        images = [3 * a + b for a, b in (transform(*divmod(square, 3)) for square in range(9))]
+        tables.append(tuple(
+            sum(1 << images[square] for square in range(9) if mask >> square & 1)
+            for mask in range(1 << 9)
+        ))
+    return tuple(tables)
+
+
+SYMMETRIES = _symmetries()
+
+# TERNARY[mask] is the base-3 number with a 1 digit for each square in
+# mask, so TERNARY[x] + 2 * TERNARY[o] numbers every board
+TERNARY = tuple(sum(3 ** square for square in range(9) if mask >> square & 1) for mask in range(1 << 9))
+POSITIONS = 3 ** 9
+
+# The opening book holds a byte per board number for every reachable
+# board: its value to X plus 1 in the high bits, and its best square,
+# or NO_MOVE once the game is over, in the low 4. It is built by book.py
+BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+NO_MOVE = 9
+UNREACHABLE = 0xFF
+
 
 def initial_state():
     """
@@ -56,11 +109,11 @@ def result(board, action):
     if board[i][j] is not None:
         raise Exception("Invalid action")
 
-    # Копируем доску, чтобы не изменить исходную
-    new_board = copy.deepcopy(board)
+    # Копируем доску, чтобы не изменить исходную; клетки неизменяемы,
+    # так что достаточно скопировать строки
+    new_board = [row[:] for row in board]
 
     # Ставим метку текущего игрока
-    from tictactoe import player  # если ты в другом файле
     new_board[i][j] = player(board)
 
     return new_board
@@ -104,19 +157,215 @@ def terminal(board):
 
 
 def utility(board):
-    if winner(board) == "X":
+    won = winner(board)
+    if won == "X":
         return 1
-    elif winner(board) == "O":
+    elif won == "O":
         return -1
     else:
         return 0
 
 
 
-def minimax(board):
+def encode(board):
+    """
+    Returns the (X, O) pair of 9-bit masks of board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+class Position():
+    """
+    A board changed in place during search: make(square) puts the mark
+    of the player to move on square, and unmake(square) takes it off
+    again, so walking the game tree allocates no boards. It is made
+    from the X and O masks, as encode returns them; marks holds them,
+    and turn is 0 when X is to move and 1 for O.
+    """
+
+    __slots__ = ("marks", "turn")
+
+    def __init__(self, x=0, o=0):
+        self.marks = [x, o]
+        self.turn = 0 if x.bit_count() == o.bit_count() else 1
+
+    def make(self, square):
+        self.marks[self.turn] |= 1 << square
+        self.turn ^= 1
+
+    def unmake(self, square):
+        self.turn ^= 1
+        self.marks[self.turn] &= ~(1 << square)
+
+
+def canonical(me, them):
+    """
+    Returns one integer key shared by a position and its 7 images
+    under rotation and reflection.
+    """
+    return min((table[me] << 9) | table[them] for table in SYMMETRIES)
+
+
+# Transposition table entry bounds
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class AlphaBeta():
+    """
+    Negamax search over bitboards, optionally with alpha-beta pruning
+    and a transposition table keyed by the canonical position, which
+    is kept between searches. Values are for the player to move:
+    1 for a win, 0 for a draw, -1 for a loss. nodes counts the
+    positions searched.
+    """
+
+    def __init__(self, pruning=True, table=True, symmetry=True):
+        self.pruning = pruning
+        self.table = {} if table else None
+        self.symmetry = symmetry
+        self.nodes = 0
+
+    def best(self, me, them):
+        """
+        Returns (value, square) of the best move for the player whose
+        marks are me, the first such square in ORDER.
+        """
+        occupied = me | them
+        alpha = -2
+        best = None
+        for square in ORDER:
+            bit = 1 << square
+            if occupied & bit:
+                continue
+            value = -self.value(them, me | bit, -2, -alpha)
+            if value > alpha:
+                alpha, best = value, square
+                if self.pruning and alpha == 1:
+                    break
+        return alpha, best
+
+    def value(self, me, them, alpha=-2, beta=2):
+        """
+        Returns the value of a position to the player whose marks are
+        me and who is to move, exact if it lies between alpha and beta
+        and otherwise a bound on the side of the window it falls.
+        """
+        self.nodes += 1
+
+        # Only the player who just moved can have won
+        if WINNING[them]:
+            return -1
+        occupied = me | them
+        if occupied == FULL:
+            return 0
+
+        table = self.table
+        if table is not None:
+            key = canonical(me, them) if self.symmetry else (me << 9) | them
+            entry = table.get(key)
+            if entry is not None:
+                value, bound = entry
+                if bound == EXACT:
+                    return value
+                if bound == LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+
+        start = alpha
+        best = -2
+        for square in ORDER:
+            bit = 1 << square
+            if occupied & bit:
+                continue
+            value = -self.value(them, me | bit, -beta, -alpha)
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if self.pruning and alpha >= beta:
+                        break
+
+        if table is not None:
+            if not self.pruning or start < best < beta:
+                table[key] = (best, EXACT)
+            elif best >= beta:
+                table[key] = (best, LOWER)
+            else:
+                table[key] = (best, UPPER)
+        return best
+
+
+def load_book(path=BOOK):
+    """
+    Returns the opening book at path, or None if it is missing or
+    not a book.
+    """
+    try:
+        with open(path, "rb") as f:
+            book = f.read()
+    except OSError:
+        return None
+    return book if len(book) == POSITIONS else None
+
+
+def lookup(board):
+    """
+    Returns (action, value) from the opening book for board, with
+    action None if the game is over and value 1 if X wins with
+    perfect play, -1 if O does and 0 for a draw; or None if there is
+    no book or board cannot be reached in play.
+    """
+    if _book is None:
+        return None
+    x, o = encode(board)
+    entry = _book[TERNARY[x] + 2 * TERNARY[o]]
+    if entry == UNREACHABLE:
+        return None
+    square = entry & 15
+    return (None if square == NO_MOVE else divmod(square, 3)), (entry >> 4) - 1
+
+
+# Engine behind minimax, so its table is shared across moves
+_engine = AlphaBeta()
+
+_book = load_book()
+
+
+def minimax(board, engine=None):
     """
     Returns the optimal action (i, j) for the current player on the board.
-    If the game is over, returns None.
+    If the game is over, returns None. Boards missing from the book are
+    searched with engine, an AlphaBeta, by default the shared one.
+    """
+    if terminal(board):
+        return None
+    x, o = encode(board)
+    if _book is not None:
+        entry = _book[TERNARY[x] + 2 * TERNARY[o]]
+        if entry != UNREACHABLE:
+            return divmod(entry & 15, 3)
+
+    # No book, or a board that cannot come up in play: search
+    me, them = (x, o) if player(board) == X else (o, x)
+    _, square = (engine or _engine).best(me, them)
+    return divmod(square, 3)
+
+
+def plain_minimax(board):
+    """
+    Same as minimax, by searching the full game tree over list boards
+    with no pruning or memoization. Kept as the reference minimax
+    checks and benchmarks compare against.
     """
 
     # Если игра уже закончена
@@ -0,0 +1,235 @@
+"""
+Self-play tournament and throughput benchmark for tictactoe engines.
+
+Every ordered pair of engine variants plays a number of games, spread
+over a process pool. Each game starts from a few random moves, so the
+deterministic engines do not replay one game. For every move the
+harness records the engine's latency and checks that the move keeps
+the value of the position under the reference minimax: an engine that
+plays perfectly never lets the value slip. The report gives the
+positions each variant searched per second of engine time next to its
+latency percentiles, then mistakes and outcomes.
+
+Usage: python tournament.py [--variants V ...] [--games N] [--workers N]
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import mnk
+import tictactoe as ttt
+
+
+_sizes = {}
+
+
+def tree_size(board):
+    """
+    Returns the number of positions in the full game tree from board,
+    board included, memoized.
+    """
+    key = tuple(map(tuple, board))
+    size = _sizes.get(key)
+    if size is None:
+        size = 1
+        if not ttt.terminal(board):
+            size += sum(tree_size(ttt.result(board, action)) for action in ttt.actions(board))
+        _sizes[key] = size
+    return size
+
+
+def _minimax(board):
+    # plain_minimax searches every position below board once
+    return ttt.plain_minimax(board), tree_size(board) - 1
+
+
+def _search(engine, board):
+    x, o = ttt.encode(board)
+    me, them = (x, o) if ttt.player(board) == ttt.X else (o, x)
+    nodes = engine.nodes
+    square = engine.best(me, them)[1]
+    return divmod(square, 3), engine.nodes - nodes
+
+
+def _alphabeta(board):
+    return _search(ttt.AlphaBeta(table=False), board)
+
+
+# Engines kept for the life of a worker process, tables and all
+_table_engine = ttt.AlphaBeta()
+_book_engine = ttt.AlphaBeta()
+_game = mnk.Game(3, 3, 3, budget=None)
+
+
+def _table(board):
+    return _search(_table_engine, board)
+
+
+def _book(board):
+    # Only boards missing from the book are searched
+    nodes = _book_engine.nodes
+    action = ttt.minimax(board, engine=_book_engine)
+    return action, _book_engine.nodes - nodes
+
+
+def _mnk(board):
+    return _game.minimax(board), _game.nodes
+
+
+# Engine variants: functions from a board to (action, positions searched)
+ENGINES = {
+    "minimax": _minimax,
+    "alphabeta": _alphabeta,
+    "table": _table,
+    "book": _book,
+    "mnk": _mnk,
+}
+
+# The reference minimax is slow enough to leave out by default
+DEFAULT_VARIANTS = ("alphabeta", "table", "book", "mnk")
+
+_values = {}
+
+
+def reference_value(board):
+    """
+    Returns the value of board to X under the reference minimax: the
+    full-tree search of plain_minimax, over list boards, memoized.
+    """
+    key = tuple(map(tuple, board))
+    value = _values.get(key)
+    if value is None:
+        if ttt.terminal(board):
+            value = ttt.utility(board)
+        else:
+            values = [reference_value(ttt.result(board, action)) for action in ttt.actions(board)]
+            value = max(values) if ttt.player(board) == ttt.X else min(values)
+        _values[key] = value
+    return value
+
+
+def play(task):
+    """
+    Plays one game of task = (X variant, O variant, seed, random
+    opening moves). Returns (X variant, O variant, winner, moves),
+    where moves lists (variant, seconds, positions searched, whether
+    the move kept the reference value) for every engine move.
+    """
+    x_variant, o_variant, seed, openings = task
+    rng = random.Random(seed)
+    board = ttt.initial_state()
+    for _ in range(openings):
+        if ttt.terminal(board):
+            break
+        board = ttt.result(board, rng.choice(sorted(ttt.actions(board))))
+
+    moves = []
+    while not ttt.terminal(board):
+        variant = x_variant if ttt.player(board) == ttt.X else o_variant
+        before = reference_value(board)
+        start = time.perf_counter()
+        action, nodes = ENGINES[variant](board)
+        elapsed = time.perf_counter() - start
+        board = ttt.result(board, action)
+        moves.append((variant, elapsed, nodes, reference_value(board) == before))
+    return x_variant, o_variant, ttt.winner(board), moves
+
+
+def percentile(sorted_values, fraction):
+    """
+    Returns the value at fraction (0 to 1) of a sorted list, nearest rank.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def tournament(variants, games, openings=2, workers=None, seed=0):
+    """
+    Plays games games for every ordered pair of variants in a pool of
+    workers processes. Returns (latencies, nodes, mistakes, outcomes):
+    the sorted move latencies, positions searched and count of
+    value-losing moves of each variant, and a dict of
+    (X, O) -> {winner: games}.
+    """
+    tasks = [
+        (x_variant, o_variant, seed * 1_000_003 + n, openings)
+        for x_variant, o_variant in itertools.product(variants, repeat=2)
+        for n in range(games)
+    ]
+    latencies = {variant: [] for variant in variants}
+    nodes = dict.fromkeys(variants, 0)
+    mistakes = dict.fromkeys(variants, 0)
+    outcomes = {}
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+    if workers == 1:
+        results = map(play, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        results = pool.imap_unordered(play, tasks, chunksize)
+    try:
+        for x_variant, o_variant, winner, moves in results:
+            counts = outcomes.setdefault((x_variant, o_variant), {ttt.X: 0, ttt.O: 0, None: 0})
+            counts[winner] += 1
+            for variant, elapsed, searched, kept in moves:
+                latencies[variant].append(elapsed)
+                nodes[variant] += searched
+                mistakes[variant] += not kept
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    for values in latencies.values():
+        values.sort()
+    return latencies, nodes, mistakes, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Self-play tournament of tictactoe engines.")
+    parser.add_argument("--variants", nargs="+", choices=ENGINES, default=list(DEFAULT_VARIANTS))
+    parser.add_argument("--games", type=int, default=100,
+                        help="games per ordered pair of variants")
+    parser.add_argument("--openings", type=int, default=2,
+                        help="random moves before the engines take over")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    latencies, nodes, mistakes, outcomes = tournament(
+        args.variants, args.games, args.openings, args.workers, args.seed
+    )
+    elapsed = time.perf_counter() - start
+    total = sum(sum(counts.values()) for counts in outcomes.values())
+    print(f"{total} games in {elapsed:.2f} s on {args.workers} workers")
+
+    print(f"{'variant':>10} {'moves':>7} {'nodes':>10} {'nodes/s':>10} {'p50 ms':>8} "
+          f"{'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} {'mistakes':>8}")
+    for variant in args.variants:
+        values = latencies[variant]
+        rate = nodes[variant] / max(sum(values), 1e-9)
+        p50, p90, p99 = (percentile(values, f) * 1000 for f in (0.5, 0.9, 0.99))
+        worst = values[-1] * 1000 if values else 0.0
+        print(f"{variant:>10} {len(values):>7} {nodes[variant]:>10} {rate:>10.0f} {p50:>8.3f} "
+              f"{p90:>8.3f} {p99:>8.3f} {worst:>8.3f} {mistakes[variant]:>8}")
+
+    print(f"{'X':>10} {'O':>10} {'X wins':>7} {'O wins':>7} {'ties':>7}")
+    for (x_variant, o_variant), counts in sorted(outcomes.items()):
+        print(f"{x_variant:>10} {o_variant:>10} {counts[ttt.X]:>7} {counts[ttt.O]:>7} {counts[None]:>7}")
+
+    if any(mistakes.values()):
+        print("Some moves lost value against the reference minimax.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()